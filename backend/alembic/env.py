@@ -5,6 +5,8 @@ from app.models.cover_letter import CoverLetter
 from app.models.job_match import JobMatch
 from app.models.ats_check import ATSCheck
 from app.models.job_application import JobApplication
+from app.models.analysis_job import AnalysisJob
+from app.models.llm_cache_entry import llm_cache_entries
 
 from logging.config import fileConfig
 
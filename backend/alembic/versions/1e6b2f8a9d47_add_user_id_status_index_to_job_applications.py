@@ -0,0 +1,28 @@
+"""add (user_id, status) index to job_applications
+
+Revision ID: 1e6b2f8a9d47
+Revises: d41a7b9e0c38
+Create Date: 2026-10-18 12:05:44.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e6b2f8a9d47'
+down_revision: Union[str, Sequence[str], None] = 'd41a7b9e0c38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_job_applications_user_id_status', 'job_applications', ['user_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_applications_user_id_status', table_name='job_applications')
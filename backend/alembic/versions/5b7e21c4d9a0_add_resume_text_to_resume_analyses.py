@@ -0,0 +1,28 @@
+"""add resume_text to resume_analyses
+
+Revision ID: 5b7e21c4d9a0
+Revises: 4f9c53a7883f
+Create Date: 2026-10-18 09:12:40.114382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e21c4d9a0'
+down_revision: Union[str, Sequence[str], None] = '4f9c53a7883f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resume_analyses', sa.Column('resume_text', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resume_analyses', 'resume_text')
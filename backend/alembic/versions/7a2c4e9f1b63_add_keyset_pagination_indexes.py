@@ -0,0 +1,30 @@
+"""add keyset pagination indexes
+
+Revision ID: 7a2c4e9f1b63
+Revises: 1e6b2f8a9d47
+Create Date: 2026-10-18 13:21:07.415820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2c4e9f1b63'
+down_revision: Union[str, Sequence[str], None] = '1e6b2f8a9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_job_applications_user_id_created_at_id', 'job_applications', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_resume_analyses_user_id_created_at_id', 'resume_analyses', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resume_analyses_user_id_created_at_id', table_name='resume_analyses')
+    op.drop_index('ix_job_applications_user_id_created_at_id', table_name='job_applications')
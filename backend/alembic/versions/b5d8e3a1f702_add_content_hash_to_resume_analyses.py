@@ -0,0 +1,30 @@
+"""add content_hash to resume_analyses
+
+Revision ID: b5d8e3a1f702
+Revises: 7a2c4e9f1b63
+Create Date: 2026-10-18 14:02:51.337604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d8e3a1f702'
+down_revision: Union[str, Sequence[str], None] = '7a2c4e9f1b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resume_analyses', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_resume_analyses_content_hash'), 'resume_analyses', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_resume_analyses_content_hash'), table_name='resume_analyses')
+    op.drop_column('resume_analyses', 'content_hash')
@@ -0,0 +1,28 @@
+"""add document_structure to resume_analyses
+
+Revision ID: d41a7b9e0c38
+Revises: 8c3f0a6d2e51
+Create Date: 2026-10-18 11:20:05.418276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7b9e0c38'
+down_revision: Union[str, Sequence[str], None] = '8c3f0a6d2e51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resume_analyses', sa.Column('document_structure', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resume_analyses', 'document_structure')
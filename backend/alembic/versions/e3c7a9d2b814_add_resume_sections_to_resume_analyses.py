@@ -0,0 +1,28 @@
+"""add resume_sections to resume_analyses
+
+Revision ID: e3c7a9d2b814
+Revises: b5d8e3a1f702
+Create Date: 2026-10-18 16:21:09.482117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3c7a9d2b814'
+down_revision: Union[str, Sequence[str], None] = 'b5d8e3a1f702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resume_analyses', sa.Column('resume_sections', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resume_analyses', 'resume_sections')
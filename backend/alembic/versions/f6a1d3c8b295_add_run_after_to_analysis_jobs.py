@@ -0,0 +1,28 @@
+"""add run_after to analysis_jobs
+
+Revision ID: f6a1d3c8b295
+Revises: e3c7a9d2b814
+Create Date: 2026-10-18 18:42:31.206518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a1d3c8b295'
+down_revision: Union[str, Sequence[str], None] = 'e3c7a9d2b814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('analysis_jobs', sa.Column('run_after', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('analysis_jobs', 'run_after')
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.analysis_job import AnalysisJobResponse
+from app.services.analysis_jobs import get_job, wait_for_job
+
+router = APIRouter(
+    prefix="/api/jobs",
+    tags=["jobs"]
+)
+
+
+@router.get("/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job(
+    job_id: int,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the job to finish before responding"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    user_id = current_user.id
+    if wait > 0:
+        job = await wait_for_job(job_id, user_id, timeout=wait)
+    else:
+        job = await run_in_threadpool(get_job, db, job_id, user_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
@@ -1,22 +1,30 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session, load_only
 from app.db.database import get_db
+from app.core.dependencies import ensure_current_user, get_current_user
+from app.models.user import User
 from app.models.job_application import JobApplication
-from app.schemas.job_application import JobApplicationCreate, JobApplicationUpdate, JobApplicationResponse
-from typing import List
+from app.schemas.job_application import JobApplicationCreate, JobApplicationUpdate, JobApplicationResponse, JobApplicationSummary
+from app.utils.pagination import keyset_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from typing import List, Optional
+from datetime import date
 
 router = APIRouter(
     prefix="/api/applications",
     tags=["applications"]
 )
 
+APPLICATION_STATUSES = ["Applied", "Interview", "Offer", "Rejected"]
+
 
 @router.post("", response_model=JobApplicationResponse, status_code=status.HTTP_201_CREATED)
 def create_application(
-    user_id: int,
     application: JobApplicationCreate,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    user_id = current_user.id
     # Create new application
     new_application = JobApplication(
         user_id=user_id,
@@ -37,17 +45,90 @@ def create_application(
     return new_application
 
 
+def filter_user_applications(
+    db: Session,
+    user_id: int,
+    status_value: Optional[str],
+    company: Optional[str],
+    start_date: Optional[date],
+    end_date: Optional[date]
+):
+    query = db.query(JobApplication).filter(JobApplication.user_id == user_id)
+    if status_value:
+        query = query.filter(JobApplication.status == status_value)
+    if company:
+        query = query.filter(JobApplication.company_name.icontains(company, autoescape=True))
+    if start_date:
+        query = query.filter(JobApplication.application_date >= start_date)
+    if end_date:
+        query = query.filter(JobApplication.application_date <= end_date)
+    return query
+
+
 @router.get("/user/{user_id}", response_model=List[JobApplicationResponse])
-def get_user_applications(user_id: int, db: Session = Depends(get_db)):
-    applications = db.query(JobApplication).filter(
-        JobApplication.user_id == user_id
-    ).order_by(JobApplication.created_at.desc()).all()
+def get_user_applications(
+    user_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status_value: Optional[str] = Query(None, alias="status"),
+    company: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Newest applications first. When more remain, the X-Next-Cursor response
+    header holds the cursor to pass back for the next page.
+    """
+    ensure_current_user(user_id, current_user)
+    query = filter_user_applications(db, user_id, status_value, company, start_date, end_date)
+    applications, next_cursor = keyset_page(query, JobApplication, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return applications
+
+
+@router.get("/user/{user_id}/summary", response_model=List[JobApplicationSummary])
+def get_user_application_summaries(
+    user_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status_value: Optional[str] = Query(None, alias="status"),
+    company: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Same as /user/{user_id} but only loads the columns a list view needs
+    """
+    ensure_current_user(user_id, current_user)
+    query = filter_user_applications(db, user_id, status_value, company, start_date, end_date).options(
+        load_only(
+            JobApplication.id,
+            JobApplication.company_name,
+            JobApplication.job_title,
+            JobApplication.status,
+            JobApplication.location,
+            JobApplication.application_date,
+            JobApplication.created_at
+        )
+    )
+    applications, next_cursor = keyset_page(query, JobApplication, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return applications
 
 
 @router.get("/{application_id}", response_model=JobApplicationResponse)
-def get_application(application_id: int, user_id: int, db: Session = Depends(get_db)):
+def get_application(application_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    user_id = current_user.id
     application = db.query(JobApplication).filter(
         JobApplication.id == application_id,
         JobApplication.user_id == user_id
@@ -65,10 +146,11 @@ def get_application(application_id: int, user_id: int, db: Session = Depends(get
 @router.put("/{application_id}", response_model=JobApplicationResponse)
 def update_application(
     application_id: int,
-    user_id: int,
     application_data: JobApplicationUpdate,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    user_id = current_user.id
     application = db.query(JobApplication).filter(
         JobApplication.id == application_id,
         JobApplication.user_id == user_id
@@ -94,10 +176,11 @@ def update_application(
 @router.patch("/{application_id}/status", response_model=JobApplicationResponse)
 def update_application_status(
     application_id: int,
-    user_id: int,
     status_value: str,
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    user_id = current_user.id
     application = db.query(JobApplication).filter(
         JobApplication.id == application_id,
         JobApplication.user_id == user_id
@@ -110,11 +193,10 @@ def update_application_status(
         )
 
     # Validate status
-    valid_statuses = ["Applied", "Interview", "Offer", "Rejected"]
-    if status_value not in valid_statuses:
+    if status_value not in APPLICATION_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {valid_statuses}"
+            detail=f"Invalid status. Must be one of: {APPLICATION_STATUSES}"
         )
 
     application.status = status_value
@@ -125,7 +207,8 @@ def update_application_status(
 
 
 @router.delete("/{application_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_application(application_id: int, user_id: int, db: Session = Depends(get_db)):
+def delete_application(application_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    user_id = current_user.id
     application = db.query(JobApplication).filter(
         JobApplication.id == application_id,
         JobApplication.user_id == user_id
@@ -144,36 +227,37 @@ def delete_application(application_id: int, user_id: int, db: Session = Depends(
 
 
 @router.get("/analytics/{user_id}")
-def get_application_analytics(user_id: int, db: Session = Depends(get_db)):
-    # 1. Query all applications for this user
-    applications = db.query(JobApplication).filter(
-        JobApplication.user_id == user_id).all()
-
-    # 2. Calculate total count
-    total = len(applications)
-
-    # 3. Count by status (hint: use a loop or list comprehension)
-    applied_count = len([app for app in applications if app.status == "Applied"])
-    interview_count = len([app for app in applications if app.status == "Interview"])
-    offer_count = len([app for app in applications if app.status == "Offer"])
-    rejected_count = len([app for app in applications if app.status == "Rejected"])
-
-    # 4. Calculate percentages (handle division by zero!)
-    if total == 0:
-        applied_percentage = 0
-        interview_percentage = 0
-        offer_percentage = 0
-        rejected_percentage = 0
-    else:
-        applied_percentage = (applied_count / total) * 100
-        interview_percentage = (interview_count / total) * 100
-        offer_percentage = (offer_count / total) * 100
-        rejected_percentage = (rejected_count / total) * 100
-    # 5. Return as a dictionary
-    return {
-        "total": total,
-        "applied": {"count": applied_count, "percentage": applied_percentage},
-        "interview": {"count": interview_count, "percentage": interview_percentage},
-        "offer": {"count": offer_count, "percentage": offer_percentage},
-        "rejected": {"count": rejected_count, "percentage": rejected_percentage}
+def get_application_analytics(
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    ensure_current_user(user_id, current_user)
+    # Count per status in the database (served by the (user_id, status) index)
+    query = db.query(JobApplication.status, func.count(JobApplication.id)).filter(
+        JobApplication.user_id == user_id)
+    if start_date:
+        query = query.filter(JobApplication.application_date >= start_date)
+    if end_date:
+        query = query.filter(JobApplication.application_date <= end_date)
+    counts = dict(query.group_by(JobApplication.status).all())
+
+    total = sum(counts.values())
+
+    def breakdown(count: int) -> dict:
+        return {"count": count, "percentage": (count / total) * 100 if total else 0}
+
+    # The standard statuses are always reported at the top level. Any other
+    # status is free-form text ("total", "applied", ...), so it is kept under
+    # its raw value where it can't overwrite a standard key.
+    analytics = {"total": total}
+    for status_name in APPLICATION_STATUSES:
+        analytics[status_name.lower()] = breakdown(counts.get(status_name, 0))
+    analytics["other_statuses"] = {
+        status_name: breakdown(count)
+        for status_name, count in sorted(counts.items())
+        if status_name not in APPLICATION_STATUSES
     }
+    return analytics
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.concurrency import run_in_threadpool
+from app.db.database import get_db, SessionLocal
+from app.core.dependencies import get_llm_caller, get_user_resume
+from app.models.user import User
 from sqlalchemy.orm import Session
-from app.models.resume_analysis import ResumeAnalysis
 from app.models.ats_check import ATSCheck
 from app.schemas.ats_check import ATSCheckCreate, ATSCheckResponse
-from app.services.openai_service import check_ats_compatibility_with_ai
-from app.utils.file_parser import extract_text_from_pdf, extract_text_from_docx
+from app.services.openai_service import check_ats_compatibility_with_ai_async
+from app.services.ats_analyzer import analyze_ats
 
 router = APIRouter(
     prefix="/api/ats-check",
@@ -14,33 +16,36 @@ router = APIRouter(
 
 
 @router.post("/check", response_model=ATSCheckResponse, status_code=status.HTTP_201_CREATED)
-def check_ats(user_id: int, ats_check_data: ATSCheckCreate, db: Session = Depends(get_db)):
-    resume = db.query(ResumeAnalysis).filter(ResumeAnalysis.id ==
-                                             ats_check_data.resume_id, ResumeAnalysis.user_id == user_id).first()
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-
-    if resume.filename.endswith('.pdf'):
-        resume_text = extract_text_from_pdf(resume.file_path)
+async def check_ats(ats_check_data: ATSCheckCreate, mode: str = Query("fast", pattern="^(fast|ai)$"), force_refresh: bool = False, current_user: User = Depends(get_llm_caller), db: Session = Depends(get_db)):
+    """
+    mode=fast runs the local rule-based checks, mode=ai asks the LLM for a deeper review
+    """
+    user_id = current_user.id
+    # Loaded off the event loop, and the connection is back in the pool before the LLM call
+    resume = await run_in_threadpool(get_user_resume, db, ats_check_data.resume_id, user_id)
+
+    if mode == "ai":
+        ats_data = await check_ats_compatibility_with_ai_async(resume_text=resume.resume_text, force_refresh=force_refresh)
     else:
-        resume_text = extract_text_from_docx(resume.file_path)
+        ats_data = analyze_ats(resume.resume_text, resume.document_structure)
 
-    ats_data = check_ats_compatibility_with_ai(resume_text=resume_text)
+    return await run_in_threadpool(save_ats_check, user_id, ats_check_data.resume_id, ats_data)
 
-    ats_check = ATSCheck(
-        user_id=user_id,
-        resume_id=ats_check_data.resume_id,
-        ats_score=ats_data["ats_score"],
-        issues_found=ats_data["issues_found"],
-        recommendations=ats_data["recommendations"],
-        is_ats_friendly=ats_data["is_ats_friendly"]
-    )
 
-    db.add(ats_check)
-    db.commit()
-    db.refresh(ats_check)
-
-    return ats_check
+def save_ats_check(user_id: int, resume_id: int, ats_data: dict) -> ATSCheck:
+    db = SessionLocal()
+    try:
+        ats_check = ATSCheck(
+            user_id=user_id,
+            resume_id=resume_id,
+            ats_score=ats_data["ats_score"],
+            issues_found=ats_data["issues_found"],
+            recommendations=ats_data["recommendations"],
+            is_ats_friendly=ats_data["is_ats_friendly"]
+        )
+        db.add(ats_check)
+        db.commit()
+        db.refresh(ats_check)
+        return ats_check
+    finally:
+        db.close()
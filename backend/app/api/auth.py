@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password_async, verify_and_update_password_async, create_access_token, PasswordHasherBusy
 from app.db.database import get_db
+from app.core.dependencies import get_current_user, invalidate_cached_user
 
 router = APIRouter(
     prefix="/api/auth",
@@ -11,33 +14,76 @@ router = APIRouter(
 )
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, try again shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
+def find_user_by_email(db: Session, email: str) -> Optional[User]:
+    """
+    The user, detached, with the connection handed back to the pool so the
+    caller can wait on the password hasher without holding it
+    """
+    user = db.query(User).filter(User.email == email).first()
+    if user:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+
+def add_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def update_password_hash(db: Session, user_id: int, new_hash: str) -> None:
+    db.query(User).filter(User.id == user_id).update({User.hashed_password: new_hash})
+    db.commit()
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)) -> UserResponse:
-    existing_user = db.query(User).filter(User.email == user.email).first()
+async def register(user: UserCreate, db: Session = Depends(get_db)) -> UserResponse:
+    existing_user = await run_in_threadpool(find_user_by_email, db, user.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email is already registered"
         )
-    hashed_password = hash_password(user.password)
+    try:
+        hashed_password = await hash_password_async(user.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     db_user = User(
         full_name=user.full_name,
         email=user.email,
         hashed_password=hashed_password
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await run_in_threadpool(add_user, db, db_user)
 
 
 @router.post("/login")
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)) -> dict:
-    user = db.query(User).filter(User.email == user_credentials.email).first()
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+async def login(user_credentials: UserLogin, db: Session = Depends(get_db)) -> dict:
+    # Not holding a connection while waiting for the hasher, so a login burst can't exhaust the pool
+    user = await run_in_threadpool(find_user_by_email, db, user_credentials.email)
+    verified, new_hash = False, None
+    if user:
+        try:
+            verified, new_hash = await verify_and_update_password_async(user_credentials.password, user.hashed_password)
+        except PasswordHasherBusy:
+            raise _hasher_busy()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password")
+    if new_hash:
+        # Stored hash used a different BCRYPT_ROUNDS, upgrade it now that we have the password
+        await run_in_threadpool(update_password_hash, db, user.id, new_hash)
+        invalidate_cached_user(user.id)
     access_token = create_access_token(data={"sub": str(user.id)})
     return {
         "access_token": access_token,
@@ -49,18 +95,9 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)) -> dict:
         }
     }
 
-@router.get("/user")
-def get_user_by_email(email: str, db: Session = Depends(get_db)):
+@router.get("/me", response_model=UserResponse)
+def get_me(current_user: User = Depends(get_current_user)):
     """
-    Get user by email
+    The user the bearer token belongs to, no email lookup needed
     """
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return {
-        "id": user.id,
-        "email": user.email,
-        "full_name": user.full_name,
-        "created_at": user.created_at.isoformat()
-    }
\ No newline at end of file
+    return current_user
@@ -1,34 +1,91 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.db.database import get_db, SessionLocal
+from app.core.dependencies import get_llm_caller, get_user_resume
+from app.models.user import User
 from sqlalchemy.orm import Session
 from app.models.cover_letter import CoverLetter
-from app.models.resume_analysis import ResumeAnalysis
 from app.schemas.cover_letter import CoverLetterCreate, CoverLetterResponse
-from app.services.openai_service import generate_cover_letter_with_ai
-from app.utils.file_parser import extract_text_from_docx,extract_text_from_pdf
+from app.services.openai_service import generate_cover_letter_with_ai_async, stream_cover_letter_with_ai
+from app.services.resume_sections import resume_text_for
+from app.utils.sse import format_sse, SSE_HEADERS
+from app.services.single_flight import single_flight, make_flight_key
+from dotenv import load_dotenv
+import asyncio
+import os
+
+load_dotenv()
+# "share": identical concurrent requests from a user get the same saved cover letter,
+# "own": each gets its own record (the LLM call is shared either way)
+COVER_LETTER_COALESCED_RECORDS = os.getenv("COVER_LETTER_COALESCED_RECORDS", "own")
 
 router = APIRouter(prefix="/api/cover-letter", tags=["cover-letter"])
 
 @router.post("/generate", response_model=CoverLetterResponse, status_code=status.HTTP_201_CREATED)
-def generate_cover_letter(user_id: int, cover_letter_data: CoverLetterCreate, db: Session = Depends(get_db)):
-    resume = db.query(ResumeAnalysis).filter(ResumeAnalysis.id == cover_letter_data.resume_id, ResumeAnalysis.user_id == user_id).first()
-    if not resume:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-    if resume.filename.endswith('.pdf'):
-        resume_text = extract_text_from_pdf(resume.file_path)
+async def generate_cover_letter(cover_letter_data: CoverLetterCreate, force_refresh: bool = False, current_user: User = Depends(get_llm_caller), db: Session = Depends(get_db)):
+    user_id = current_user.id
+    # The connection is back in the pool during the LLM call, saving takes one of its own
+    resume = await run_in_threadpool(get_user_resume, db, cover_letter_data.resume_id, user_id)
+    resume_text = resume_text_for(resume, "generate_cover_letter")
+
+    async def generate_and_save() -> int:
+        cover_letter_text = await generate_cover_letter_with_ai_async(resume_text=resume_text, job_title=cover_letter_data.job_title, company_name=cover_letter_data.company_name, job_description=cover_letter_data.job_description, force_refresh=force_refresh)
+        cover_letter = await asyncio.to_thread(save_cover_letter, user_id, cover_letter_data, cover_letter_text)
+        return cover_letter.id
+
+    if COVER_LETTER_COALESCED_RECORDS == "share":
+        key = make_flight_key(user_id, cover_letter_data.resume_id, cover_letter_data.job_title, cover_letter_data.company_name, cover_letter_data.job_description)
+        cover_letter_id, _ = await single_flight.do("cover_letter_record", key, generate_and_save)
     else:
-        resume_text = extract_text_from_docx(resume.file_path)
+        cover_letter_id = await generate_and_save()
 
-    cover_letter_text = generate_cover_letter_with_ai(resume_text=resume_text, job_title=cover_letter_data.job_title, company_name=cover_letter_data.company_name, job_description=cover_letter_data.job_description)
-    cover_letter = CoverLetter(user_id=user_id, resume_id=cover_letter_data.resume_id, job_title=cover_letter_data.job_title, company_name=cover_letter_data.company_name, cover_letter_text=cover_letter_text)
+    return await run_in_threadpool(db.get, CoverLetter, cover_letter_id)
     
-    db.add(cover_letter)
-    db.commit()
-    db.refresh(cover_letter)
-
-    return cover_letter
     
-    
\ No newline at end of file
+
+def save_cover_letter(user_id: int, cover_letter_data: CoverLetterCreate, cover_letter_text: str) -> CoverLetter:
+    # The request-scoped session may already be closed once the stream is running
+    db = SessionLocal()
+    try:
+        cover_letter = CoverLetter(user_id=user_id, resume_id=cover_letter_data.resume_id, job_title=cover_letter_data.job_title, company_name=cover_letter_data.company_name, cover_letter_text=cover_letter_text)
+        db.add(cover_letter)
+        db.commit()
+        db.refresh(cover_letter)
+        return cover_letter
+    finally:
+        db.close()
+
+
+@router.post("/generate/stream")
+async def generate_cover_letter_stream(request: Request, cover_letter_data: CoverLetterCreate, force_refresh: bool = False, current_user: User = Depends(get_llm_caller), db: Session = Depends(get_db)):
+    """
+    Stream the cover letter as server-sent events: a `token` event per chunk,
+    then a `done` event carrying the saved cover letter's id
+    """
+    user_id = current_user.id
+    # The request session stays open until the stream ends, the connection doesn't
+    resume = await run_in_threadpool(get_user_resume, db, cover_letter_data.resume_id, user_id)
+    resume_text = resume_text_for(resume, "generate_cover_letter")
+
+    async def event_stream():
+        parts = []
+        tokens = stream_cover_letter_with_ai(resume_text=resume_text, job_title=cover_letter_data.job_title, company_name=cover_letter_data.company_name, job_description=cover_letter_data.job_description, force_refresh=force_refresh)
+        try:
+            async for token in tokens:
+                if await request.is_disconnected():
+                    # Client went away, stop generating and don't save a partial letter
+                    return
+                parts.append(token)
+                yield format_sse({"text": token}, event="token")
+        except Exception as e:
+            yield format_sse({"detail": str(e)}, event="error")
+            return
+        finally:
+            # Closes the upstream completion stream on disconnect or cancellation
+            await tokens.aclose()
+
+        cover_letter = await asyncio.to_thread(save_cover_letter, user_id, cover_letter_data, "".join(parts))
+        yield format_sse({"id": cover_letter.id}, event="done")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
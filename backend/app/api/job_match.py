@@ -1,46 +1,190 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from app.db.database import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.db.database import get_db, SessionLocal
+from app.core.dependencies import get_llm_caller, get_user_resume
+from app.models.user import User
 from sqlalchemy.orm import Session
 from app.models.job_match import JobMatch
-from app.models.resume_analysis import ResumeAnalysis
-from app.schemas.job_match import JobMatchCreate, JobMatchResponse
-from app.services.openai_service import analyze_job_match_with_ai
-from app.utils.file_parser import extract_text_from_pdf, extract_text_from_docx
+from app.schemas.job_match import JobMatchCreate, JobMatchBatchCreate, JobMatchResponse
+from app.services.openai_service import analyze_job_match_with_ai_async
+from app.services.match_scoring import score_postings
+from app.services.skill_extractor import extract_skills
+from app.services.resume_sections import resume_text_for
+from app.services.single_flight import single_flight, make_flight_key
+from app.services.llm_scheduler import PRIORITY_BATCH, set_llm_priority
+from app.utils.sse import format_sse, SSE_HEADERS
+from dotenv import load_dotenv
+import asyncio
+import os
+
+load_dotenv()
+JOB_MATCH_BATCH_CONCURRENCY = int(os.getenv("JOB_MATCH_BATCH_CONCURRENCY", 5))
+JOB_MATCH_BATCH_MAX_ITEMS = int(os.getenv("JOB_MATCH_BATCH_MAX_ITEMS", 50))
+JOB_MATCH_FAST_BATCH_MAX_ITEMS = int(os.getenv("JOB_MATCH_FAST_BATCH_MAX_ITEMS", 2000))
+# "share": identical concurrent requests from a user get the same saved job match,
+# "own": each gets its own record (the LLM call is shared either way)
+JOB_MATCH_COALESCED_RECORDS = os.getenv("JOB_MATCH_COALESCED_RECORDS", "own")
+
+MATCH_MODE_PATTERN = "^(ai|fast)$"
 
 router = APIRouter(
     prefix="/api/job-match",
     tags=["job-match"]
 )
 
+
+def fast_match_results(resume_text: str, job_descriptions: list[str]) -> list[dict]:
+    """
+    Score postings locally and shape the results like the LLM's match data.
+    Skills come from the skill taxonomy when the posting names any, otherwise
+    from the highest-weighted overlapping and missing terms.
+    """
+    resume_skills = set(extract_skills(resume_text))
+    results = []
+    for job_description, score in zip(job_descriptions, score_postings(resume_text, job_descriptions)):
+        job_skills = extract_skills(job_description)
+        if job_skills:
+            matching_skills = [skill for skill in job_skills if skill in resume_skills]
+            missing_skills = [skill for skill in job_skills if skill not in resume_skills]
+        else:
+            matching_skills = score["matching_terms"]
+            missing_skills = score["missing_terms"]
+        results.append({
+            "match_percentage": score["match_percentage"],
+            "matching_skills": matching_skills[:8],
+            "missing_skills": missing_skills[:5],
+            "suggestions": []
+        })
+    return results
+
+
 @router.post("/analyze", response_model=JobMatchResponse, status_code=status.HTTP_201_CREATED)
-def analyze_job_match(user_id: int, job_match_data: JobMatchCreate, db: Session = Depends(get_db)):
-    # 1. Fetch resume
-    resume = db.query(ResumeAnalysis).filter(ResumeAnalysis.id == job_match_data.resume_id, ResumeAnalysis.user_id == user_id).first()
-    if not resume:
+async def analyze_job_match(job_match_data: JobMatchCreate, mode: str = Query("ai", pattern=MATCH_MODE_PATTERN), force_refresh: bool = False, current_user: User = Depends(get_llm_caller), db: Session = Depends(get_db)):
+    user_id = current_user.id
+    # 1. Fetch resume, off the event loop; the connection is back in the pool
+    # before the LLM call and saving takes one of its own
+    resume = await run_in_threadpool(get_user_resume, db, job_match_data.resume_id, user_id)
+    resume_text = resume_text_for(resume, "match_scoring" if mode == "fast" else "analyze_job_match")
+
+    async def match_and_save() -> int:
+        if mode == "fast":
+            match_data = fast_match_results(resume_text, [job_match_data.job_description])[0]
+        else:
+            match_data = await analyze_job_match_with_ai_async(resume_text=resume_text, job_description=job_match_data.job_description, force_refresh=force_refresh)
+        job_match_ids = await asyncio.to_thread(save_job_matches, user_id, job_match_data.resume_id, [(0, job_match_data.job_description, match_data)])
+        return job_match_ids[0]
+
+    if JOB_MATCH_COALESCED_RECORDS == "share":
+        key = make_flight_key(user_id, job_match_data.resume_id, mode, job_match_data.job_description)
+        job_match_id, _ = await single_flight.do("job_match_record", key, match_and_save)
+    else:
+        job_match_id = await match_and_save()
+
+    return await run_in_threadpool(db.get, JobMatch, job_match_id)
+
+
+def save_job_matches(user_id: int, resume_id: int, results: list[tuple[int, str, dict]]) -> dict[int, int]:
+    """
+    Insert every successful match in one transaction, returns {index: job_match_id}
+    """
+    db = SessionLocal()
+    try:
+        job_matches = {
+            index: JobMatch(
+                user_id=user_id,
+                resume_id=resume_id,
+                job_description=job_description,
+                match_percentage=match_data["match_percentage"],
+                matching_skills=match_data["matching_skills"],
+                missing_skills=match_data["missing_skills"],
+                suggestions=match_data["suggestions"]
+            )
+            for index, job_description, match_data in results
+        }
+        db.add_all(job_matches.values())
+        db.commit()
+        return {index: job_match.id for index, job_match in job_matches.items()}
+    finally:
+        db.close()
+
+
+@router.post("/analyze-batch")
+async def analyze_job_match_batch(request: Request, batch_data: JobMatchBatchCreate, mode: str = Query("ai", pattern=MATCH_MODE_PATTERN), concurrency: int = JOB_MATCH_BATCH_CONCURRENCY, force_refresh: bool = False, current_user: User = Depends(get_llm_caller), db: Session = Depends(get_db)):
+    """
+    Match one resume against many job descriptions. Streams server-sent
+    events: a `result` or `error` event per job description as it finishes,
+    then a `done` event with the ids of the saved job matches. Matches that
+    finished before the client disconnected are saved all the same.
+    With mode=fast every posting is scored locally at once and results are
+    sent best match first.
+    """
+    user_id = current_user.id
+    max_items = JOB_MATCH_FAST_BATCH_MAX_ITEMS if mode == "fast" else JOB_MATCH_BATCH_MAX_ITEMS
+    if len(batch_data.job_descriptions) > max_items:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch can contain at most {max_items} job descriptions"
         )
-    if resume.filename.endswith('.pdf'):
-        resume_text = extract_text_from_pdf(resume.file_path)
-    else:
-        resume_text = extract_text_from_docx(resume.file_path)
-
-    match_data = analyze_job_match_with_ai(resume_text=resume_text, job_description=job_match_data.job_description)
-
-    job_match = JobMatch(
-    user_id=user_id,
-    resume_id=job_match_data.resume_id,
-    job_description=job_match_data.job_description,
-    match_percentage=match_data["match_percentage"],
-    matching_skills=match_data["matching_skills"],
-    missing_skills=match_data["missing_skills"],
-    suggestions=match_data["suggestions"]
-    )
-
-    db.add(job_match)
-    db.commit()
-    db.refresh(job_match)
-
-    return job_match
-    
\ No newline at end of file
+    resume = await run_in_threadpool(get_user_resume, db, batch_data.resume_id, user_id)
+    resume_text = resume_text_for(resume, "match_scoring" if mode == "fast" else "analyze_job_match")
+    semaphore = asyncio.Semaphore(max(1, min(concurrency, JOB_MATCH_BATCH_CONCURRENCY)))
+
+    async def run_match(index: int, job_description: str):
+        async with semaphore:
+            try:
+                match_data = await analyze_job_match_with_ai_async(resume_text=resume_text, job_description=job_description, force_refresh=force_refresh)
+                return index, job_description, match_data, None
+            except Exception as e:
+                return index, job_description, None, str(e)
+
+    async def fast_event_stream():
+        scored = await asyncio.to_thread(fast_match_results, resume_text, batch_data.job_descriptions)
+        results = [(index, batch_data.job_descriptions[index], match_data) for index, match_data in enumerate(scored)]
+        results.sort(key=lambda result: result[2]["match_percentage"], reverse=True)
+        for index, _, match_data in results:
+            yield format_sse({"index": index, **match_data}, event="result")
+
+        job_match_ids = await asyncio.to_thread(save_job_matches, user_id, batch_data.resume_id, results)
+        yield format_sse({
+            "job_match_ids": {str(index): job_match_id for index, job_match_id in sorted(job_match_ids.items())},
+            "succeeded": len(results),
+            "failed": 0
+        }, event="done")
+
+    async def event_stream():
+        # Batch items queue behind interactive requests for the LLM
+        set_llm_priority(PRIORITY_BATCH)
+        tasks = [asyncio.create_task(run_match(index, job_description)) for index, job_description in enumerate(batch_data.job_descriptions)]
+        results = []
+        job_match_ids = {}
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                index, job_description, match_data, error = await next_result
+                if error is None:
+                    results.append((index, job_description, match_data))
+                if await request.is_disconnected():
+                    return
+                if error is not None:
+                    yield format_sse({"index": index, "detail": error}, event="error")
+                    continue
+                yield format_sse({"index": index, **match_data}, event="result")
+        finally:
+            # Stop outstanding LLM calls if the client disconnected. single_flight
+            # cancels a call once no request is waiting on it any more.
+            for task in tasks:
+                task.cancel()
+            # Results already paid for are saved even when the client is gone;
+            # the shielded save finishes if the stream is cancelled meanwhile
+            if results:
+                save = asyncio.ensure_future(asyncio.to_thread(save_job_matches, user_id, batch_data.resume_id, results))
+                job_match_ids = await asyncio.shield(save)
+
+        yield format_sse({
+            "job_match_ids": {str(index): job_match_id for index, job_match_id in sorted(job_match_ids.items())},
+            "succeeded": len(results),
+            "failed": len(batch_data.job_descriptions) - len(results)
+        }, event="done")
+
+    stream = fast_event_stream() if mode == "fast" else event_stream()
+    return StreamingResponse(stream, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,120 @@
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.concurrency import run_in_threadpool
+from app.db.database import get_db, SessionLocal
+from app.core.dependencies import get_llm_caller, get_user_resume
+from app.models.user import User
+from sqlalchemy.orm import Session
+from app.models.resume_analysis import ResumeAnalysis
+from app.models.ats_check import ATSCheck
+from app.models.job_match import JobMatch
+from app.schemas.report import ReportCreate, ReportResponse
+from app.services.openai_service import analyze_resume_with_ai_async, check_ats_compatibility_with_ai_async, analyze_job_match_with_ai_async
+from app.services.llm_resilience import LLMUnavailableError, LLMDeadlineExceeded
+from app.services.llm_scheduler import LLMRateLimited
+from app.services.extraction import ExtractionError, extract_document
+from app.services.resume_sections import parse_resume_sections, resume_text_for
+from typing import Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/report",
+    tags=["report"]
+)
+
+
+async def _load_resume_text(resume: ResumeAnalysis) -> None:
+    """
+    Extract and section the resume if the analysis job hasn't done it yet
+    """
+    if resume.resume_text is None:
+        try:
+            resume.resume_text, resume.document_structure = await asyncio.to_thread(extract_document, resume.file_path, resume.filename)
+        except ExtractionError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+    if resume.resume_sections is None:
+        resume.resume_sections = parse_resume_sections(resume.resume_text)
+
+
+@router.post("", response_model=ReportResponse, status_code=status.HTTP_201_CREATED)
+async def create_report(report_data: ReportCreate, force_refresh: bool = False, current_user: User = Depends(get_llm_caller), db: Session = Depends(get_db)):
+    """
+    Resume analysis, ATS check and, when a job description is given, job
+    match in one request. The LLM calls run concurrently on a single
+    extraction, so this takes about as long as the slowest of them. All
+    records are saved in one transaction, or none if any step fails;
+    retrying is cheap since completed steps are served from the LLM cache.
+    """
+    user_id = current_user.id
+    # Detached, the connection is back in the pool during extraction and the LLM calls
+    resume = await run_in_threadpool(get_user_resume, db, report_data.resume_id, user_id, require_text=False)
+    await _load_resume_text(resume)
+
+    steps = {
+        # Both grade the raw extraction, layout noise included
+        "resume_analysis": analyze_resume_with_ai_async(resume.resume_text, force_refresh=force_refresh),
+        "ats_check": check_ats_compatibility_with_ai_async(resume.resume_text, force_refresh=force_refresh),
+    }
+    if report_data.job_description:
+        steps["job_match"] = analyze_job_match_with_ai_async(
+            resume_text=resume_text_for(resume, "analyze_job_match"),
+            job_description=report_data.job_description,
+            force_refresh=force_refresh
+        )
+    results = dict(zip(steps, await asyncio.gather(*steps.values(), return_exceptions=True)))
+
+    records = {}
+    for step, result in results.items():
+        try:
+            # Model output was validated when it was parsed, malformed output failed the step
+            if isinstance(result, BaseException):
+                raise result
+            records[step] = result
+        except (LLMUnavailableError, LLMDeadlineExceeded, LLMRateLimited):
+            # Handled app-wide as 503/504
+            raise
+        except Exception as e:
+            logger.warning("Report for resume %s failed at %s: %s", report_data.resume_id, step, e)
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Generating the {step.replace('_', ' ')} failed: {e}"
+            )
+
+    return await run_in_threadpool(save_report, user_id, resume, records, report_data.job_description)
+
+
+def save_report(user_id: int, resume: ResumeAnalysis, records: dict, job_description: Optional[str]) -> dict:
+    """
+    Save the extraction and every step's record in one transaction
+    """
+    db = SessionLocal()
+    try:
+        resume = db.merge(resume)
+        analysis = records["resume_analysis"]
+        resume.overall_score = analysis["overall_score"]
+        resume.analysis_text = analysis["analysis_text"]
+        resume.suggestions = analysis["suggestions"]
+        ats_check = ATSCheck(user_id=user_id, resume_id=resume.id, **records["ats_check"])
+        db.add(ats_check)
+        job_match = None
+        if "job_match" in records:
+            job_match = JobMatch(
+                user_id=user_id,
+                resume_id=resume.id,
+                job_description=job_description,
+                **records["job_match"]
+            )
+            db.add(job_match)
+        db.commit()
+        db.refresh(resume)
+        db.refresh(ats_check)
+        if job_match is not None:
+            db.refresh(job_match)
+        return {"resume_analysis": resume, "ats_check": ats_check, "job_match": job_match}
+    finally:
+        db.close()
@@ -1,51 +1,95 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, load_only
+from typing import Optional
 from app.models.resume_analysis import ResumeAnalysis
-from app.schemas.resume import ResumeAnalysisResponse
+from app.schemas.resume import ResumeAnalysisResponse, ResumeAnalysisSummary
+from app.schemas.analysis_job import AnalysisJobResponse
 from app.models.user import User
-from app.utils.file_parser import extract_text_from_pdf, extract_text_from_docx
-from app.services.openai_service import analyze_resume_with_ai
+from app.models.analysis_job import AnalysisJob
+from app.services.analysis_jobs import enqueue_resume_analysis, record_reused_analysis, JOB_COMPLETED
+from app.services.resume_storage import store_upload, find_resume_by_content, UploadTooLargeError
+from app.services.extraction import EXTRACTION_MAX_BYTES
+from app.services.resume_sections import parse_resume_sections
 from app.db.database import get_db
+from app.core.dependencies import ensure_current_user, get_current_user
+from app.utils.pagination import keyset_page, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from pathlib import Path
-import shutil
 
 router = APIRouter(prefix="/api/resume", tags=["resume"])
 
-@router.post("/upload", response_model=ResumeAnalysisResponse, status_code=status.HTTP_201_CREATED)
-def upload_resume(user_id: int, file: UploadFile = File(...), db: Session = Depends(get_db)):
+@router.post("/upload", response_model=AnalysisJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_resume(response: Response, file: UploadFile = File(...), force_refresh: bool = False, create_new_record: bool = False, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """
+    Identical content that was already analyzed is not extracted or analyzed
+    again: the existing results are returned with an already completed job
+    (200 instead of 202). The user's own matching analysis is returned as is
+    unless create_new_record is set, which copies the results into a new row.
+    force_refresh reuses the extracted text but always re-runs the analysis.
+    """
+    user_id = current_user.id
     if (not file.filename.endswith(".pdf") and not file.filename.endswith(".docx")):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File doesn't end in .pdf or .docx"
         )
-    upload_dir = Path(f"uploads/user_{user_id}/")
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    file_path = Path(upload_dir / file.filename)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    if file.filename.endswith(".pdf"):
-        resume_text = extract_text_from_pdf(str(file_path))
-    if file.filename.endswith(".docx"):
-        resume_text = extract_text_from_docx(str(file_path))
-    analysis = analyze_resume_with_ai(resume_text)
+    try:
+        content_hash, file_path = await run_in_threadpool(store_upload, file.file, Path(file.filename).suffix, EXTRACTION_MAX_BYTES)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+    job = await run_in_threadpool(record_upload, db, user_id, file.filename, file_path, content_hash, force_refresh, create_new_record)
+    if job.status == JOB_COMPLETED:
+        response.status_code = status.HTTP_200_OK
+    return job
+
+
+def record_upload(db: Session, user_id: int, filename: str, file_path: Path, content_hash: str, force_refresh: bool, create_new_record: bool) -> AnalysisJob:
+    existing = find_resume_by_content(db, content_hash, user_id)
+    if existing and existing.overall_score is not None and not force_refresh:
+        if existing.user_id == user_id and not create_new_record:
+            resume_analysis = existing
+        else:
+            resume_analysis = ResumeAnalysis(
+                user_id=user_id,
+                filename=filename,
+                file_path=str(file_path),
+                content_hash=content_hash,
+                overall_score=existing.overall_score,
+                analysis_text=existing.analysis_text,
+                suggestions=existing.suggestions,
+                resume_text=existing.resume_text,
+                document_structure=existing.document_structure,
+                resume_sections=existing.resume_sections
+            )
+            db.add(resume_analysis)
+            db.flush()
+        return record_reused_analysis(db, user_id=user_id, resume_id=resume_analysis.id)
+
+    # Analysis runs on the job queue, poll /api/jobs/{id} for the result.
+    # Text already extracted from identical content is carried over so the job skips extraction.
     resume_analysis = ResumeAnalysis(
         user_id=user_id,
-        filename=file.filename,
+        filename=filename,
         file_path=str(file_path),
-        overall_score=analysis["overall_score"],
-        analysis_text=analysis["analysis_text"],
-        suggestions=analysis["suggestions"]
+        content_hash=content_hash,
+        resume_text=existing.resume_text if existing else None,
+        document_structure=existing.document_structure if existing else None,
+        resume_sections=existing.resume_sections if existing else None
     )
     db.add(resume_analysis)
-    db.commit()
-    db.refresh(resume_analysis)
-    return resume_analysis
+    db.flush()
+    return enqueue_resume_analysis(db, user_id=user_id, resume_id=resume_analysis.id, force_refresh=force_refresh)
 
 
 @router.get("/{analysis_id}", response_model=ResumeAnalysisResponse)
-def get_resume_analysis(analysis_id: int, db: Session = Depends(get_db)):
+def get_resume_analysis(analysis_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     analysis = db.query(ResumeAnalysis).filter(
-        ResumeAnalysis.id == analysis_id).first()
+        ResumeAnalysis.id == analysis_id,
+        ResumeAnalysis.user_id == current_user.id).first()
 
     if not analysis:
         raise HTTPException(
@@ -55,9 +99,60 @@ def get_resume_analysis(analysis_id: int, db: Session = Depends(get_db)):
 
     return analysis
 
+@router.get("/{analysis_id}/sections")
+def get_resume_sections(analysis_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> dict:
+    """
+    The resume split into contact, summary, experience, skills, education
+    and projects
+    """
+    analysis = db.query(ResumeAnalysis).filter(
+        ResumeAnalysis.id == analysis_id,
+        ResumeAnalysis.user_id == current_user.id).first()
+
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume analysis not found"
+        )
+    if analysis.resume_text is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resume text has not been extracted yet"
+        )
+    if analysis.resume_sections is None:
+        analysis.resume_sections = parse_resume_sections(analysis.resume_text)
+        db.commit()
+    return analysis.resume_sections
+
 @router.get("/user/{user_id}", response_model=list[ResumeAnalysisResponse])
-def get_user_analysis(user_id: int, db: Session = Depends(get_db)):
-    analyses = db.query(ResumeAnalysis).filter(ResumeAnalysis.user_id == user_id).order_by(ResumeAnalysis.created_at.desc()).all()
+def get_user_analysis(user_id: int, response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    ensure_current_user(user_id, current_user)
+    # resume_text, document_structure and resume_sections aren't part of the response, don't load them
+    query = db.query(ResumeAnalysis).filter(ResumeAnalysis.user_id == user_id).options(
+        load_only(
+            ResumeAnalysis.id,
+            ResumeAnalysis.user_id,
+            ResumeAnalysis.filename,
+            ResumeAnalysis.file_path,
+            ResumeAnalysis.overall_score,
+            ResumeAnalysis.analysis_text,
+            ResumeAnalysis.suggestions,
+            ResumeAnalysis.created_at
+        )
+    )
+    analyses, next_cursor = keyset_page(query, ResumeAnalysis, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return analyses
-    
 
+
+@router.get("/user/{user_id}/summary", response_model=list[ResumeAnalysisSummary])
+def get_user_analysis_summaries(user_id: int, response: Response, cursor: Optional[str] = None, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    ensure_current_user(user_id, current_user)
+    query = db.query(ResumeAnalysis).filter(ResumeAnalysis.user_id == user_id).options(
+        load_only(ResumeAnalysis.id, ResumeAnalysis.filename, ResumeAnalysis.overall_score, ResumeAnalysis.created_at)
+    )
+    analyses, next_cursor = keyset_page(query, ResumeAnalysis, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return analyses
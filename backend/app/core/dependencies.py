@@ -0,0 +1,136 @@
+"""
+Request dependencies that resolve the authenticated user from the bearer
+token issued by /api/auth/login.
+
+Decoded claims are cached per token until the token expires, and User rows
+for a short TTL, so authenticating a request usually costs neither a
+signature check nor a database query.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+from app.core.metrics import register_cache
+from app.core.security import decode_access_token
+from app.db.database import get_db
+from app.models.resume_analysis import ResumeAnalysis
+from app.models.user import User
+from app.services.llm_scheduler import set_llm_caller
+from app.utils.ttl_cache import TTLCache
+import os
+
+load_dotenv()
+AUTH_CLAIMS_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CLAIMS_CACHE_MAX_ENTRIES", 10000))
+AUTH_USER_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", 2000))
+AUTH_USER_CACHE_TTL_SECONDS = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", 60))
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+_claims_cache = TTLCache(max_entries=AUTH_CLAIMS_CACHE_MAX_ENTRIES, ttl_seconds=3600)
+_user_cache = TTLCache(max_entries=AUTH_USER_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_USER_CACHE_TTL_SECONDS)
+
+
+register_cache("auth_claims", lambda: (_claims_cache.hits, _claims_cache.misses))
+register_cache("auth_user", lambda: (_user_cache.hits, _user_cache.misses))
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+def _token_claims(token: str) -> dict:
+    claims = _claims_cache.get(token)
+    if claims is not None:
+        return claims
+    try:
+        claims = decode_access_token(token)
+    except JWTError:
+        raise _unauthorized("Invalid or expired token")
+    # Never keep claims past the token's own expiry
+    ttl_seconds = claims["exp"] - datetime.now(timezone.utc).timestamp() if "exp" in claims else None
+    if ttl_seconds is None or ttl_seconds > 0:
+        _claims_cache.set(token, claims, ttl_seconds=ttl_seconds)
+    return claims
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    _user_cache.pop(user_id)
+
+
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    claims = _token_claims(credentials.credentials)
+    try:
+        user_id = int(claims.get("sub"))
+    except (TypeError, ValueError):
+        raise _unauthorized("Invalid token subject")
+
+    # Cached rows are detached from any session, only their column values are used
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise _unauthorized("User no longer exists")
+        db.expunge(user)
+        _user_cache.set(user_id, user)
+
+    if user.is_active is False:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    return user
+
+
+async def get_llm_caller(current_user: User = Depends(get_current_user)) -> User:
+    """
+    get_current_user for routes that call the LLM: their calls are charged
+    to the user's rate limits at interactive priority. Async, so the context
+    variable it sets is visible to the route.
+    """
+    set_llm_caller(current_user.id)
+    return current_user
+
+
+def ensure_current_user(user_id: int, current_user: User) -> None:
+    """
+    For routes that still carry a user id in the path: it has to be the caller's own
+    """
+    if user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not allowed to access another user's data"
+        )
+
+
+def get_user_resume(db: Session, resume_id: int, user_id: int, require_text: bool = True) -> ResumeAnalysis:
+    """
+    The caller's resume, detached, with the connection already handed back
+    to the pool so an async route can hold it across LLM calls. Blocking:
+    async routes call it through run_in_threadpool.
+    """
+    resume = db.query(ResumeAnalysis).filter(ResumeAnalysis.id == resume_id, ResumeAnalysis.user_id == user_id).first()
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    if require_text and resume.resume_text is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resume text has not been extracted yet"
+        )
+    db.expunge(resume)
+    db.commit()
+    return resume
@@ -0,0 +1,189 @@
+"""
+Application metrics served at /metrics in the Prometheus text format.
+
+Requests are timed by MetricsMiddleware, labelled with the route template
+(``/api/resume/{analysis_id}``, not the concrete path) so the number of
+series stays bounded. LLM calls, document extraction and connection pool
+checkouts are timed where they happen, pool usage is counted from pool
+events; cache hit ratios are read from the caches when /metrics is scraped.
+
+Metrics are prometheus_client metrics. With several uvicorn workers, set
+PROMETHEUS_MULTIPROC_DIR to an empty directory shared by the workers before
+they start: each worker then writes its values there and a scrape served by
+any worker reports all of them. Cache hit ratios, read at scrape time,
+describe the worker that served the scrape.
+"""
+import os
+import time
+from typing import Callable
+from dotenv import load_dotenv
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from starlette.routing import Match
+from app.utils.ttl_cache import TTLCache
+
+load_dotenv()
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# prometheus_client reads it from the environment itself, it has to be set before the workers start
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+UNMATCHED_ROUTE = "unmatched"
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests by route and status code",
+    ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response body is sent",
+    ("method", "route"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled",
+    ("method", "route"),
+    multiprocess_mode="livesum"
+)
+
+llm_request_duration = Histogram(
+    "llm_request_duration_seconds", "LLM call latency per service function, retries included",
+    ("function", "outcome"),
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+)
+llm_tokens = Counter(
+    "llm_tokens_total", "LLM tokens used per service function",
+    ("function", "type")
+)
+llm_queue_wait = Histogram(
+    "llm_queue_wait_seconds", "Time LLM calls waited for rate limiter admission",
+    ("priority",),
+    buckets=(0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+)
+
+extraction_duration = Histogram(
+    "document_extraction_duration_seconds", "Resume text extraction latency by file type and page count",
+    ("file_type", "pages", "outcome"),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+db_pool_connections = Gauge(
+    "db_pool_connections", "Database pool connections by state (open, checked_out)",
+    ("state",),
+    multiprocess_mode="livesum"
+)
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a database connection from the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30)
+)
+
+_cache_sources: dict[str, Callable[[], tuple[int, int]]] = {}
+
+
+def register_cache(cache: str, read_counts: Callable[[], tuple[int, int]]) -> None:
+    """
+    Report a cache's own hit and miss counters, ``read_counts()`` returns
+    (hits, misses) and is called on every scrape
+    """
+    _cache_sources[cache] = read_counts
+
+
+class ScrapeTimeCollector(Collector):
+    """
+    Values that already live elsewhere, read from their owners when
+    /metrics is scraped instead of being tracked twice
+    """
+    def collect(self):
+        requests = CounterMetricFamily("cache_requests", "Cache lookups by cache and result", labels=("cache", "result"))
+        hit_ratio = GaugeMetricFamily("cache_hit_ratio", "Share of cache lookups that were hits", labels=("cache",))
+        for cache, read_counts in list(_cache_sources.items()):
+            hits, misses = read_counts()
+            requests.add_metric((cache, "hit"), hits)
+            requests.add_metric((cache, "miss"), misses)
+            hit_ratio.add_metric((cache,), hits / (hits + misses) if hits + misses else 0)
+        yield requests
+        yield hit_ratio
+
+
+_scrape_time_collector = ScrapeTimeCollector()
+if not PROMETHEUS_MULTIPROC_DIR:
+    REGISTRY.register(_scrape_time_collector)
+
+
+def page_bucket(page_count) -> str:
+    if page_count is None:
+        return "unknown"
+    for upper, label in ((1, "1"), (2, "2"), (5, "3-5"), (10, "6-10"), (30, "11-30")):
+        if page_count <= upper:
+            return label
+    return "31+"
+
+
+def render_metrics() -> bytes:
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest(REGISTRY)
+    # Every worker's values from the shared directory, plus this worker's scrape-time ones
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(_scrape_time_collector)
+    return generate_latest(registry)
+
+
+def mark_process_dead() -> None:
+    """
+    Drop this worker's live gauges (requests in flight) from the shared
+    directory on shutdown, so a restarted worker doesn't leave them behind
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording count, latency and in-flight requests per
+    route template. Route templates are resolved once per method and path.
+    """
+    def __init__(self, app):
+        self.app = app
+        self._routes = TTLCache(max_entries=4096, ttl_seconds=3600)
+
+    def _route(self, scope) -> str:
+        cache_key = (scope["method"], scope["path"])
+        route = self._routes.get(cache_key)
+        if route is not None:
+            return route
+        route = UNMATCHED_ROUTE
+        for candidate in scope["app"].routes:
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate.path
+                break
+            if match == Match.PARTIAL and route == UNMATCHED_ROUTE:
+                # Right path, wrong method: still the same route for metrics
+                route = candidate.path
+        self._routes.set(cache_key, route)
+        return route
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route(scope)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method, route)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.labels(method, route).observe(time.perf_counter() - start)
+            http_requests.labels(method, route, status_code).inc()
+            in_flight.dec()
@@ -1,11 +1,38 @@
 from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import asyncio
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+# min/max rounds equal to the configured cost make any hash with a different
+# cost "need update", so it is rehashed on the next successful login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+# bcrypt releases the GIL, but each hash keeps a core busy for tens to hundreds
+# of milliseconds depending on BCRYPT_ROUNDS. Running it on its own small pool
+# keeps a login burst from occupying the threadpool every sync endpoint shares
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_pending = 0
+
+
+class PasswordHasherBusy(Exception):
+    """
+    More than PASSWORD_HASH_MAX_PENDING hash operations are queued
+    """
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
@@ -17,6 +44,26 @@ def hash_password(password:str) -> str:
 def verify_password(plain_password:str, hashed_password:str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+async def _run_password_task(function, *args):
+    global _pending
+    if _pending >= PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHasherBusy()
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, function, *args)
+    finally:
+        _pending -= 1
+
+async def hash_password_async(password:str) -> str:
+    return await _run_password_task(pwd_context.hash, password)
+
+async def verify_and_update_password_async(plain_password:str, hashed_password:str) -> tuple[bool, Optional[str]]:
+    """
+    Returns (verified, new_hash); new_hash is set when the stored hash was made
+    with a different cost and should replace it
+    """
+    return await _run_password_task(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -24,6 +71,9 @@ def create_access_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-
-
-
+def decode_access_token(token: str) -> dict:
+    """
+    Verify the signature and expiry of an access token and return its claims.
+    Raises JWTError if the token is invalid or expired.
+    """
+    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -0,0 +1,170 @@
+"""
+Per-request database instrumentation built on SQLAlchemy engine events.
+
+QueryInstrumentationMiddleware opens a QueryStats for every HTTP request in a
+context variable. The cursor execute hooks time each statement and record it
+on the current request's stats, so the Session from get_db, sessions opened in
+streaming responses and anything else on the engine are all counted. Totals go
+out as response headers, slow statements and repeated identical statements
+(the usual sign of an N+1 loop) are logged.
+
+``instrument_pool`` times connection checkouts and counts open and
+checked out connections from pool events, for /metrics.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from dotenv import load_dotenv
+from app.core.metrics import METRICS_ENABLED, db_pool_checkout_wait, db_pool_connections
+import logging
+import os
+import threading
+import time
+
+load_dotenv()
+DB_INSTRUMENTATION_ENABLED = os.getenv("DB_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 200))
+DB_REPEATED_STATEMENT_THRESHOLD = int(os.getenv("DB_REPEATED_STATEMENT_THRESHOLD", 5))
+DB_SLOWEST_STATEMENTS = int(os.getenv("DB_SLOWEST_STATEMENTS", 3))
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+def _shorten(statement: str, length: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest: list[tuple[float, str]] = []
+        self.statements: Counter = Counter()
+        # Threadpool work for the same request can record concurrently
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            self.statements[statement] += 1
+            self.slowest.append((duration_ms, statement))
+            self.slowest.sort(key=lambda entry: entry[0], reverse=True)
+            del self.slowest[DB_SLOWEST_STATEMENTS:]
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """
+        Statements executed at least DB_REPEATED_STATEMENT_THRESHOLD times.
+        Parameters are bound separately, so a query issued once per row of an
+        earlier result shows up here as one statement with a high count.
+        """
+        return [(statement, count) for statement, count in self.statements.most_common()
+                if count >= DB_REPEATED_STATEMENT_THRESHOLD]
+
+    def as_headers(self) -> dict[str, str]:
+        return {
+            "X-DB-Query-Count": str(self.count),
+            "X-DB-Time-Ms": f"{self.total_ms:.1f}",
+            "X-DB-Repeated-Statements": str(len(self.repeated())),
+            "Server-Timing": f"db;dur={self.total_ms:.1f}",
+        }
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+    if duration_ms >= DB_SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", duration_ms, _shorten(statement))
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not DB_INSTRUMENTATION_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_pool(engine: Engine) -> None:
+    """
+    Pool events registered on the engine carry over to the pool that
+    ``engine.dispose()`` creates, so usage keeps being counted
+    """
+    if not METRICS_ENABLED:
+        return
+    opened = db_pool_connections.labels("open")
+    checked_out = db_pool_connections.labels("checked_out")
+    event.listen(engine, "connect", lambda dbapi_connection, record: opened.inc())
+    event.listen(engine, "close", lambda dbapi_connection, record: opened.dec())
+    event.listen(engine, "close_detached", lambda dbapi_connection: opened.dec())
+    event.listen(engine, "checkout", lambda dbapi_connection, record, proxy: checked_out.inc())
+    event.listen(engine, "checkin", lambda dbapi_connection, record: checked_out.dec())
+
+    # No pool event fires before a checkout starts waiting, so time the call
+    # every Connection makes on the engine, which outlives its pools
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        start = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - start)
+
+    engine.raw_connection = timed_raw_connection
+
+
+class QueryInstrumentationMiddleware:
+    """
+    ASGI middleware that collects QueryStats for each HTTP request. Headers
+    reflect the statements run before the response started; the log line at
+    the end of the request also covers statements from streamed bodies.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not DB_INSTRUMENTATION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.extend((name.lower().encode(), value.encode()) for name, value in stats.as_headers().items())
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            self._log(scope, stats)
+
+    @staticmethod
+    def _log(scope, stats: QueryStats) -> None:
+        route = f"{scope['method']} {scope['path']}"
+        for statement, count in stats.repeated():
+            logger.warning("%s ran the same statement %s times (possible N+1): %s", route, count, _shorten(statement))
+        logger.debug(
+            "%s: %s queries in %.1f ms, slowest: %s",
+            route, stats.count, stats.total_ms,
+            [f"{duration_ms:.1f} ms {_shorten(statement, 80)}" for duration_ms, statement in stats.slowest]
+        )
@@ -1,6 +1,11 @@
-from fastapi import FastAPI
+import math
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 from app.db.database import engine, Base
+from app.db.instrumentation import QueryInstrumentationMiddleware
+from app.core.metrics import MetricsMiddleware, mark_process_dead, render_metrics
 from sqlalchemy import text
 from app.api.auth import router as auth_router
 from app.api.resume import router as resume_router
@@ -8,6 +13,19 @@ from app.api.cover_letter import router as cover_letter_router
 from app.api.job_match import router as job_match_router
 from app.api.ats_check import router as ats_check_router
 from app.api.application import router as application_router
+from app.api.analysis_job import router as analysis_job_router
+from app.api.report import router as report_router
+from app.services.llm_cache import llm_cache
+from app.services.prompt_budget import token_usage
+from app.services.single_flight import single_flight
+from app.services.llm_resilience import LLMError, LLMUnavailableError, LLMDeadlineExceeded, resilience_stats
+from app.services.llm_scheduler import LLMRateLimited, llm_scheduler
+from app.services.openai_client import init_openai_clients, close_openai_clients
+from app.services.analysis_jobs import job_worker, requeue_stale_jobs, ANALYSIS_WORKER_MODE
+from app.services.skill_extractor import get_skill_matcher
+from app.services.extraction import shutdown_extraction_pool
+from app.utils.pdf_backends import get_pdf_backend
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 
 app = FastAPI(title="Job Application Assistant API")
@@ -18,7 +36,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.add_middleware(QueryInstrumentationMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(LLMError)
+async def llm_error_handler(request: Request, exc: LLMError):
+    if isinstance(exc, LLMRateLimited):
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(math.ceil(exc.retry_after))}
+        )
+    if isinstance(exc, LLMUnavailableError):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(int(exc.retry_after))}
+        )
+    if isinstance(exc, LLMDeadlineExceeded):
+        return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": str(exc)})
+    return JSONResponse(status_code=status.HTTP_502_BAD_GATEWAY, content={"detail": str(exc)})
+
+
+@app.on_event("startup")
+async def startup():
+    init_openai_clients()
+    get_skill_matcher()
+    # Fail fast on a misconfigured or missing PDF_EXTRACTION_BACKEND
+    get_pdf_backend()
+    if ANALYSIS_WORKER_MODE == "inprocess":
+        requeue_stale_jobs()
+        job_worker.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await job_worker.stop()
+    await close_openai_clients()
+    shutdown_extraction_pool()
+    mark_process_dead()
 
 
 @app.get("/")
@@ -34,10 +93,60 @@ app.include_router(cover_letter_router)
 app.include_router(job_match_router)
 app.include_router(ats_check_router)
 app.include_router(application_router)
+app.include_router(analysis_job_router)
+app.include_router(report_router)
+
+
+@app.get("/api/llm-cache/stats")
+async def llm_cache_stats():
+    """
+    LLM response cache hit/miss counters
+    """
+    return llm_cache.stats()
+
+
+@app.get("/api/llm-usage/stats")
+async def llm_usage_stats():
+    """
+    LLM input/output tokens per function and what prompt trimming saved
+    """
+    return token_usage.stats()
+
+
+@app.get("/api/llm-resilience/stats")
+async def llm_resilience_stats():
+    """
+    LLM retry, hedging and circuit breaker counters
+    """
+    return resilience_stats()
+
+
+@app.get("/api/single-flight/stats")
+async def single_flight_stats():
+    """
+    How many calls joined an identical call already in flight, per function
+    """
+    return single_flight.stats()
+
+
+@app.get("/api/llm-scheduler/stats")
+async def llm_scheduler_stats():
+    """
+    LLM rate limiter admissions, rejections and queue length
+    """
+    return llm_scheduler.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics in the text exposition format
+    """
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/api/test-db")
-async def test_database():
+def test_database():
     """
     Test database connection
     """
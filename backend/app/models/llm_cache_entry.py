@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String, Table, Text
+from app.db.database import Base
+
+# Shared tier of app.services.llm_cache, read and written with Core statements
+llm_cache_entries = Table(
+    "llm_cache_entries",
+    Base.metadata,
+    Column("key", String(64), primary_key=True),
+    Column("function", String, nullable=False, index=True),
+    Column("value", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("expires_at", DateTime, nullable=False, index=True),
+)
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from app.db.database import Base
 
 class ResumeAnalysis(Base):
     __tablename__ = "resume_analyses"
+    __table_args__ = (
+        Index("ix_resume_analyses_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     filename = Column(String, nullable=False)
@@ -11,6 +14,11 @@ class ResumeAnalysis(Base):
     overall_score = Column(Integer, nullable=True)
     analysis_text = Column(Text, nullable=True)
     suggestions = Column(JSON, nullable=True)
+    resume_text = Column(Text, nullable=True)
+    # None is stored as SQL NULL, not JSON null, so "not extracted yet" is one IS NULL check
+    document_structure = Column(JSON(none_as_null=True), nullable=True)
+    resume_sections = Column(JSON(none_as_null=True), nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     
\ No newline at end of file
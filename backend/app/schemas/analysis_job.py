@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class AnalysisJobResponse(BaseModel):
+    id: int
+    user_id: int
+    resume_id: int
+    job_type: str
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    run_after: Optional[datetime] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    class Config:
+        from_attributes = True
@@ -15,4 +15,10 @@ class ATSCheckResponse(BaseModel):
     is_ats_friendly: bool
     created_at: datetime
     class Config():
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ATSCheckResult(BaseModel):
+    ats_score: int
+    issues_found: list[str]
+    recommendations: list[str]
+    is_ats_friendly: bool
@@ -37,3 +37,14 @@ class JobApplicationResponse(BaseModel):
     updated_at: datetime
     class Config():
         from_attributes = True
+
+class JobApplicationSummary(BaseModel):
+    id: int
+    company_name: str
+    job_title: str
+    status: str
+    location: Optional[str] = None
+    application_date: date
+    created_at: datetime
+    class Config():
+        from_attributes = True
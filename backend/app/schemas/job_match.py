@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, Any
 
@@ -6,6 +6,16 @@ class JobMatchCreate(BaseModel):
     job_description: str
     resume_id: int
 
+class JobMatchBatchCreate(BaseModel):
+    resume_id: int
+    job_descriptions: list[str] = Field(..., min_length=1)
+
+class JobMatchResult(BaseModel):
+    match_percentage: int
+    matching_skills: list[str]
+    missing_skills: list[str]
+    suggestions: list[str]
+
 class JobMatchResponse(BaseModel):
     id: int
     user_id: int
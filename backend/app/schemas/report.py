@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+from app.schemas.resume import ResumeAnalysisResponse
+from app.schemas.ats_check import ATSCheckResponse
+from app.schemas.job_match import JobMatchResponse
+
+class ReportCreate(BaseModel):
+    resume_id: int
+    job_description: Optional[str] = None
+
+class ReportResponse(BaseModel):
+    resume_analysis: ResumeAnalysisResponse
+    ats_check: ATSCheckResponse
+    job_match: Optional[JobMatchResponse] = None
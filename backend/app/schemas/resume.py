@@ -13,3 +13,11 @@ class ResumeAnalysisResponse(BaseModel):
     created_at: datetime 
     class Config:
         from_attributes = True
+
+class ResumeAnalysisSummary(BaseModel):
+    id: int
+    filename: str
+    overall_score: Optional[int]
+    created_at: datetime
+    class Config:
+        from_attributes = True
@@ -0,0 +1,81 @@
+"""
+Backfill resume_analyses.resume_text, document_structure, resume_sections
+and content_hash for rows uploaded before they were persisted at upload time.
+
+Usage (from the backend directory):
+    python -m app.scripts.backfill_resume_text [--batch-size 100] [--reparse-sections]
+
+--reparse-sections also re-parses the sections of every row that already
+has text, after a change to the section parser.
+"""
+import argparse
+from app.db.database import SessionLocal
+from app.models.resume_analysis import ResumeAnalysis
+from sqlalchemy import Text, cast, or_
+from app.services.resume_storage import hash_file
+from app.services.extraction import extract_document, shutdown_extraction_pool
+from app.services.resume_sections import parse_resume_sections
+
+
+def _json_missing(column):
+    # Rows written before the columns stored None as SQL NULL hold JSON null
+    return or_(column.is_(None), cast(column, Text) == "null")
+
+
+def backfill_resume_text(batch_size: int = 100, reparse_sections: bool = False) -> dict:
+    db = SessionLocal()
+    updated = 0
+    failed = []
+    last_id = 0
+    try:
+        while True:
+            missing = or_(
+                ResumeAnalysis.resume_text.is_(None),
+                _json_missing(ResumeAnalysis.document_structure),
+                _json_missing(ResumeAnalysis.resume_sections),
+                ResumeAnalysis.content_hash.is_(None)
+            )
+            if reparse_sections:
+                missing = or_(missing, ResumeAnalysis.resume_text.is_not(None))
+            resumes = db.query(ResumeAnalysis).filter(
+                missing,
+                ResumeAnalysis.id > last_id
+            ).order_by(ResumeAnalysis.id).limit(batch_size).all()
+            if not resumes:
+                break
+
+            for resume in resumes:
+                try:
+                    if resume.resume_text is None or resume.document_structure is None:
+                        text, resume.document_structure = extract_document(resume.file_path, resume.filename)
+                        if resume.resume_text is None:
+                            resume.resume_text = text
+                    resume.resume_sections = parse_resume_sections(resume.resume_text)
+                    if resume.content_hash is None:
+                        resume.content_hash = hash_file(resume.file_path)
+                    updated += 1
+                except Exception as e:
+                    failed.append({"id": resume.id, "error": str(e)})
+            last_id = resumes[-1].id
+            db.commit()
+    finally:
+        db.close()
+        shutdown_extraction_pool()
+
+    return {"updated": updated, "failed": failed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill extracted resume text")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--reparse-sections", action="store_true", help="Re-parse sections of rows that already have text")
+    args = parser.parse_args()
+
+    result = backfill_resume_text(batch_size=args.batch_size, reparse_sections=args.reparse_sections)
+    print(f"Backfilled {result['updated']} resume(s)")
+    for failure in result["failed"]:
+        print(f"  Failed resume {failure['id']}: {failure['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Database-backed queue for resume analysis jobs.
+
+Jobs live in the analysis_jobs table, so no external broker is needed: the
+API enqueues a row and a JobWorker (either inside the API process or in
+``python -m app.workers.analysis_worker``) claims queued rows, runs text
+extraction and the LLM analysis, and records the outcome.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.analysis_job import AnalysisJob
+from app.models.resume_analysis import ResumeAnalysis
+from app.services.openai_service import analyze_resume_with_ai_async
+from app.services.llm_resilience import LLMUnavailableError
+from app.services.llm_scheduler import LLMRateLimited, PRIORITY_BACKGROUND, set_llm_caller
+from app.services.extraction import ExtractionError, extract_document
+from app.services.resume_sections import parse_resume_sections
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+ANALYSIS_WORKER_MODE = os.getenv("ANALYSIS_WORKER_MODE", "inprocess")
+ANALYSIS_WORKER_CONCURRENCY = int(os.getenv("ANALYSIS_WORKER_CONCURRENCY", 4))
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", 3))
+ANALYSIS_JOB_POLL_INTERVAL = float(os.getenv("ANALYSIS_JOB_POLL_INTERVAL", 1.0))
+ANALYSIS_JOB_STALE_SECONDS = int(os.getenv("ANALYSIS_JOB_STALE_SECONDS", 600))
+ANALYSIS_JOB_RETRY_BASE_SECONDS = float(os.getenv("ANALYSIS_JOB_RETRY_BASE_SECONDS", 10))
+ANALYSIS_JOB_RETRY_MAX_SECONDS = float(os.getenv("ANALYSIS_JOB_RETRY_MAX_SECONDS", 600))
+
+JOB_TYPE_RESUME_ANALYSIS = "resume_analysis"
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+TERMINAL_STATUSES = (JOB_COMPLETED, JOB_FAILED)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_resume_analysis(db: Session, user_id: int, resume_id: int, force_refresh: bool = False) -> AnalysisJob:
+    job = AnalysisJob(
+        user_id=user_id,
+        resume_id=resume_id,
+        job_type=JOB_TYPE_RESUME_ANALYSIS,
+        status=JOB_QUEUED,
+        force_refresh=force_refresh,
+        attempts=0
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    job_worker.notify()
+    return job
+
+
+def record_reused_analysis(db: Session, user_id: int, resume_id: int) -> AnalysisJob:
+    """
+    Record an already completed job for a resume whose analysis was reused,
+    so clients follow the same job flow as for a fresh upload
+    """
+    now = _now()
+    job = AnalysisJob(
+        user_id=user_id,
+        resume_id=resume_id,
+        job_type=JOB_TYPE_RESUME_ANALYSIS,
+        status=JOB_COMPLETED,
+        force_refresh=False,
+        attempts=0,
+        started_at=now,
+        finished_at=now
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_next_job() -> Optional[int]:
+    """
+    Atomically move the oldest queued job that isn't backing off to running
+    and return its id. The conditional UPDATE keeps two workers from
+    claiming the same row even on databases that ignore SKIP LOCKED.
+    """
+    db = SessionLocal()
+    try:
+        while True:
+            candidate = db.query(AnalysisJob.id).filter(
+                AnalysisJob.status == JOB_QUEUED,
+                or_(AnalysisJob.run_after.is_(None), AnalysisJob.run_after <= _now())
+            ).order_by(AnalysisJob.id).with_for_update(skip_locked=True).first()
+            if candidate is None:
+                db.rollback()
+                return None
+
+            claimed = db.execute(
+                update(AnalysisJob)
+                .where(AnalysisJob.id == candidate.id, AnalysisJob.status == JOB_QUEUED)
+                .values(status=JOB_RUNNING, started_at=_now(), attempts=AnalysisJob.attempts + 1)
+            )
+            db.commit()
+            if claimed.rowcount == 1:
+                return candidate.id
+    finally:
+        db.close()
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Put jobs back on the queue that were left running by a worker that died
+    """
+    cutoff = _now() - timedelta(seconds=ANALYSIS_JOB_STALE_SECONDS)
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.status == JOB_RUNNING, AnalysisJob.started_at < cutoff)
+            .values(status=JOB_QUEUED)
+        )
+        db.commit()
+        return result.rowcount
+    finally:
+        db.close()
+
+
+def _load_resume_text(job_id: int) -> tuple[str, bool, int]:
+    db = SessionLocal()
+    try:
+        job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        resume = db.query(ResumeAnalysis).filter(ResumeAnalysis.id == job.resume_id).first()
+        if resume.resume_text is None:
+            resume.resume_text, resume.document_structure = extract_document(resume.file_path, resume.filename)
+        if resume.resume_sections is None:
+            resume.resume_sections = parse_resume_sections(resume.resume_text)
+        # Keep the extraction even if the analysis fails, a retry won't redo it
+        db.commit()
+        # The analysis grades formatting too, so it gets the raw extraction, not the sections
+        return resume.resume_text, job.force_refresh, job.user_id
+    finally:
+        db.close()
+
+
+def _complete_job(job_id: int, analysis: dict) -> None:
+    db = SessionLocal()
+    try:
+        job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        resume = db.query(ResumeAnalysis).filter(ResumeAnalysis.id == job.resume_id).first()
+        resume.overall_score = analysis["overall_score"]
+        resume.analysis_text = analysis["analysis_text"]
+        resume.suggestions = analysis["suggestions"]
+        job.status = JOB_COMPLETED
+        job.error = None
+        job.finished_at = _now()
+        db.commit()
+    finally:
+        db.close()
+
+
+def retry_delay(attempts: int, retry_after: float = 0) -> float:
+    """
+    Exponential backoff after the given number of attempts, but never
+    sooner than the ``retry_after`` the failure asked for
+    """
+    backoff = min(ANALYSIS_JOB_RETRY_MAX_SECONDS, ANALYSIS_JOB_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1))
+    return max(backoff, retry_after)
+
+
+def _fail_job(job_id: int, error: str, retry: bool = True, retry_after: float = 0) -> None:
+    db = SessionLocal()
+    try:
+        job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        job.error = error
+        if not retry or job.attempts >= ANALYSIS_JOB_MAX_ATTEMPTS:
+            job.status = JOB_FAILED
+            job.finished_at = _now()
+        else:
+            job.status = JOB_QUEUED
+            job.run_after = _now() + timedelta(seconds=retry_delay(job.attempts, retry_after))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_resume_analysis_job(job_id: int) -> None:
+    try:
+        resume_text, force_refresh, user_id = await asyncio.to_thread(_load_resume_text, job_id)
+        # Queued work yields to interactive requests but still counts against its user's quota
+        set_llm_caller(user_id, PRIORITY_BACKGROUND)
+        analysis = await analyze_resume_with_ai_async(resume_text, force_refresh=force_refresh)
+        await asyncio.to_thread(_complete_job, job_id, analysis)
+    except ExtractionError as e:
+        # Over the limits or unreadable, retrying won't change the outcome
+        logger.warning("Analysis job %s failed: %s", job_id, e)
+        await asyncio.to_thread(_fail_job, job_id, str(e), False)
+    except (LLMRateLimited, LLMUnavailableError) as e:
+        # Over quota or the provider is down: retry once it should have recovered
+        logger.warning("Analysis job %s postponed: %s", job_id, e)
+        await asyncio.to_thread(_fail_job, job_id, str(e), True, e.retry_after)
+    except Exception as e:
+        logger.exception("Analysis job %s failed", job_id)
+        await asyncio.to_thread(_fail_job, job_id, str(e))
+
+
+def get_job(db: Session, job_id: int, user_id: int) -> Optional[AnalysisJob]:
+    return db.query(AnalysisJob).filter(AnalysisJob.id == job_id, AnalysisJob.user_id == user_id).first()
+
+
+async def wait_for_job(job_id: int, user_id: int, timeout: float) -> Optional[AnalysisJob]:
+    """
+    Long-poll until the job reaches a terminal status or ``timeout`` elapses.
+    In-process completions wake waiters immediately; jobs run by an external
+    worker are picked up on the next poll.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        job = await asyncio.to_thread(_fetch_job, job_id, user_id)
+        remaining = deadline - loop.time()
+        if job is None or job.status in TERMINAL_STATUSES or remaining <= 0:
+            return job
+        await job_worker.wait_for_completion(job_id, min(remaining, ANALYSIS_JOB_POLL_INTERVAL))
+
+
+def _fetch_job(job_id: int, user_id: int) -> Optional[AnalysisJob]:
+    db = SessionLocal()
+    try:
+        job = get_job(db, job_id, user_id)
+        if job is not None:
+            db.expunge(job)
+        return job
+    finally:
+        db.close()
+
+
+class JobWorker:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._completions: dict[int, asyncio.Event] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def join(self) -> None:
+        await asyncio.gather(*self._tasks)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """
+        Wake idle workers after a job was enqueued; safe to call from any thread
+        """
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def wait_for_completion(self, job_id: int, timeout: float) -> None:
+        event = self._completions.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            # Don't keep events around for jobs another process is running
+            if self._completions.get(job_id) is event:
+                del self._completions[job_id]
+
+    async def _run(self) -> None:
+        while True:
+            job_id = await asyncio.to_thread(claim_next_job)
+            if job_id is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), ANALYSIS_JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await run_resume_analysis_job(job_id)
+            event = self._completions.pop(job_id, None)
+            if event is not None:
+                event.set()
+
+
+job_worker = JobWorker(concurrency=ANALYSIS_WORKER_CONCURRENCY)
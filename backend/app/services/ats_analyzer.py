@@ -0,0 +1,169 @@
+"""
+Rule-based ATS compatibility checks that run locally in milliseconds.
+
+Works on the extracted resume text plus, when available, the document
+structure captured at upload. Produces the same shape as
+check_ats_compatibility_with_ai so either can back an ATSCheck row.
+"""
+import re
+from typing import Optional
+from app.services.skill_extractor import extract_skills
+
+ATS_FRIENDLY_THRESHOLD = 70
+
+SECTION_PATTERNS = {
+    "experience": r"([a-z]+\s+){0,2}experience|employment(\s+history)?|work\s+history",
+    "education": r"education(\s+and\s+training)?|academic\s+background",
+    "skills": r"(technical\s+|core\s+|key\s+)?skills|core\s+competencies|technologies",
+    "summary": r"((career|professional|executive)\s+)?summary|profile|objective|about\s+me",
+    "projects": r"(personal\s+|selected\s+)?projects",
+    "certifications": r"certifications?|licenses?(\s+and\s+certifications)?",
+}
+REQUIRED_SECTIONS = ("experience", "education", "skills")
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_PATTERN = re.compile(r"(\+?\d{1,2}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}")
+BULLET_PATTERN = re.compile(r"^\s*([•▪●◦‣–⁃■►→➢*-]|\d+[.)])\s+")
+COLUMN_GAP_PATTERN = re.compile(r"\S(\s{4,}|\t+)\S")
+# Private-use glyphs (icon fonts), replacement chars, ligatures and control chars
+ODD_CHARACTER_PATTERN = re.compile("[\ue000-\uf8ff\ufffd\ufb00-\ufb06\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+LONG_PARAGRAPH_WORDS = 80
+MIN_SKILLS = 5
+MIN_WORDS = 200
+MAX_WORDS = 1200
+
+PENALTIES = {
+    "missing_section": 12,
+    "missing_email": 10,
+    "missing_phone": 5,
+    "few_bullets": 10,
+    "long_paragraphs": 8,
+    "odd_characters": 8,
+    "column_layout": 12,
+    "few_skills": 6,
+    "too_short": 10,
+    "too_long": 5,
+    "tables": 10,
+    "images": 5,
+    "text_boxes": 10,
+    "header_footer": 8,
+    "too_many_pages": 5,
+}
+
+
+def find_sections(lines: list[str]) -> set[str]:
+    found = set()
+    for line in lines:
+        candidate = line.strip().strip(":").lower()
+        # Headers are short lines, not sentences that happen to mention a keyword
+        if not candidate or len(candidate.split()) > 5:
+            continue
+        for section, pattern in SECTION_PATTERNS.items():
+            if re.fullmatch(pattern, candidate):
+                found.add(section)
+    return found
+
+
+def split_paragraphs(lines: list[str]) -> list[str]:
+    paragraphs = []
+    current = []
+    for line in lines:
+        if not line.strip() or BULLET_PATTERN.match(line):
+            if current:
+                paragraphs.append(" ".join(current))
+            current = [line.strip()] if line.strip() else []
+        else:
+            current.append(line.strip())
+    if current:
+        paragraphs.append(" ".join(current))
+    return paragraphs
+
+
+def analyze_ats(resume_text: str, document_structure: Optional[dict] = None) -> dict:
+    lines = resume_text.splitlines()
+    non_empty_lines = [line for line in lines if line.strip()]
+    word_count = len(resume_text.split())
+    issues = []
+    recommendations = []
+    score = 100
+
+    def flag(penalty: str, issue: str, recommendation: str):
+        nonlocal score
+        score -= PENALTIES[penalty]
+        issues.append(issue)
+        recommendations.append(recommendation)
+
+    sections = find_sections(lines)
+    for section in REQUIRED_SECTIONS:
+        if section not in sections:
+            flag("missing_section", f"No standard '{section.title()}' section header found",
+                 f"Add a clearly labelled '{section.title()}' section so the ATS can map your content")
+
+    if not EMAIL_PATTERN.search(resume_text):
+        flag("missing_email", "No email address found in the resume text",
+             "Put your email address in the body of the resume near the top")
+    if not PHONE_PATTERN.search(resume_text):
+        flag("missing_phone", "No phone number found in the resume text",
+             "Add a phone number in a standard format, e.g. (555) 123-4567")
+
+    bullet_count = sum(1 for line in lines if BULLET_PATTERN.match(line))
+    if bullet_count < 3:
+        flag("few_bullets", "Little or no bullet point usage detected",
+             "Describe responsibilities and achievements as bullet points")
+
+    long_paragraphs = [p for p in split_paragraphs(lines) if len(p.split()) > LONG_PARAGRAPH_WORDS]
+    if long_paragraphs:
+        flag("long_paragraphs", f"{len(long_paragraphs)} paragraph(s) longer than {LONG_PARAGRAPH_WORDS} words",
+             "Break long paragraphs into concise bullet points")
+
+    odd_characters = ODD_CHARACTER_PATTERN.findall(resume_text)
+    if odd_characters:
+        flag("odd_characters", f"{len(odd_characters)} unusual or unreadable character(s) in the extracted text",
+             "Replace icons, symbol fonts and decorative characters with plain text")
+
+    column_gap_lines = sum(1 for line in non_empty_lines if COLUMN_GAP_PATTERN.search(line) or line.count("|") >= 2)
+    short_lines = sum(1 for line in non_empty_lines if len(line.split()) <= 2)
+    if non_empty_lines and (column_gap_lines / len(non_empty_lines) > 0.15 or short_lines / len(non_empty_lines) > 0.6):
+        flag("column_layout", "Text layout suggests tables or multiple columns",
+             "Use a single-column layout without tables so content is read in order")
+
+    skills = extract_skills(resume_text)
+    if len(skills) < MIN_SKILLS:
+        flag("few_skills", f"Only {len(skills)} recognizable skill keyword(s) found",
+             "List concrete tools, technologies and skills using their standard names")
+
+    if word_count < MIN_WORDS:
+        flag("too_short", f"Resume is very short ({word_count} words)",
+             "Expand on your experience with specific, quantified achievements")
+    elif word_count > MAX_WORDS:
+        flag("too_long", f"Resume is long ({word_count} words)",
+             "Trim older or less relevant content to keep the resume focused")
+
+    if document_structure:
+        if document_structure.get("table_count"):
+            flag("tables", f"Document contains {document_structure['table_count']} table(s)",
+                 "Replace tables with plain text sections")
+        if document_structure.get("image_count"):
+            flag("images", f"Document contains {document_structure['image_count']} image(s)",
+                 "Remove images and graphics, ATS software ignores them")
+        if document_structure.get("text_box_count"):
+            flag("text_boxes", "Document uses text boxes",
+                 "Move text out of text boxes into the main document body")
+        if document_structure.get("header_footer_text"):
+            flag("header_footer", "Content placed in the page header or footer",
+                 "Move contact details and other content from headers/footers into the body")
+        if (document_structure.get("page_count") or 0) > 2:
+            flag("too_many_pages", f"Document is {document_structure['page_count']} pages long",
+                 "Keep the resume to one or two pages")
+
+    score = max(0, min(100, score))
+    if not recommendations:
+        recommendations.append("Tailor keywords in your skills and experience sections to each job description")
+
+    return {
+        "ats_score": score,
+        "issues_found": issues,
+        "recommendations": recommendations,
+        "is_ats_friendly": score >= ATS_FRIENDLY_THRESHOLD
+    }
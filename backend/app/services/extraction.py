@@ -0,0 +1,169 @@
+"""
+Resume text extraction in a bounded process pool.
+
+PyPDF2 and python-docx are pure Python and CPU bound, so parsing in a thread
+holds the GIL and slows every other request in the process. Documents are
+parsed in a small pool of worker processes instead, with limits on file size,
+page count and wall-clock time. Large PDFs are split into page ranges that are
+extracted in parallel and joined in order, when the PDF backend can open a
+page range without parsing the whole file (PyPDF2 can't).
+
+A worker stuck on a malformed document can't be interrupted, and the pool
+can't tell which of its processes runs which task, so on a timeout the pool is
+torn down and its processes killed. Other extractions caught in that reset
+aren't at fault and are run once more on a fresh pool.
+
+Each extraction's latency is recorded on /metrics by file type and page count.
+"""
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+import time
+from typing import Optional
+import weakref
+from dotenv import load_dotenv
+from app.core.metrics import extraction_duration, page_bucket
+from app.utils.file_parser import extract_text, extract_text_from_pdf, inspect_document_structure
+from app.utils.pdf_backends import has_cheap_page_ranges
+
+load_dotenv()
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", min(4, os.cpu_count() or 1)))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", 30))
+EXTRACTION_MAX_BYTES = int(os.getenv("EXTRACTION_MAX_BYTES", 10 * 1024 * 1024))
+EXTRACTION_MAX_PAGES = int(os.getenv("EXTRACTION_MAX_PAGES", 30))
+EXTRACTION_PARALLEL_MIN_PAGES = int(os.getenv("EXTRACTION_PARALLEL_MIN_PAGES", 8))
+EXTRACTION_PAGES_PER_TASK = int(os.getenv("EXTRACTION_PAGES_PER_TASK", 4))
+
+
+class ExtractionError(Exception):
+    """
+    The document can't be extracted: too large, too many pages, timed out or unreadable
+    """
+
+
+class _PoolReset(ExtractionError):
+    """
+    The pool was torn down under this extraction because of another document
+    """
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_reset_pools: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the API process has threads and open connections a fork would copy
+            _pool = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+        _reset_pools.add(pool)
+    # shutdown() alone waits for running tasks, a hung parser has to be killed
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_extraction_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(pool: ProcessPoolExecutor, filename: str, function, *args) -> Future:
+    try:
+        return pool.submit(function, *args)
+    except (BrokenProcessPool, RuntimeError):
+        # Shut down between get_extraction_pool() and here
+        if pool in _reset_pools:
+            raise _PoolReset(f"Extraction of {filename} was interrupted by another document")
+        raise
+
+
+def _result(future: Future, pool: ProcessPoolExecutor, deadline: float, filename: str):
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        _reset_pool(pool)
+        raise ExtractionError(f"Extracting {filename} took longer than {EXTRACTION_TIMEOUT_SECONDS:g} seconds")
+    except (BrokenProcessPool, CancelledError):
+        if pool in _reset_pools:
+            raise _PoolReset(f"Extraction of {filename} was interrupted by another document")
+        _reset_pool(pool)
+        raise ExtractionError(f"Extraction worker stopped while processing {filename}")
+    except ExtractionError:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Could not read {filename}: {e}")
+
+
+def extract_document(file_path: str, filename: str) -> tuple[str, dict]:
+    """
+    Return (text, document structure) for an uploaded resume, enforcing the
+    size, page and time limits. Blocks the calling thread, not the process.
+    """
+    start = time.perf_counter()
+    file_type = os.path.splitext(filename)[1].lstrip(".").lower() or "none"
+    structure = None
+    try:
+        text, structure = _extract_document(file_path, filename)
+        return text, structure
+    finally:
+        extraction_duration.labels(
+            file_type=file_type if file_type in ("pdf", "docx", "doc", "txt") else "other",
+            pages=page_bucket((structure or {}).get("page_count")),
+            outcome="ok" if structure is not None else "error"
+        ).observe(time.perf_counter() - start)
+
+
+def _extract_document(file_path: str, filename: str) -> tuple[str, dict]:
+    if os.path.getsize(file_path) > EXTRACTION_MAX_BYTES:
+        raise ExtractionError(f"{filename} is larger than {EXTRACTION_MAX_BYTES // (1024 * 1024)} MB")
+    try:
+        return _extract_in_pool(file_path, filename)
+    except _PoolReset:
+        # Once only: a second reset fails the extraction like any other error
+        return _extract_in_pool(file_path, filename)
+
+
+def _extract_in_pool(file_path: str, filename: str) -> tuple[str, dict]:
+    deadline = time.monotonic() + EXTRACTION_TIMEOUT_SECONDS
+    pool = get_extraction_pool()
+    structure_future = _submit(pool, filename, inspect_document_structure, file_path, filename)
+
+    if not filename.endswith(".pdf"):
+        text_future = _submit(pool, filename, extract_text, file_path, filename)
+        return _result(text_future, pool, deadline, filename), _result(structure_future, pool, deadline, filename)
+
+    # The page count comes with the structure, check it before extracting any text
+    structure = _result(structure_future, pool, deadline, filename)
+    page_count = structure["page_count"]
+    if page_count > EXTRACTION_MAX_PAGES:
+        raise ExtractionError(f"{filename} has {page_count} pages, the limit is {EXTRACTION_MAX_PAGES}")
+
+    if page_count < EXTRACTION_PARALLEL_MIN_PAGES or not has_cheap_page_ranges():
+        text_future = _submit(pool, filename, extract_text_from_pdf, file_path)
+        return _result(text_future, pool, deadline, filename), structure
+
+    futures = [
+        _submit(pool, filename, extract_text_from_pdf, file_path, start, start + EXTRACTION_PAGES_PER_TASK)
+        for start in range(0, page_count, EXTRACTION_PAGES_PER_TASK)
+    ]
+    try:
+        return "".join(_result(future, pool, deadline, filename) for future in futures), structure
+    finally:
+        for future in futures:
+            future.cancel()
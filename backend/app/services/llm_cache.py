@@ -0,0 +1,202 @@
+"""
+Content-addressed cache for LLM responses.
+
+Entries are keyed on a SHA-256 of (function, model, normalized inputs, prompt
+version), so bumping a function's prompt version invalidates its old entries.
+Lookups go through an in-process LRU/TTL tier first and then, when
+LLM_CACHE_URL is set (e.g. sqlite:///llm_cache.db or the Postgres URL), a
+shared tier that every worker process can read. The shared tier's table is
+created by the Alembic migrations, so LLM_CACHE_URL has to point at a migrated
+database.
+"""
+from datetime import datetime, timedelta
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+from typing import Any, Optional
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, delete, insert, select
+from app.core.metrics import register_cache
+from app.models.llm_cache_entry import llm_cache_entries
+from app.utils.ttl_cache import TTLCache
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 1024))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", 60 * 60 * 24))
+LLM_CACHE_URL = os.getenv("LLM_CACHE_URL")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_cache_key(function: str, model: str, inputs: dict, prompt_version: int) -> str:
+    payload = json.dumps({
+        "function": function,
+        "model": model,
+        "inputs": _normalize(inputs),
+        "prompt_version": prompt_version,
+    }, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, max_entries: int, ttl_seconds: int, shared_url: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.shared_engine = None
+        if shared_url:
+            self.shared_engine = create_engine(shared_url, pool_pre_ping=True)
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "shared_errors": 0,
+        }
+
+    def _incr(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def get(self, key: str) -> Any:
+        value = self.memory.get(key)
+        if value is not None:
+            self._incr("memory_hits")
+            return json.loads(value)
+
+        if self.shared_engine is not None:
+            try:
+                with self.shared_engine.connect() as connection:
+                    row = connection.execute(
+                        select(llm_cache_entries.c.value).where(
+                            llm_cache_entries.c.key == key,
+                            llm_cache_entries.c.expires_at > datetime.utcnow()
+                        )
+                    ).first()
+            except Exception:
+                logger.warning("LLM cache shared tier read failed", exc_info=True)
+                self._incr("shared_errors")
+                row = None
+            if row is not None:
+                self._incr("shared_hits")
+                self.memory.set(key, row.value)
+                return json.loads(row.value)
+
+        self._incr("misses")
+        return None
+
+    def set(self, key: str, function: str, value: Any) -> None:
+        serialized = json.dumps(value)
+        self.memory.set(key, serialized)
+        self._incr("stores")
+
+        if self.shared_engine is not None:
+            now = datetime.utcnow()
+            try:
+                with self.shared_engine.begin() as connection:
+                    connection.execute(delete(llm_cache_entries).where(llm_cache_entries.c.key == key))
+                    connection.execute(insert(llm_cache_entries).values(
+                        key=key,
+                        function=function,
+                        value=serialized,
+                        created_at=now,
+                        expires_at=now + timedelta(seconds=self.ttl_seconds)
+                    ))
+            except Exception:
+                logger.warning("LLM cache shared tier write failed", exc_info=True)
+                self._incr("shared_errors")
+
+    async def aget(self, key: str) -> Any:
+        # Keep shared-tier round trips off the event loop
+        if self.shared_engine is not None:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, function: str, value: Any) -> None:
+        if self.shared_engine is not None:
+            await asyncio.to_thread(self.set, key, function, value)
+        else:
+            self.set(key, function, value)
+
+    def record_bypass(self) -> None:
+        self._incr("bypassed")
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.shared_engine is not None:
+            with self.shared_engine.begin() as connection:
+                connection.execute(delete(llm_cache_entries))
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        hits = counters["memory_hits"] + counters["shared_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": hits / lookups if lookups else 0,
+            "memory_entries": len(self.memory),
+            "shared_tier_enabled": self.shared_engine is not None,
+        }
+
+
+llm_cache = LLMCache(
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+    shared_url=LLM_CACHE_URL
+)
+
+
+def _cache_counts() -> tuple[int, int]:
+    stats = llm_cache.stats()
+    return stats["memory_hits"] + stats["shared_hits"], stats["misses"]
+
+
+register_cache("llm", _cache_counts)
+
+
+def cached_llm_call(function: str, model: str, prompt_version: int):
+    """
+    Cache the decorated async service function's result. Callers can pass
+    ``force_refresh=True`` to skip the lookup and overwrite the stored entry.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def make_key(args, kwargs):
+            return make_cache_key(function, model, dict(signature.bind(*args, **kwargs).arguments), prompt_version)
+
+        @functools.wraps(func)
+        async def wrapper(*args, force_refresh: bool = False, **kwargs):
+            if not LLM_CACHE_ENABLED:
+                return await func(*args, **kwargs)
+            key = make_key(args, kwargs)
+            if force_refresh:
+                llm_cache.record_bypass()
+            else:
+                cached = await llm_cache.aget(key)
+                if cached is not None:
+                    return cached
+            result = await func(*args, **kwargs)
+            await llm_cache.aset(key, function, result)
+            return result
+
+        return wrapper
+    return decorator
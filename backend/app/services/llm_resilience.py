@@ -0,0 +1,326 @@
+"""
+Resilient LLM calls: deadlines, retries, hedging and a circuit breaker.
+
+Every completion in openai_service goes through ``resilient_call_async``,
+which wraps a single attempt with:
+- a per-task deadline covering all attempts, each attempt's HTTP timeout
+  is whatever is left of it
+- bounded retries with full-jitter exponential backoff on transient
+  provider errors (timeouts, connection errors, 429, 5xx) and on responses
+  that fail to parse
+- optionally a hedged duplicate request once an attempt has
+  been running longer than the task's recent LLM_HEDGE_PERCENTILE latency
+- a circuit breaker shared by all tasks that fails fast while the provider
+  keeps erroring, then lets a single probe through after a cool-down
+
+Exhausted calls raise an ``LLMError`` subclass, which main turns into a
+502/503/504 response. Run ``python -m benchmarks.fake_openai_server`` to
+try slow, erroring and malformed responses locally.
+"""
+from collections import defaultdict, deque
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+from dotenv import load_dotenv
+import openai
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", 3))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", 0.5))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", 8))
+LLM_DEFAULT_DEADLINE_SECONDS = float(os.getenv("LLM_DEFAULT_DEADLINE_SECONDS", 60))
+# 0 disables hedging
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", 0))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20))
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", 5))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", 30))
+
+# Seconds each task may take in total, retries included
+LLM_DEADLINES = {
+    "analyze_resume": 45,
+    "check_ats_compatibility": 45,
+    "analyze_job_match": 30,
+    "generate_cover_letter": 60,
+}
+
+TRANSIENT_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    asyncio.TimeoutError,
+)
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMUnavailableError(LLMError):
+    """
+    The circuit breaker is open, the provider isn't being called
+    """
+    def __init__(self, retry_after: float):
+        super().__init__("The AI provider is unavailable, try again shortly")
+        self.retry_after = retry_after
+
+
+class LLMDeadlineExceeded(LLMError):
+    pass
+
+
+class LLMResponseError(LLMError):
+    """
+    The provider kept failing or its output couldn't be parsed
+    """
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse the first JSON object or array in a model response, tolerating
+    code fences and prose around it
+    """
+    text = (text or "").strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    decoder = json.JSONDecoder()
+    for index, char in enumerate(text):
+        if char in "{[":
+            try:
+                value, _ = decoder.raw_decode(text, index)
+                return value
+            except json.JSONDecodeError:
+                continue
+    raise LLMResponseError(f"No JSON found in model response: {text[:200]!r}")
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive provider failures. While
+    open, calls fail fast; after ``reset_seconds`` one probe call is let
+    through, its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def before_call(self) -> bool:
+        """
+        Raises while open, returns True when this call is the half-open probe
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed >= self.reset_seconds and not self._probing:
+                self._probing = True
+                return True
+            raise LLMUnavailableError(retry_after=max(1.0, self.reset_seconds - elapsed))
+
+    def release_probe(self) -> None:
+        """
+        The probe ended without an outcome (cancelled), let the next call probe
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("LLM circuit breaker closed")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.failure_threshold):
+                logger.warning("LLM circuit breaker opened after %d consecutive failures", self._failures)
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+class LatencyTracker:
+    """
+    Recent successful attempt latencies per task, for the hedging threshold
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, function: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[function].append(seconds)
+
+    def percentile(self, function: str, pct: float, min_samples: int) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples[function])
+        if len(samples) < max(1, min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))]
+
+
+breaker = CircuitBreaker(LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RESET_SECONDS)
+latencies = LatencyTracker()
+_counters = defaultdict(int)
+_counters_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def resilience_stats() -> dict:
+    with _counters_lock:
+        counters = dict(_counters)
+    return {**counters, "breaker_state": breaker.state}
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def _deadline_for(function: str) -> float:
+    return float(LLM_DEADLINES.get(function, LLM_DEFAULT_DEADLINE_SECONDS))
+
+
+def _classify(function: str, error: Exception) -> Exception:
+    """
+    Record a failed attempt, returns the error to retry on or re-raises
+    errors retrying can't fix (bad request, auth, ...)
+    """
+    if isinstance(error, LLMResponseError):
+        # The provider answered, only the content was bad
+        breaker.record_success()
+        _count("parse_failures")
+        logger.warning("LLM call %s returned an unusable response: %s", function, error)
+        return error
+    if isinstance(error, TRANSIENT_ERRORS):
+        breaker.record_failure()
+        _count("transient_failures")
+        logger.warning("LLM call %s failed: %r", function, error)
+        return error
+    # Bad request, auth and the like: the provider is up but retrying won't help
+    breaker.record_success()
+    if isinstance(error, openai.APIError):
+        # Surfaces as a 502 like any other LLM failure, not a bare 500. The
+        # provider's message stays in the log, it can name the API key.
+        logger.error("LLM call %s was rejected: %r", function, error)
+        raise LLMResponseError(f"{function} was rejected by the AI provider ({type(error).__name__})") from error
+    raise error
+
+
+def _parse_or_raise(parse: Optional[Callable[[str], Any]], content: str) -> Any:
+    if parse is None:
+        return content
+    try:
+        return parse(content)
+    except LLMResponseError:
+        raise
+    except Exception as e:
+        raise LLMResponseError(f"Could not parse model response: {e}")
+
+
+def _give_up(function: str, last_error: Optional[Exception], deadline_hit: bool) -> LLMError:
+    _count("exhausted")
+    if deadline_hit:
+        return LLMDeadlineExceeded(f"{function} did not finish within {_deadline_for(function):g}s")
+    return LLMResponseError(f"{function} failed after {LLM_MAX_ATTEMPTS} attempt(s): {last_error}")
+
+
+async def _hedged(function: str, attempt: Callable[[float], Awaitable[Any]], timeout: float, hedge: bool) -> Any:
+    """
+    One attempt, plus a duplicate if the first is slower than the task's
+    hedging threshold. The first to succeed wins, the other is cancelled.
+    """
+    hedge_after = latencies.percentile(function, LLM_HEDGE_PERCENTILE, LLM_HEDGE_MIN_SAMPLES) if hedge and LLM_HEDGE_PERCENTILE else None
+    first = asyncio.ensure_future(asyncio.wait_for(attempt(timeout), timeout))
+    tasks = [first]
+    try:
+        if hedge_after is None or hedge_after >= timeout:
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=hedge_after)
+        if done:
+            return first.result()
+        _count("hedged_requests")
+        second = asyncio.ensure_future(asyncio.wait_for(attempt(timeout - hedge_after), timeout - hedge_after))
+        tasks.append(second)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        _count("hedge_wins")
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        # The loser, or every request when the caller was cancelled
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def resilient_call_async(function: str, attempt: Callable[[float], Awaitable[Any]], parse: Optional[Callable[[str], Any]] = None, hedge: bool = True) -> Any:
+    """
+    Run ``attempt(timeout_seconds)`` with retries under the task's deadline
+    and return ``parse(content)``. Hedged when LLM_HEDGE_PERCENTILE is set
+    and ``hedge`` isn't turned off (e.g. for opening a stream).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _deadline_for(function)
+    last_error = None
+    for attempt_number in range(LLM_MAX_ATTEMPTS):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        probe = breaker.before_call()
+        _count("attempts")
+        start = loop.time()
+        try:
+            content = await _hedged(function, attempt, remaining, hedge)
+            breaker.record_success()
+            latencies.record(function, loop.time() - start)
+            return _parse_or_raise(parse, content)
+        except Exception as e:
+            last_error = _classify(function, e)
+        except BaseException:
+            # Cancelled mid-attempt: without this the breaker would wait
+            # forever for the probe's outcome and stay half-open
+            if probe:
+                breaker.release_probe()
+            raise
+        delay = min(_backoff(attempt_number), deadline - loop.time())
+        if attempt_number + 1 < LLM_MAX_ATTEMPTS and delay > 0:
+            await asyncio.sleep(delay)
+    raise _give_up(function, last_error, loop.time() >= deadline)
@@ -0,0 +1,270 @@
+"""
+Admission control for LLM calls: token buckets and priority queueing.
+
+Every completion in openai_service first acquires capacity from:
+- global requests/min and tokens/min buckets, sized to the provider's limits
+- per-user requests/min and tokens/min buckets, so one user scripting an
+  endpoint can't take everyone else's share
+
+Token cost is estimated up front (prompt estimate plus the task's expected
+output) and settled against the actual usage once the call returns.
+
+Callers that can't be admitted right away wait in a priority queue:
+interactive requests go before batch work, which goes before background
+jobs. Each priority has a bounded wait for global capacity; past it, or
+when the queue is full, the call fails with ``LLMRateLimited``, which main
+turns into a 429 with Retry-After. An interactive call over its user's
+quota is turned away the same way, batch and background calls wait for
+the quota instead, so a long batch is paced rather than cut short. The caller's user and priority come from a context variable
+set per request (``set_llm_caller`` via the ``get_llm_caller`` dependency)
+or by the job worker.
+
+Only calls that reach the provider are charged. Cache hits are free, and
+so are callers coalesced onto an identical call already in flight
+(single_flight): the shared call runs in the first caller's context and is
+charged to that caller's user and priority alone.
+"""
+from contextvars import ContextVar
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from typing import Optional
+from dotenv import load_dotenv
+from app.core.metrics import llm_queue_wait
+from app.services.llm_resilience import LLMError
+from app.utils.ttl_cache import TTLCache
+
+load_dotenv()
+
+LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() == "true"
+LLM_GLOBAL_REQUESTS_PER_MINUTE = float(os.getenv("LLM_GLOBAL_REQUESTS_PER_MINUTE", 500))
+LLM_GLOBAL_TOKENS_PER_MINUTE = float(os.getenv("LLM_GLOBAL_TOKENS_PER_MINUTE", 200000))
+LLM_USER_REQUESTS_PER_MINUTE = float(os.getenv("LLM_USER_REQUESTS_PER_MINUTE", 20))
+LLM_USER_TOKENS_PER_MINUTE = float(os.getenv("LLM_USER_TOKENS_PER_MINUTE", 40000))
+LLM_QUEUE_MAX_LENGTH = int(os.getenv("LLM_QUEUE_MAX_LENGTH", 200))
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch", PRIORITY_BACKGROUND: "background"}
+
+# How long a call may wait for capacity before it is turned away
+LLM_MAX_WAIT_SECONDS = {
+    PRIORITY_INTERACTIVE: float(os.getenv("LLM_INTERACTIVE_MAX_WAIT_SECONDS", 10)),
+    PRIORITY_BATCH: float(os.getenv("LLM_BATCH_MAX_WAIT_SECONDS", 60)),
+    PRIORITY_BACKGROUND: float(os.getenv("LLM_BACKGROUND_MAX_WAIT_SECONDS", 300)),
+}
+
+# Typical completion size per task, added to the prompt estimate before the call
+LLM_EXPECTED_OUTPUT_TOKENS = {
+    "analyze_resume": 700,
+    "check_ats_compatibility": 500,
+    "analyze_job_match": 400,
+    "generate_cover_letter": 600,
+}
+DEFAULT_EXPECTED_OUTPUT_TOKENS = 500
+
+_caller: ContextVar[tuple[Optional[int], int]] = ContextVar("llm_caller", default=(None, PRIORITY_INTERACTIVE))
+
+
+def set_llm_caller(user_id: Optional[int], priority: int = PRIORITY_INTERACTIVE) -> None:
+    _caller.set((user_id, priority))
+
+
+def set_llm_priority(priority: int) -> None:
+    _caller.set((_caller.get()[0], priority))
+
+
+class LLMRateLimited(LLMError):
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(f"Too many AI requests ({reason}), try again in {math.ceil(retry_after)}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Refills continuously to ``per_minute`` capacity. The level may go
+    negative when actual usage turns out higher than reserved.
+    Not thread-safe on its own, the scheduler holds a lock around it.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level - delta)
+
+
+class Reservation:
+    def __init__(self, user_id: Optional[int], tokens: int):
+        self.user_id = user_id
+        self.tokens = tokens
+
+
+class LLMScheduler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = TokenBucket(LLM_GLOBAL_REQUESTS_PER_MINUTE)
+        self.tokens = TokenBucket(LLM_GLOBAL_TOKENS_PER_MINUTE)
+        # A bucket idle for two minutes is full again, dropping it loses nothing
+        self._user_buckets = TTLCache(max_entries=100000, ttl_seconds=120)
+        self._queue: list = []
+        self._sequence = itertools.count()
+        self._pump_handle: Optional[asyncio.TimerHandle] = None
+        self._counters = {"admitted": 0, "queued": 0, "rejected_user": 0, "rejected_global": 0, "queue_full": 0}
+
+    def _user(self, user_id: int) -> tuple[TokenBucket, TokenBucket]:
+        buckets = self._user_buckets.get(user_id)
+        if buckets is None:
+            buckets = (TokenBucket(LLM_USER_REQUESTS_PER_MINUTE), TokenBucket(LLM_USER_TOKENS_PER_MINUTE))
+        self._user_buckets.set(user_id, buckets)
+        return buckets
+
+    def _global_wait(self, tokens: int) -> float:
+        return max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+
+    def _take_global(self, tokens: int) -> None:
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self._counters["admitted"] += 1
+
+    def _reserve_user(self, user_id: Optional[int], tokens: int, max_wait: float) -> float:
+        """
+        Reserve the user's share now, returns how long the user has to wait
+        for it. Over-quota users are turned away without touching the queue.
+        """
+        if user_id is None:
+            return 0.0
+        user_requests, user_tokens = self._user(user_id)
+        wait = max(user_requests.wait_time(1), user_tokens.wait_time(tokens))
+        if wait > max_wait:
+            self._counters["rejected_user"] += 1
+            raise LLMRateLimited(wait, "per-user limit")
+        user_requests.take(1)
+        user_tokens.take(tokens)
+        return wait
+
+    def _release_user(self, user_id: Optional[int], tokens: int) -> None:
+        if user_id is not None:
+            user_requests, user_tokens = self._user(user_id)
+            user_requests.adjust(-1)
+            user_tokens.adjust(-tokens)
+
+    def _pump(self) -> None:
+        """
+        Admit queued callers in priority order while global capacity lasts,
+        then sleep until the head of the queue can be admitted
+        """
+        with self._lock:
+            if self._pump_handle is not None:
+                self._pump_handle.cancel()
+                self._pump_handle = None
+            while self._queue:
+                _, _, tokens, future = self._queue[0]
+                if future.done():
+                    heapq.heappop(self._queue)
+                    continue
+                wait = self._global_wait(tokens)
+                if wait > 0:
+                    self._pump_handle = asyncio.get_running_loop().call_later(wait, self._pump)
+                    return
+                heapq.heappop(self._queue)
+                self._take_global(tokens)
+                future.set_result(None)
+
+    async def acquire(self, function: str, estimated_prompt_tokens: int) -> Optional[Reservation]:
+        if not LLM_RATE_LIMIT_ENABLED:
+            return None
+        user_id, priority = _caller.get()
+        tokens = estimated_prompt_tokens + LLM_EXPECTED_OUTPUT_TOKENS.get(function, DEFAULT_EXPECTED_OUTPUT_TOKENS)
+        max_wait = LLM_MAX_WAIT_SECONDS.get(priority, LLM_MAX_WAIT_SECONDS[PRIORITY_INTERACTIVE])
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        interactive = priority == PRIORITY_INTERACTIVE
+        future = None
+
+        with self._lock:
+            user_wait = self._reserve_user(user_id, tokens, max_wait if interactive else math.inf)
+            if user_wait == 0 and not self._queue and self._global_wait(tokens) == 0:
+                self._take_global(tokens)
+                llm_queue_wait.labels(PRIORITY_NAMES.get(priority, priority)).observe(0)
+                return Reservation(user_id, tokens)
+        try:
+            if user_wait:
+                await asyncio.sleep(user_wait)
+            # Queued work's bounded wait is for global capacity, after its user's quota
+            queued_at = start if interactive else loop.time()
+            with self._lock:
+                if len(self._queue) >= LLM_QUEUE_MAX_LENGTH:
+                    self._counters["queue_full"] += 1
+                    raise LLMRateLimited(len(self._queue) / self.requests.rate, "queue full")
+                future = loop.create_future()
+                heapq.heappush(self._queue, (priority, next(self._sequence), tokens, future))
+                self._counters["queued"] += 1
+                loop.call_soon(self._pump)
+            try:
+                await asyncio.wait_for(future, max(0.0, max_wait - (loop.time() - queued_at)))
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self._counters["rejected_global"] += 1
+                    retry_after = self._global_wait(tokens) + len(self._queue) / self.requests.rate
+                raise LLMRateLimited(max(1.0, retry_after), "global limit")
+        except BaseException:
+            with self._lock:
+                self._release_user(user_id, tokens)
+                if future is not None and future.done() and not future.cancelled():
+                    # Admitted by _pump, then cancelled before it could use the capacity
+                    self.requests.adjust(-1)
+                    self.tokens.adjust(-tokens)
+            raise
+        llm_queue_wait.labels(PRIORITY_NAMES.get(priority, priority)).observe(loop.time() - start)
+        return Reservation(user_id, tokens)
+
+    def settle(self, reservation: Optional[Reservation], used_tokens: list[Optional[int]]) -> None:
+        """
+        Charge the difference between the reserved tokens and what the
+        call's attempts actually used. An attempt without reported usage
+        keeps the estimate, a call that never got a response is refunded.
+        """
+        if reservation is None or None in used_tokens:
+            return
+        delta = sum(used_tokens) - reservation.tokens
+        with self._lock:
+            self.tokens.adjust(delta)
+            if reservation.user_id is not None:
+                self._user(reservation.user_id)[1].adjust(delta)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._counters,
+                "queue_length": len(self._queue),
+                "global_requests_available": round(self.requests.level, 1),
+                "global_tokens_available": round(self.tokens.level),
+            }
+
+
+llm_scheduler = LLMScheduler()
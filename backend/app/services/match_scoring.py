@@ -0,0 +1,116 @@
+"""
+Local job-match pre-scoring without an LLM call.
+
+Postings are tokenized into flat (posting, term, weight) arrays and scored
+against the resume in a handful of vectorized NumPy operations, so ranking a
+resume against thousands of postings takes milliseconds. Term weights are
+sublinear TF-IDF computed over the postings being scored.
+"""
+from collections import Counter
+import re
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-/][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each etc few for from further had has
+have having he her here hers him his how i if in into is it its itself just like may me more most must
+my no nor not of off on once only or other our ours out over own per same she should so some such than
+that the their theirs them then there these they this those through to too under until up upon us very
+via was we were what when where which while who whom why will with within without would you your yours
+ability able applicant applicants apply candidate candidates company description duties experience
+ideal including job looking need needs new opportunity plus position preferred required requirements
+responsibilities role seeking strong team understanding work working year years
+""".split())
+
+
+def _is_term(token: str) -> bool:
+    return token not in STOPWORDS and len(token) > 1 and not token.isdigit()
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if _is_term(token)]
+
+
+def term_counts(text: str) -> Counter:
+    # Count first so the stopword filter runs once per distinct token
+    counts = Counter(TOKEN_PATTERN.findall(text.lower()))
+    return Counter({token: count for token, count in counts.items() if _is_term(token)})
+
+
+def score_postings(resume_text: str, job_descriptions: list[str], top_terms: int = 8) -> list[dict]:
+    """
+    Score one resume against every job description.
+
+    Returns one dict per job description, in input order, with:
+    - match_percentage: share (0-100) of the posting's TF-IDF weight covered by resume terms
+    - similarity: cosine similarity between the resume and posting vectors
+    - matching_terms / missing_terms: highest-weighted posting terms present in / absent from the resume
+    """
+    if not job_descriptions:
+        return []
+
+    vocabulary: dict[str, int] = {}
+    docs_list: list[int] = []
+    terms_list: list[int] = []
+    counts_list: list[int] = []
+    for doc_id, job_description in enumerate(job_descriptions):
+        counts = term_counts(job_description)
+        docs_list.extend([doc_id] * len(counts))
+        for token, count in counts.items():
+            terms_list.append(vocabulary.setdefault(token, len(vocabulary)))
+            counts_list.append(count)
+
+    n_docs = len(job_descriptions)
+    results = [{"match_percentage": 0, "similarity": 0.0, "matching_terms": [], "missing_terms": []}
+               for _ in range(n_docs)]
+    if not vocabulary:
+        return results
+    n_terms = len(vocabulary)
+
+    # One entry per distinct (posting, term) pair, already grouped by posting
+    docs = np.asarray(docs_list, dtype=np.int64)
+    terms = np.asarray(terms_list, dtype=np.int64)
+    counts = np.asarray(counts_list, dtype=np.float64)
+
+    document_frequency = np.bincount(terms, minlength=n_terms)
+    idf = np.log((1 + n_docs) / (1 + document_frequency)) + 1.0
+    weights = (1.0 + np.log(counts)) * idf[terms]
+
+    resume_counts = np.zeros(n_terms, dtype=np.float64)
+    for token, count in term_counts(resume_text).items():
+        term_id = vocabulary.get(token)
+        if term_id is not None:
+            resume_counts[term_id] = count
+    present = resume_counts > 0
+    resume_weights = np.where(present, 1.0 + np.log(np.maximum(resume_counts, 1)), 0.0) * idf
+    resume_norm = np.linalg.norm(resume_weights)
+
+    pair_present = present[terms]
+    doc_total = np.bincount(docs, weights=weights, minlength=n_docs)
+    doc_covered = np.bincount(docs, weights=weights * pair_present, minlength=n_docs)
+    doc_norm = np.sqrt(np.bincount(docs, weights=weights ** 2, minlength=n_docs))
+    dot = np.bincount(docs, weights=weights * resume_weights[terms], minlength=n_docs)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coverage = np.where(doc_total > 0, doc_covered / doc_total, 0.0)
+        similarity = np.where(doc_norm * resume_norm > 0, dot / (doc_norm * resume_norm), 0.0)
+
+    # Sort pairs by posting, then by descending weight, to read off top terms per posting
+    order = np.lexsort((-weights, docs))
+    boundaries = np.searchsorted(docs[order], np.arange(n_docs + 1))
+    index_to_term = np.empty(n_terms, dtype=object)
+    for term, term_id in vocabulary.items():
+        index_to_term[term_id] = term
+
+    for doc_id in range(n_docs):
+        doc_order = order[boundaries[doc_id]:boundaries[doc_id + 1]]
+        doc_present = pair_present[doc_order]
+        results[doc_id] = {
+            "match_percentage": int(round(coverage[doc_id] * 100)),
+            "similarity": round(float(similarity[doc_id]), 4),
+            "matching_terms": index_to_term[terms[doc_order[doc_present][:top_terms]]].tolist(),
+            "missing_terms": index_to_term[terms[doc_order[~doc_present][:top_terms]]].tolist(),
+        }
+    return results
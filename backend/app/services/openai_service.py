@@ -1,12 +1,70 @@
-from openai import OpenAI
 import os
-import json
-
-def generate_cover_letter_with_ai(resume_text: str, job_title: str, company_name: str, job_description: str) -> str:
-    key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=key)
-
-    prompt = f"""
+import time
+from typing import Any, AsyncIterator, Callable, Optional
+from app.core.metrics import llm_request_duration, llm_tokens
+from app.services.llm_cache import cached_llm_call, llm_cache, make_cache_key, LLM_CACHE_ENABLED
+from app.services.openai_client import get_async_openai_client
+from app.services.prompt_budget import estimate_tokens, fit_prompt_inputs, token_usage
+from app.services.single_flight import coalesce_llm_call
+from app.services.llm_resilience import LLMResponseError, extract_json, resilient_call_async
+from app.services.llm_scheduler import llm_scheduler
+from app.schemas.ats_check import ATSCheckResult
+from app.schemas.job_match import JobMatchResult
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+# Bump when prompt text, input trimming or response parsing changes, so cached responses from the old prompts are not reused
+PROMPT_VERSION = 3
+
+def _record_usage(function: str, prompt: str, usage) -> Optional[int]:
+    """
+    Record one attempt's token usage, returns its total if the provider reported it
+    """
+    if usage is None:
+        token_usage.record_call_without_usage(function)
+        return None
+    token_usage.record_call(function, usage.prompt_tokens, usage.completion_tokens, estimate_tokens(prompt))
+    llm_tokens.labels(function, "prompt").inc(usage.prompt_tokens)
+    llm_tokens.labels(function, "completion").inc(usage.completion_tokens)
+    return usage.prompt_tokens + usage.completion_tokens
+
+async def _complete_async(prompt: str, function: str, parse: Optional[Callable[[str], Any]] = None) -> Any:
+    client = get_async_openai_client()
+    used = []
+
+    async def attempt(timeout: float) -> str:
+        response = await client.chat.completions.create(model=OPENAI_MODEL, messages=[{"role": "user", "content": prompt}], timeout=timeout)
+        used.append(_record_usage(function, prompt, response.usage))
+        return response.choices[0].message.content
+
+    # Retries and hedges are charged when settling, not admitted separately
+    reservation = await llm_scheduler.acquire(function, estimate_tokens(prompt))
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        result = await resilient_call_async(function, attempt, parse)
+        outcome = "ok"
+        return result
+    finally:
+        llm_request_duration.labels(function, outcome).observe(time.perf_counter() - start)
+        llm_scheduler.settle(reservation, used)
+
+def parse_json_object(response_text: str) -> dict:
+    data = extract_json(response_text)
+    if not isinstance(data, dict):
+        raise LLMResponseError(f"Expected a JSON object, got {type(data).__name__}")
+    return data
+
+def parse_job_match(response_text: str) -> dict:
+    # Validated while parsing, so output missing a field is retried and never cached
+    return JobMatchResult.model_validate(parse_json_object(response_text)).model_dump()
+
+def parse_ats_check(response_text: str) -> dict:
+    return ATSCheckResult.model_validate(parse_json_object(response_text)).model_dump()
+
+def build_cover_letter_prompt(resume_text: str, job_title: str, company_name: str, job_description: str) -> str:
+    inputs = fit_prompt_inputs("generate_cover_letter", resume_text=resume_text, job_description=job_description)
+    resume_text, job_description = inputs["resume_text"], inputs["job_description"]
+    return f"""
         You are an expert career coach and professional cover letter writer with years of experience helping candidates land their dream jobs.
 
         Write a compelling, personalized cover letter for the following position:
@@ -42,15 +100,76 @@ def generate_cover_letter_with_ai(resume_text: str, job_title: str, company_name
 
         Return ONLY the cover letter text, ready to use. No additional commentary or explanations.
     """
-    response = client.chat.completions.create(model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}])
-    cover_letter_text = response.choices[0].message.content
-    return cover_letter_text
 
-def analyze_resume_with_ai(resume_text: str) -> dict:
-    key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=key)
+@cached_llm_call("generate_cover_letter", model=OPENAI_MODEL, prompt_version=PROMPT_VERSION)
+@coalesce_llm_call("generate_cover_letter", model=OPENAI_MODEL, prompt_version=PROMPT_VERSION)
+async def generate_cover_letter_with_ai_async(resume_text: str, job_title: str, company_name: str, job_description: str) -> str:
+    prompt = build_cover_letter_prompt(resume_text, job_title, company_name, job_description)
+    cover_letter_text = await _complete_async(prompt, "generate_cover_letter")
+    return cover_letter_text
 
-    prompt = f"""
+async def stream_cover_letter_with_ai(resume_text: str, job_title: str, company_name: str, job_description: str, force_refresh: bool = False) -> AsyncIterator[str]:
+    """
+    Yield the cover letter as the model produces it. Shares cache entries
+    with generate_cover_letter_with_ai_async, a cached letter is yielded in one piece.
+    """
+    inputs = {"resume_text": resume_text, "job_title": job_title, "company_name": company_name, "job_description": job_description}
+    key = make_cache_key("generate_cover_letter", OPENAI_MODEL, inputs, prompt_version=PROMPT_VERSION)
+    if LLM_CACHE_ENABLED and force_refresh:
+        llm_cache.record_bypass()
+    elif LLM_CACHE_ENABLED:
+        cached = await llm_cache.aget(key)
+        if cached is not None:
+            yield cached
+            return
+
+    prompt = build_cover_letter_prompt(resume_text, job_title, company_name, job_description)
+    client = get_async_openai_client()
+
+    async def open_stream(timeout: float):
+        return await client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=timeout
+        )
+
+    reservation = await llm_scheduler.acquire("generate_cover_letter", estimate_tokens(prompt))
+    start = time.perf_counter()
+    # Only opening the stream is retried, once tokens flow a failure ends it
+    try:
+        stream = await resilient_call_async("generate_cover_letter", open_stream, hedge=False)
+    except BaseException:
+        llm_request_duration.labels("generate_cover_letter", "error").observe(time.perf_counter() - start)
+        llm_scheduler.settle(reservation, [])
+        raise
+    parts = []
+    usage = None
+    outcome = "error"
+    try:
+        async for chunk in stream:
+            # The final chunk carries the token usage and no choices
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+        outcome = "ok"
+    finally:
+        await stream.close()
+        llm_request_duration.labels("generate_cover_letter", outcome).observe(time.perf_counter() - start)
+        llm_scheduler.settle(reservation, [usage.prompt_tokens + usage.completion_tokens if usage is not None else None])
+    _record_usage("generate_cover_letter", prompt, usage)
+    if LLM_CACHE_ENABLED:
+        await llm_cache.aset(key, "generate_cover_letter", "".join(parts))
+
+def build_resume_analysis_prompt(resume_text: str) -> str:
+    resume_text = fit_prompt_inputs("analyze_resume", resume_text=resume_text)["resume_text"]
+    return f"""
         You are an expert resume reviewer and career coach. Analyze the following resume and provide:
 
         1. An overall score from 0-100 based on:
@@ -74,9 +193,8 @@ def analyze_resume_with_ai(resume_text: str) -> dict:
         FEEDBACK: [your detailed analysis]
         SUGGESTIONS: [numbered list of improvements]
     """
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}])
-    response_text = response.choices[0].message.content
+
+def parse_resume_analysis(response_text: str) -> dict:
     response_lines = response_text.strip().split("\n")
 
     score = 0
@@ -121,11 +239,21 @@ def analyze_resume_with_ai(resume_text: str) -> dict:
     }
     return result
 
-def analyze_job_match_with_ai(resume_text: str, job_description: str) -> dict:
-    key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=key)
-
-    prompt = f"""
+def parse_scored_resume_analysis(response_text: str) -> dict:
+    # Without a SCORE line the analysis would silently score 0, ask again instead
+    if "SCORE:" not in response_text:
+        raise LLMResponseError("Resume analysis response has no SCORE line")
+    return parse_resume_analysis(response_text)
+
+@cached_llm_call("analyze_resume", model=OPENAI_MODEL, prompt_version=PROMPT_VERSION)
+@coalesce_llm_call("analyze_resume", model=OPENAI_MODEL, prompt_version=PROMPT_VERSION)
+async def analyze_resume_with_ai_async(resume_text: str) -> dict:
+    return await _complete_async(build_resume_analysis_prompt(resume_text), "analyze_resume", parse=parse_scored_resume_analysis)
+
+def build_job_match_prompt(resume_text: str, job_description: str) -> str:
+    inputs = fit_prompt_inputs("analyze_job_match", resume_text=resume_text, job_description=job_description)
+    resume_text, job_description = inputs["resume_text"], inputs["job_description"]
+    return f"""
     You are an expert career advisor and ATS (Applicant Tracking System) specialist.
 
     Analyze how well this candidate's resume matches the job requirements.
@@ -152,16 +280,16 @@ def analyze_job_match_with_ai(resume_text: str, job_description: str) -> dict:
 
     Return ONLY valid JSON. No additional text or explanation.
     """
-    response = client.chat.completions.create(model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}])
-    response_text = response.choices[0].message.content
-    match_data = json.loads(response_text)
-    return match_data
 
-def check_ats_compatibility_with_ai(resume_text: str) -> dict:
-    key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=key)
+@cached_llm_call("analyze_job_match", model=OPENAI_MODEL, prompt_version=PROMPT_VERSION)
+@coalesce_llm_call("analyze_job_match", model=OPENAI_MODEL, prompt_version=PROMPT_VERSION)
+async def analyze_job_match_with_ai_async(resume_text: str, job_description: str) -> dict:
+    match_data = await _complete_async(build_job_match_prompt(resume_text, job_description), "analyze_job_match", parse=parse_job_match)
+    return match_data
 
-    prompt = f"""
+def build_ats_check_prompt(resume_text: str) -> str:
+    resume_text = fit_prompt_inputs("check_ats_compatibility", resume_text=resume_text)["resume_text"]
+    return f"""
     You are an expert ATS (Applicant Tracking System) compatibility analyzer with deep knowledge of how recruiting software parses and scores resumes.
 
     Analyze this resume for ATS compatibility:
@@ -217,8 +345,8 @@ def check_ats_compatibility_with_ai(resume_text: str) -> dict:
     Return ONLY valid JSON. No additional text.
     """
 
-    response = client.chat.completions.create(model="gpt-3.5-turbo", messages=[{"role": "user", "content": prompt}])
-    response_text = response.choices[0].message.content
-    ats_data = json.loads(response_text)
+@cached_llm_call("check_ats_compatibility", model=OPENAI_MODEL, prompt_version=PROMPT_VERSION)
+@coalesce_llm_call("check_ats_compatibility", model=OPENAI_MODEL, prompt_version=PROMPT_VERSION)
+async def check_ats_compatibility_with_ai_async(resume_text: str) -> dict:
+    ats_data = await _complete_async(build_ats_check_prompt(resume_text), "check_ats_compatibility", parse=parse_ats_check)
     return ats_data
-    
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Token budgets for LLM prompt inputs.
+
+Resumes and job descriptions are trimmed before they are interpolated into a
+prompt: whitespace is normalized, repeated lines (page headers/footers, a JD
+pasted twice) and hiring boilerplate (EEO statements and the like) are
+dropped, and whatever is still over the task's budget is excerpted. Resumes
+keep their head, since contact, summary and recent roles come first; job
+descriptions keep the lines that read like requirements.
+
+Token counts are estimated locally, with tiktoken when it is installed and a
+word/punctuation heuristic otherwise. ``token_usage`` tracks estimated and
+actual input/output tokens per function; see /api/llm-usage/stats.
+"""
+from collections import defaultdict
+from functools import lru_cache
+import logging
+import math
+import os
+import re
+import threading
+from typing import Callable, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+PROMPT_BUDGETS_ENABLED = os.getenv("PROMPT_BUDGETS_ENABLED", "true").lower() == "true"
+# Multiplies every budget below, e.g. 0.5 to halve them or 2 for long-context models
+PROMPT_BUDGET_SCALE = float(os.getenv("PROMPT_BUDGET_SCALE", 1.0))
+
+# Max input tokens per prompt field, by task
+PROMPT_BUDGETS = {
+    "analyze_resume": {"resume_text": 2500},
+    "check_ats_compatibility": {"resume_text": 2500},
+    "analyze_job_match": {"resume_text": 1800, "job_description": 1200},
+    "generate_cover_letter": {"resume_text": 1500, "job_description": 1000},
+}
+
+TRUNCATION_MARKER = "[...]"
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_INLINE_SPACE_PATTERN = re.compile(r"[ \t\f\v\u00a0\u200b]+")
+_BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+_BULLET_PATTERN = re.compile(r"^\s*(?:[-*•▪●–]|\d+[.)])\s+")
+
+BOILERPLATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in [
+    r"equal (?:employment )?opportunity",
+    r"without regard to (?:race|age|sex|gender)",
+    r"reasonable accommodation",
+    r"e-verify",
+    r"(?:privacy|applicant) (?:notice|policy)",
+    r"all qualified applicants will receive",
+    r"protected veteran",
+    r"^\s*page \d+(?: of \d+)?\s*$",
+]]
+
+REQUIREMENT_KEYWORDS = re.compile(
+    r"\b(?:require\w*|qualifications?|must|experience|skills?|proficien\w*|knowledge|responsib\w*|"
+    r"degree|years?|familiar\w*|nice to have|preferred|plus|ability|you will|you'll)\b",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1)
+def _tiktoken_encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"))
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _tiktoken_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # BPE vocabularies cover common words in one token and split long or rare
+    # ones roughly every four characters; punctuation is a token of its own
+    return sum(max(1, math.ceil(len(piece) / 4)) if len(piece) > 6 else 1 for piece in _TOKEN_PATTERN.findall(text))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse runs of spaces/tabs, strip every line and squeeze blank lines
+    """
+    lines = (_INLINE_SPACE_PATTERN.sub(" ", line).strip() for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"))
+    return _BLANK_LINES_PATTERN.sub("\n\n", "\n".join(lines)).strip()
+
+
+def remove_boilerplate(text: str) -> str:
+    """
+    Drop hiring boilerplate lines and any line that already appeared earlier.
+    Short lines (bullets like "Python") are only dropped when repeated back to back.
+    """
+    kept = []
+    seen = set()
+    for line in text.split("\n"):
+        key = line.lower()
+        if line and any(pattern.search(line) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        if len(key) >= 25:
+            if key in seen:
+                continue
+            seen.add(key)
+        elif key and kept and kept[-1].lower() == key:
+            continue
+        kept.append(line)
+    return _BLANK_LINES_PATTERN.sub("\n\n", "\n".join(kept)).strip()
+
+
+def truncate_head(text: str, max_tokens: int) -> str:
+    """
+    Keep whole lines from the top until the budget runs out
+    """
+    kept = []
+    used = estimate_tokens(TRUNCATION_MARKER)
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept + [TRUNCATION_MARKER])
+
+
+def _requirement_score(line: str) -> int:
+    return len(REQUIREMENT_KEYWORDS.findall(line)) + (2 if _BULLET_PATTERN.match(line) else 0)
+
+
+def excerpt(text: str, max_tokens: int, score: Callable[[str], int] = _requirement_score) -> str:
+    """
+    Keep the highest scoring lines that fit the budget, in their original
+    order, with a marker wherever lines were left out
+    """
+    lines = text.split("\n")
+    costs = [estimate_tokens(line) + 1 for line in lines]
+    budget = max_tokens - estimate_tokens(TRUNCATION_MARKER) * 4
+    keep = set()
+    used = 0
+    # Ties go to the earlier line
+    for index in sorted(range(len(lines)), key=lambda i: (-score(lines[i]), i)):
+        if lines[index] and used + costs[index] <= budget:
+            keep.add(index)
+            used += costs[index]
+
+    output = []
+    for index, line in enumerate(lines):
+        if index in keep:
+            output.append(line)
+        elif line and (not output or output[-1] != TRUNCATION_MARKER):
+            output.append(TRUNCATION_MARKER)
+    return "\n".join(output)
+
+
+def fit_text(text: str, max_tokens: Optional[int], field: str = "resume_text") -> str:
+    text = remove_boilerplate(normalize_text(text or ""))
+    if max_tokens is None or estimate_tokens(text) <= max_tokens:
+        return text
+    if field == "job_description":
+        return excerpt(text, max_tokens)
+    return truncate_head(text, max_tokens)
+
+
+def fit_prompt_inputs(task: str, **fields: str) -> dict:
+    """
+    Trim each field to the task's budget and record the savings. Fields
+    without a budget are passed through unchanged.
+    """
+    if not PROMPT_BUDGETS_ENABLED:
+        return fields
+    budgets = PROMPT_BUDGETS.get(task, {})
+    fitted = dict(fields)
+    before = after = 0
+    for field, max_tokens in budgets.items():
+        if fields.get(field) is None:
+            continue
+        fitted[field] = fit_text(fields[field], int(max_tokens * PROMPT_BUDGET_SCALE), field)
+        before += estimate_tokens(fields[field])
+        after += estimate_tokens(fitted[field])
+    token_usage.record_trim(task, before, after)
+    return fitted
+
+
+class TokenUsage:
+    """
+    Per-function token counters: what trimming saved (estimated) and what
+    the API actually billed. Calls whose response reported no usage are
+    only counted, so actual and estimated input tokens cover the same calls.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: defaultdict(int))
+
+    def record_trim(self, function: str, before: int, after: int) -> None:
+        with self._lock:
+            counters = self._counters[function]
+            counters["estimated_input_tokens_before_trim"] += before
+            counters["estimated_input_tokens_after_trim"] += after
+
+    def record_call(self, function: str, input_tokens: int, output_tokens: int, estimated_input_tokens: int) -> None:
+        logger.info(
+            "LLM call %s: %d input tokens (estimated %d), %d output tokens",
+            function, input_tokens, estimated_input_tokens, output_tokens
+        )
+        with self._lock:
+            counters = self._counters[function]
+            counters["calls"] += 1
+            counters["input_tokens"] += input_tokens
+            counters["output_tokens"] += output_tokens
+            counters["estimated_prompt_tokens"] += estimated_input_tokens
+
+    def record_call_without_usage(self, function: str) -> None:
+        with self._lock:
+            self._counters[function]["calls_without_usage"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            functions = {function: dict(counters) for function, counters in self._counters.items()}
+        for counters in functions.values():
+            before = counters.get("estimated_input_tokens_before_trim", 0)
+            after = counters.get("estimated_input_tokens_after_trim", 0)
+            counters["trim_savings_ratio"] = round(1 - after / before, 4) if before else 0
+        return functions
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+token_usage = TokenUsage()
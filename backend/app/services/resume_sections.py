@@ -0,0 +1,224 @@
+"""
+Split extracted resume text into structured sections.
+
+Parsed once when the text is extracted and stored on the resume as
+``resume_sections``, so prompts and local scorers can send only the
+sections a task needs instead of the whole extraction:
+
+    {
+        "contact": {"name", "email", "phone", "links"},
+        "summary": "...",
+        "experience": [{"heading": "...", "bullets": ["..."]}],
+        "skills": ["..."],
+        "education": [{"heading": "...", "bullets": [...]}],
+        "projects": [{"heading": "...", "bullets": [...]}],
+        "certifications": ["..."],
+        "other": [{"title": "...", "lines": ["..."]}]
+    }
+"""
+import re
+from typing import Optional
+from app.services.ats_analyzer import BULLET_PATTERN, EMAIL_PATTERN, PHONE_PATTERN, SECTION_PATTERNS
+
+ENTRY_SECTIONS = ("experience", "education", "projects")
+BODY_SECTIONS = ("summary", "experience", "skills", "education", "projects", "certifications")
+
+# Sections each consumer needs. Resume analysis and ATS checks aren't
+# listed: they grade the layout and formatting of the raw extraction, which
+# a rendering of the sections would hide, so they keep resume_text.
+TASK_SECTIONS = {
+    "analyze_job_match": ("summary", "experience", "skills", "education", "projects", "certifications"),
+    "generate_cover_letter": ("summary", "experience", "skills", "projects"),
+    "match_scoring": ("summary", "experience", "skills", "projects", "certifications"),
+}
+
+URL_PATTERN = re.compile(r"(?:https?://|www\.)\S+|\b(?:linkedin\.com|github\.com)/\S+", re.IGNORECASE)
+SKILL_SEPARATOR_PATTERN = re.compile(r"\s*(?:[,;|•▪●·]|\s-\s)\s*")
+HEADING_MAX_WORDS = 5
+# Sections without a field of their own. No employer or skill is called
+# this, so they start a new section even inside a known one.
+OTHER_SECTION_PATTERN = re.compile(
+    r"(honou?rs\s+(and|&)\s+)?awards?|honou?rs|achievements|accomplishments|volunteer(ing|\s+work)?"
+    r"|publications?|patents|presentations|talks|languages|interests|hobbies|activities|extracurricular(\s+activities)?"
+    r"|leadership|affiliations|(professional\s+)?memberships|references|courses|coursework"
+)
+MAX_ENTRY_HEADING_LINES = 2
+
+
+def match_section_heading(line: str) -> Optional[str]:
+    """
+    Section name for a heading line, "other" for an unrecognized heading
+    (a short all-caps or colon-terminated line), None for body text
+    """
+    candidate = line.strip().rstrip(":").strip()
+    if not candidate or len(candidate.split()) > HEADING_MAX_WORDS or BULLET_PATTERN.match(line):
+        return None
+    lowered = candidate.lower()
+    for section, pattern in SECTION_PATTERNS.items():
+        if re.fullmatch(pattern, lowered):
+            return section
+    letters = [c for c in candidate if c.isalpha()]
+    if letters and (candidate.isupper() or line.strip().endswith(":")) and not EMAIL_PATTERN.search(candidate):
+        return "other"
+    return None
+
+
+def _starts_other_section(line: str, after_blank: bool) -> bool:
+    """
+    Whether an unrecognized heading inside a known section starts a new
+    one, rather than being content: employer names ("IBM"), skills ("SQL"),
+    "Languages:" labels. It has to look like a section title, or be a
+    colon-terminated line that follows a blank line.
+    """
+    candidate = line.rstrip(":").strip()
+    if OTHER_SECTION_PATTERN.fullmatch(candidate.lower()):
+        # "LANGUAGES" is a section, a "Languages:" label right under SKILLS isn't
+        return after_blank or candidate.isupper()
+    return after_blank and line.endswith(":")
+
+
+def _parse_contact(lines: list[str]) -> dict:
+    text = "\n".join(lines)
+    email = EMAIL_PATTERN.search(text)
+    phone = PHONE_PATTERN.search(text)
+    name = next((line for line in lines if not EMAIL_PATTERN.search(line) and not PHONE_PATTERN.search(line)
+                 and not URL_PATTERN.search(line)), None)
+    return {
+        "name": name,
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0).strip() if phone else None,
+        "links": URL_PATTERN.findall(text),
+    }
+
+
+def _parse_entries(lines: list[str]) -> list[dict]:
+    """
+    Group lines into entries: heading lines (title, company, dates) followed
+    by bullets. Wrapped bullet text is joined back onto its bullet.
+    """
+    entries = []
+    entry = None
+    for line in lines:
+        if not line:
+            entry = None
+            continue
+        bullet = BULLET_PATTERN.match(line)
+        if bullet:
+            if entry is None:
+                entry = {"heading": "", "bullets": []}
+                entries.append(entry)
+            entry["bullets"].append(line[bullet.end():].strip())
+        elif entry is not None and entry["bullets"] and line[0].islower():
+            entry["bullets"][-1] += " " + line
+        elif entry is None or entry["bullets"]:
+            entry = {"heading": line, "bullets": [], "_heading_lines": 1}
+            entries.append(entry)
+        elif entry.get("_heading_lines", 0) < MAX_ENTRY_HEADING_LINES:
+            entry["heading"] = f"{entry['heading']} | {line}" if entry["heading"] else line
+            entry["_heading_lines"] = entry.get("_heading_lines", 0) + 1
+        else:
+            # Paragraph-style descriptions without bullet markers
+            entry["bullets"].append(line)
+    for entry in entries:
+        entry.pop("_heading_lines", None)
+    return entries
+
+
+def _parse_list(lines: list[str]) -> list[str]:
+    items = []
+    for line in lines:
+        bullet = BULLET_PATTERN.match(line)
+        if bullet:
+            line = line[bullet.end():]
+        # "Languages: Python, Go" lists the items after the label
+        label, colon, rest = line.partition(":")
+        if colon and len(label.split()) <= 3:
+            line = rest
+        items.extend(item.strip() for item in SKILL_SEPARATOR_PATTERN.split(line) if item.strip())
+    return list(dict.fromkeys(items))
+
+
+def parse_resume_sections(resume_text: str) -> dict:
+    header = []
+    grouped: dict[str, list[str]] = {section: [] for section in BODY_SECTIONS}
+    other = []
+    current = None
+    after_blank = True
+    for raw_line in (resume_text or "").splitlines():
+        line = raw_line.strip()
+        heading = match_section_heading(line) if line else None
+        if heading == "other" and current not in (None, "other") and not _starts_other_section(line, after_blank):
+            heading = None
+        after_blank = not line
+        if heading == "other":
+            other.append({"title": line.rstrip(":").strip(), "lines": []})
+            current = "other"
+        elif heading:
+            current = heading
+        elif current is None:
+            if line:
+                header.append(line)
+        elif current == "other":
+            if line:
+                other[-1]["lines"].append(line)
+        else:
+            grouped[current].append(line)
+
+    sections = {
+        "contact": _parse_contact(header),
+        "summary": " ".join(line for line in grouped["summary"] if line) or None,
+        "skills": _parse_list([line for line in grouped["skills"] if line]),
+        "certifications": _parse_list([line for line in grouped["certifications"] if line]),
+        "other": other,
+    }
+    for section in ENTRY_SECTIONS:
+        sections[section] = _parse_entries(grouped[section])
+    return sections
+
+
+def has_body_sections(sections: Optional[dict]) -> bool:
+    return bool(sections) and any(sections.get(section) for section in BODY_SECTIONS)
+
+
+def render_sections(sections: dict, names: tuple[str, ...]) -> str:
+    """
+    Compact plain-text rendering of the chosen sections, for prompts and scorers
+    """
+    blocks = []
+    for name in names:
+        value = sections.get(name)
+        if not value:
+            continue
+        if name == "contact":
+            lines = [value.get("name"), value.get("email"), value.get("phone"), *value.get("links", [])]
+            lines = [line for line in lines if line]
+            if lines:
+                blocks.append("CONTACT\n" + "\n".join(lines))
+        elif name == "summary":
+            blocks.append(f"SUMMARY\n{value}")
+        elif name in ("skills", "certifications"):
+            blocks.append(f"{name.upper()}\n{', '.join(value)}")
+        elif name == "other":
+            blocks.extend(f"{block['title'].upper()}\n" + "\n".join(block["lines"]) for block in value)
+        else:
+            lines = []
+            for entry in value:
+                if entry["heading"]:
+                    lines.append(entry["heading"])
+                lines.extend(f"- {bullet}" for bullet in entry["bullets"])
+            blocks.append(f"{name.upper()}\n" + "\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def resume_text_for(resume, task: str) -> str:
+    """
+    Text of the sections ``task`` needs. Falls back to the raw extraction
+    when no sections could be recognized. Rows stored before sections were
+    parsed are parsed on the fly.
+    """
+    sections = resume.resume_sections
+    if sections is None and resume.resume_text is not None:
+        sections = parse_resume_sections(resume.resume_text)
+    if not has_body_sections(sections):
+        return resume.resume_text
+    return render_sections(sections, TASK_SECTIONS[task])
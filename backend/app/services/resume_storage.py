@@ -0,0 +1,87 @@
+"""
+Content-addressed storage for uploaded resumes.
+
+Uploads are hashed with SHA-256 while they are streamed to disk and stored
+under ``uploads/blobs/<first two hex chars>/<hash><extension>``, so identical
+files share one blob and files with the same name never overwrite each other.
+The hash is kept on ResumeAnalysis so a re-upload of content that has already
+been extracted and analyzed can reuse those results.
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Optional
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+from app.models.resume_analysis import ResumeAnalysis
+
+load_dotenv()
+UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
+BLOB_DIR = UPLOAD_DIR / "blobs"
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+def hash_file(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_path(content_hash: str, extension: str) -> Path:
+    return BLOB_DIR / content_hash[:2] / f"{content_hash}{extension}"
+
+
+def store_upload(source: BinaryIO, extension: str, max_bytes: Optional[int] = None) -> tuple[str, Path]:
+    """
+    Stream ``source`` to a temporary file while hashing it, then move it to
+    its content address. Returns (content_hash, blob path). Raises
+    UploadTooLargeError as soon as more than ``max_bytes`` have been read.
+    """
+    tmp_dir = UPLOAD_DIR / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = tmp_dir / f"{uuid.uuid4().hex}{extension}"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as buffer:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLargeError(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+                digest.update(chunk)
+                buffer.write(chunk)
+
+        content_hash = digest.hexdigest()
+        path = blob_path(content_hash, extension)
+        if path.exists():
+            tmp_path.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic on the same filesystem, a concurrent identical upload just replaces the same bytes
+            os.replace(tmp_path, path)
+        return content_hash, path
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def find_resume_by_content(db: Session, content_hash: str, user_id: int) -> Optional[ResumeAnalysis]:
+    """
+    The best existing row for this content: a completed analysis beats one that
+    only has extracted text, and the user's own rows beat other users'.
+    """
+    candidates = db.query(ResumeAnalysis).filter(
+        ResumeAnalysis.content_hash == content_hash,
+        ResumeAnalysis.resume_text.is_not(None)
+    ).order_by(ResumeAnalysis.id.desc()).limit(50).all()
+    if not candidates:
+        return None
+    return max(candidates, key=lambda resume: (resume.overall_score is not None, resume.user_id == user_id))
@@ -0,0 +1,120 @@
+"""
+Single-flight coalescing of identical in-flight async calls.
+
+Concurrent callers with the same key await one shared execution instead of
+starting their own: double-clicks and frontend retries that arrive while a
+multi-second completion is still running don't pay for it again. The
+shared call runs as its own task, so a caller that disconnects doesn't
+cancel it for the others; once every caller has gone, it is cancelled
+and the last caller returns after it has unwound.
+
+Used at two levels:
+- ``coalesce_llm_call`` in front of the async AI service functions, keyed
+  like the LLM cache, so identical prompts share one upstream call while
+  each request still persists its own record
+- endpoints configured to share records wrap "compute and persist" in
+  ``single_flight.do`` with a per-user key, so duplicates get the same row
+
+Counters per flight name are served at /api/single-flight/stats.
+"""
+import asyncio
+from collections import defaultdict
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from typing import Any, Awaitable, Callable
+from app.services.llm_cache import make_cache_key
+
+
+def make_flight_key(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._in_flight: dict[tuple[str, str], _Flight] = {}
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: {"calls": 0, "executions": 0, "coalesced": 0})
+
+    def _count(self, name: str, shared: bool) -> None:
+        with self._lock:
+            counters = self._counters[name]
+            counters["calls"] += 1
+            counters["coalesced" if shared else "executions"] += 1
+
+    def _forget(self, flight_key: tuple[str, str], flight: _Flight) -> None:
+        if self._in_flight.get(flight_key) is flight:
+            del self._in_flight[flight_key]
+
+    def _done(self, flight_key: tuple[str, str], flight: _Flight, task: asyncio.Task) -> None:
+        self._forget(flight_key, flight)
+        # Mark the outcome as seen even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, name: str, key: str, factory: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Await ``factory()``, or the identical call already in flight.
+        Returns (result, shared) where shared means another caller started it.
+        """
+        flight_key = (name, key)
+        flight = self._in_flight.get(flight_key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._in_flight[flight_key] = flight
+            flight.task.add_done_callback(functools.partial(self._done, flight_key, flight))
+        self._count(name, shared)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller was cancelled or disconnected, nobody needs the result.
+                # Forgotten right away so a new caller starts afresh, and waited
+                # for so its cleanup (e.g. releasing a breaker probe) is done
+                # by the time the caller sees the cancellation.
+                self._forget(flight_key, flight)
+                flight.task.cancel()
+                await asyncio.wait({flight.task})
+
+    def stats(self) -> dict:
+        with self._lock:
+            functions = {name: dict(counters) for name, counters in self._counters.items()}
+        in_flight = defaultdict(int)
+        for name, _ in list(self._in_flight):
+            in_flight[name] += 1
+        for name, counters in functions.items():
+            counters["coalesced_ratio"] = round(counters["coalesced"] / counters["calls"], 4) if counters["calls"] else 0
+            counters["in_flight"] = in_flight[name]
+        return functions
+
+
+single_flight = SingleFlight()
+
+
+def coalesce_llm_call(function: str, model: str, prompt_version: int):
+    """
+    Share one execution of the decorated async service function between
+    concurrent calls with the same inputs. Goes below ``cached_llm_call``.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_cache_key(function, model, dict(signature.bind(*args, **kwargs).arguments), prompt_version)
+            result, _ = await single_flight.do(function, key, lambda: func(*args, **kwargs))
+            return result
+
+        return wrapper
+    return decorator
@@ -0,0 +1,112 @@
+"""
+Deterministic skill extraction backed by an Aho-Corasick automaton.
+
+Every alias in the skill taxonomy is tokenized into words and compiled once
+into a trie with failure links. Text is tokenized with the same rules and
+scanned in a single pass over its words, so extraction cost grows with the
+length of the text, not with the number of skills. Matching whole tokens also
+gives word boundaries for free ("go" never matches inside "google").
+"""
+from collections import deque
+from functools import lru_cache
+import re
+from app.services.skill_taxonomy import SKILL_TAXONOMY
+
+# Keeps symbols that are part of skill names: c++, c#, .net, node.js, ci/cd, pl/sql
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9+#]+(?:[./\-][a-z0-9+#]+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    def __init__(self, taxonomy: dict[str, list[str]]):
+        # Node 0 is the root; each node has word transitions, a failure link
+        # and the (pattern length, canonical skill) pairs that end there
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[tuple[int, str]]] = [[]]
+        self.skills = sorted(taxonomy)
+
+        for skill, aliases in taxonomy.items():
+            for alias in aliases:
+                words = tokenize(alias)
+                if words:
+                    self._add_pattern(words, skill)
+        self._build_failure_links()
+
+    def _add_pattern(self, words: list[str], skill: str) -> None:
+        node = 0
+        for word in words:
+            next_node = self._goto[node].get(word)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][word] = next_node
+            node = next_node
+        self._output[node].append((len(words), skill))
+
+    def _build_failure_links(self) -> None:
+        # Depth-one nodes keep the root as their failure link
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                # Patterns ending at the failure node also end here
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> list[tuple[str, int]]:
+        """
+        Return (skill, token position) for every alias occurrence in ``text``
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        node = 0
+        for position, word in enumerate(tokenize(text)):
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            for length, skill in output[node]:
+                matches.append((skill, position - length + 1))
+        return matches
+
+    def extract(self, text: str) -> list[str]:
+        """
+        Distinct canonical skills in order of first appearance
+        """
+        return list(dict.fromkeys(skill for skill, _ in self.find(text)))
+
+    def count(self, text: str) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for skill, _ in self.find(text):
+            counts[skill] = counts.get(skill, 0) + 1
+        return counts
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    return SkillMatcher(SKILL_TAXONOMY)
+
+
+def extract_skills(text: str) -> list[str]:
+    return get_skill_matcher().extract(text)
+
+
+def compare_skills(resume_text: str, job_description: str) -> dict:
+    """
+    Split the job description's skills into those the resume mentions and those it doesn't
+    """
+    resume_skills = set(extract_skills(resume_text))
+    job_skills = extract_skills(job_description)
+    return {
+        "matching_skills": [skill for skill in job_skills if skill in resume_skills],
+        "missing_skills": [skill for skill in job_skills if skill not in resume_skills],
+    }
@@ -0,0 +1,131 @@
+"""
+Canonical skill names and the aliases they appear under in resumes and job
+postings. Only the aliases are matched (case-insensitive, on whole words),
+so ambiguous short names like "Go" or "R" are listed under safer spellings.
+"""
+
+SKILL_TAXONOMY: dict[str, list[str]] = {
+    # Languages
+    "Python": ["python", "python3", "py3"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js", "ecmascript", "es6"],
+    "TypeScript": ["typescript", "ts"],
+    "C": ["c language", "ansi c"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift"],
+    "Scala": ["scala"],
+    "R": ["r programming", "r language", "rstudio"],
+    "MATLAB": ["matlab"],
+    "SQL": ["sql"],
+    "Bash": ["bash", "shell scripting", "shell script"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+
+    # Frameworks and libraries
+    "React": ["react", "react.js", "reactjs"],
+    "Next.js": ["next.js", "nextjs"],
+    "Angular": ["angular", "angularjs", "angular.js"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "Node.js": ["node", "node.js", "nodejs"],
+    "Express": ["express.js", "expressjs"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring boot", "springboot", "spring framework"],
+    ".NET": [".net", "dotnet", ".net core", "asp.net"],
+    "Ruby on Rails": ["rails", "ruby on rails", "ror"],
+    "Tailwind CSS": ["tailwind", "tailwindcss", "tailwind css"],
+    "Redux": ["redux"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["restful", "rest api", "rest apis", "restful api", "restful apis"],
+    "gRPC": ["grpc"],
+    "pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "TensorFlow": ["tensorflow", "tf2"],
+    "PyTorch": ["pytorch"],
+    "Keras": ["keras"],
+    "Spark": ["spark", "apache spark", "pyspark"],
+    "Hadoop": ["hadoop", "hdfs"],
+    "Airflow": ["airflow", "apache airflow"],
+    "dbt": ["dbt"],
+    "SQLAlchemy": ["sqlalchemy"],
+    "Hibernate": ["hibernate"],
+    "jQuery": ["jquery"],
+
+    # Data stores
+    "PostgreSQL": ["postgresql", "postgres", "psql"],
+    "MySQL": ["mysql"],
+    "SQL Server": ["sql server", "mssql", "ms sql"],
+    "Oracle Database": ["oracle db", "oracle database", "pl/sql", "plsql"],
+    "SQLite": ["sqlite"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic search", "opensearch"],
+    "Cassandra": ["cassandra"],
+    "DynamoDB": ["dynamodb", "dynamo db"],
+    "Snowflake": ["snowflake"],
+    "BigQuery": ["bigquery", "big query"],
+    "Redshift": ["redshift"],
+    "Kafka": ["kafka", "apache kafka"],
+    "RabbitMQ": ["rabbitmq"],
+
+    # Cloud and infrastructure
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker", "containerization"],
+    "Kubernetes": ["kubernetes", "k8s", "eks", "aks", "gke"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "Helm": ["helm"],
+    "Linux": ["linux", "unix", "ubuntu", "centos"],
+    "Nginx": ["nginx"],
+    "Serverless": ["serverless", "aws lambda", "lambda functions", "cloud functions"],
+    "CI/CD": ["ci/cd", "ci cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Jenkins": ["jenkins"],
+    "GitHub Actions": ["github actions"],
+    "GitLab CI": ["gitlab ci", "gitlab-ci"],
+    "Git": ["git", "github", "gitlab", "bitbucket"],
+    "Prometheus": ["prometheus"],
+    "Grafana": ["grafana"],
+    "Datadog": ["datadog"],
+    "Microservices": ["microservices", "microservice", "micro-services"],
+
+    # Practices and domains
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning"],
+    "Natural Language Processing": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"],
+    "Large Language Models": ["llm", "llms", "large language models", "large language model"],
+    "Data Analysis": ["data analysis", "data analytics"],
+    "Data Engineering": ["data engineering", "etl", "elt", "data pipelines"],
+    "Data Visualization": ["data visualization", "tableau", "power bi", "powerbi", "looker"],
+    "Statistics": ["statistics", "statistical analysis"],
+    "Unit Testing": ["unit testing", "unit tests", "pytest", "junit", "jest"],
+    "Test Automation": ["test automation", "selenium", "cypress", "playwright"],
+    "Agile": ["agile", "scrum", "kanban"],
+    "System Design": ["system design", "distributed systems"],
+    "Object-Oriented Programming": ["oop", "object-oriented", "object oriented programming"],
+    "Security": ["security", "cybersecurity", "owasp", "application security"],
+    "OAuth": ["oauth", "oauth2", "openid connect", "oidc"],
+    "Mobile Development": ["ios", "android", "react native", "flutter"],
+    "UI/UX Design": ["ui/ux", "ux", "ui design", "user experience", "figma"],
+    "Excel": ["microsoft excel", "ms excel", "spreadsheets"],
+
+    # Professional skills
+    "Project Management": ["project management", "pmp"],
+    "Product Management": ["product management", "roadmapping"],
+    "Leadership": ["leadership", "team leadership", "people management"],
+    "Mentoring": ["mentoring", "mentorship", "coaching"],
+    "Communication": ["communication", "communication skills"],
+    "Stakeholder Management": ["stakeholder management", "stakeholders"],
+    "Customer Service": ["customer service", "customer support"],
+    "Problem Solving": ["problem solving", "problem-solving"],
+}
@@ -1,17 +1,75 @@
 from PyPDF2 import PdfReader
 from docx import Document
 from pathlib import Path
+from typing import Optional
+from app.utils.pdf_backends import get_pdf_backend
 
-def extract_text_from_pdf(file_path:str) -> str:
+def extract_text_from_pdf(file_path:str, start_page:int = 0, end_page:Optional[int] = None) -> str:
+    """
+    Text of pages [start_page, end_page), all pages by default, using the
+    engine selected by PDF_EXTRACTION_BACKEND
+    """
+    return get_pdf_backend().extract_text(file_path, start_page, end_page)
+
+def extract_text_from_docx(file_path:str) -> str:
+    document = Document(file_path)
+    return "".join("\n" + paragraph.text for paragraph in document.paragraphs)
+
+def count_pdf_pages(file_path:str) -> int:
+    return get_pdf_backend().count_pages(file_path)
+
+def extract_text(file_path:str, filename:str) -> str:
+    if filename.endswith(".pdf"):
+        return extract_text_from_pdf(file_path)
+    if filename.endswith(".docx"):
+        return extract_text_from_docx(file_path)
+    raise ValueError(f"Unsupported file type: {Path(filename).suffix}")
+
+def inspect_pdf_structure(file_path:str) -> dict:
     reader = PdfReader(file_path)
-    text = ""
+    image_count = 0
     for page in reader.pages:
-        text += page.extract_text()
-    return text
+        resources = page.get("/Resources") or {}
+        xobjects = resources.get("/XObject") if hasattr(resources, "get") else None
+        if not xobjects:
+            continue
+        for xobject in xobjects.get_object().values():
+            if xobject.get_object().get("/Subtype") == "/Image":
+                image_count += 1
+    return {
+        "file_type": "pdf",
+        "page_count": len(reader.pages),
+        "image_count": image_count,
+        "table_count": 0,
+        "text_box_count": 0,
+        "header_footer_text": False
+    }
 
-def extract_text_from_docx(file_path:str) -> str:
+def inspect_docx_structure(file_path:str) -> dict:
     document = Document(file_path)
-    text = ""
-    for paragraph in document.paragraphs:
-        text += "\n" + paragraph.text
-    return text
\ No newline at end of file
+    body = document.element.body
+    header_footer_text = any(
+        paragraph.text.strip()
+        for section in document.sections
+        for part in (section.header, section.footer)
+        for paragraph in part.paragraphs
+    )
+    return {
+        "file_type": "docx",
+        "page_count": None,
+        "image_count": len(document.inline_shapes),
+        "table_count": len(document.tables),
+        "text_box_count": len(body.xpath(".//w:txbxContent")),
+        "header_footer_text": header_footer_text
+    }
+
+def inspect_document_structure(file_path:str, filename:str) -> dict:
+    """
+    Layout features ATS parsers struggle with (images, tables, text boxes,
+    content in headers/footers) that don't survive text extraction
+    """
+    if filename.endswith(".pdf"):
+        return inspect_pdf_structure(file_path)
+    if filename.endswith(".docx"):
+        return inspect_docx_structure(file_path)
+    raise ValueError(f"Unsupported file type: {Path(filename).suffix}")
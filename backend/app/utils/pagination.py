@@ -0,0 +1,61 @@
+import base64
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import or_, and_, func
+from sqlalchemy.orm import Query
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", 20))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 100))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+# SQLite keeps timestamps as text: "2026-01-15 09:30:00" from CURRENT_TIMESTAMP,
+# but binds datetimes as "2026-01-15 09:30:00.000000", so equal instants compare
+# unequal and a page boundary inside one second repeats rows forever. There
+# both sides are compared in one text format, to the millisecond as SQLite's
+# %f is; other databases compare real timestamps.
+SQLITE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%f"
+
+
+def keyset_page(query: Query, model, cursor: Optional[str], limit: int) -> tuple[list, Optional[str]]:
+    """
+    Return one page of ``query`` newest first, ordered on (created_at, id), and
+    the cursor for the next page (None on the last page). Rows after the cursor
+    are found by seeking the (user_id, created_at, id) index, not with OFFSET.
+    """
+    sqlite = query.session.get_bind().dialect.name == "sqlite"
+    created_at_key = func.strftime(SQLITE_TIMESTAMP_FORMAT, model.created_at) if sqlite else model.created_at
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if sqlite:
+            created_at = created_at.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        query = query.filter(or_(
+            created_at_key < created_at,
+            and_(created_at_key == created_at, model.id < row_id)
+        ))
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(created_at_key.desc(), model.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
@@ -0,0 +1,118 @@
+"""
+Interchangeable PDF text extraction engines.
+
+PDF_EXTRACTION_BACKEND picks the engine for a deployment:
+- pypdf2 (default): pure Python, always installed
+- pymupdf: MuPDF bindings, much faster and keeps reading order better;
+  needs ``pip install PyMuPDF``
+
+Run ``python -m benchmarks.bench_pdf_backends`` to compare them. A new
+engine subclasses PdfBackend and is added with register_pdf_backend.
+"""
+from abc import ABC, abstractmethod
+from functools import lru_cache
+import inspect
+from typing import Optional
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+PDF_EXTRACTION_BACKEND = os.getenv("PDF_EXTRACTION_BACKEND", "pypdf2")
+
+
+class PdfBackend(ABC):
+    name = ""
+    # Whether extract_text over a page range costs about that range, not the
+    # whole file; only then is splitting a PDF across workers worth it
+    cheap_page_ranges = False
+
+    @abstractmethod
+    def count_pages(self, file_path: str) -> int:
+        ...
+
+    @abstractmethod
+    def extract_text(self, file_path: str, start_page: int = 0, end_page: Optional[int] = None) -> str:
+        """
+        Text of pages [start_page, end_page), all pages by default
+        """
+
+
+class PyPDF2Backend(PdfBackend):
+    name = "pypdf2"
+
+    def __init__(self):
+        from PyPDF2 import PdfReader
+        self._reader = PdfReader
+
+    def count_pages(self, file_path: str) -> int:
+        return len(self._reader(file_path).pages)
+
+    def extract_text(self, file_path: str, start_page: int = 0, end_page: Optional[int] = None) -> str:
+        pages = self._reader(file_path).pages[start_page:end_page]
+        return "".join(page.extract_text() or "" for page in pages)
+
+
+class PyMuPDFBackend(PdfBackend):
+    name = "pymupdf"
+    cheap_page_ranges = True
+
+    def __init__(self):
+        import pymupdf
+        self._pymupdf = pymupdf
+
+    def count_pages(self, file_path: str) -> int:
+        with self._pymupdf.open(file_path) as document:
+            return document.page_count
+
+    def extract_text(self, file_path: str, start_page: int = 0, end_page: Optional[int] = None) -> str:
+        with self._pymupdf.open(file_path) as document:
+            pages = range(document.page_count)[start_page:end_page]
+            return "".join(document[page_number].get_text() for page_number in pages)
+
+
+PDF_BACKENDS: dict[str, type[PdfBackend]] = {}
+
+
+def register_pdf_backend(backend: type[PdfBackend]) -> type[PdfBackend]:
+    """
+    Make a backend selectable by its name; an incomplete one is refused here
+    rather than when a deployment first extracts a PDF with it
+    """
+    if inspect.isabstract(backend):
+        missing = ", ".join(sorted(backend.__abstractmethods__))
+        raise TypeError(f"PDF extraction backend {backend.__name__} does not implement: {missing}")
+    if not backend.name:
+        raise TypeError(f"PDF extraction backend {backend.__name__} has no name")
+    PDF_BACKENDS[backend.name] = backend
+    return backend
+
+
+register_pdf_backend(PyPDF2Backend)
+register_pdf_backend(PyMuPDFBackend)
+
+
+@lru_cache(maxsize=None)
+def get_pdf_backend(name: Optional[str] = None) -> PdfBackend:
+    name = (name or PDF_EXTRACTION_BACKEND).lower()
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF extraction backend '{name}', choose one of: {', '.join(PDF_BACKENDS)}")
+    try:
+        return PDF_BACKENDS[name]()
+    except ImportError as e:
+        raise ValueError(f"PDF extraction backend '{name}' is not installed: {e}")
+
+
+def has_cheap_page_ranges(name: Optional[str] = None) -> bool:
+    backend = PDF_BACKENDS.get((name or PDF_EXTRACTION_BACKEND).lower())
+    return backend is not None and backend.cheap_page_ranges
+
+
+def available_pdf_backends() -> list[str]:
+    available = []
+    for name in PDF_BACKENDS:
+        try:
+            get_pdf_backend(name)
+            available.append(name)
+        except ValueError:
+            pass
+    return available
@@ -0,0 +1,15 @@
+import json
+from typing import Any, Optional
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    message = ""
+    if event:
+        message += f"event: {event}\n"
+    for line in json.dumps(data).splitlines():
+        message += f"data: {line}\n"
+    return message + "\n"
@@ -0,0 +1,42 @@
+"""
+Standalone worker process for the analysis job queue.
+
+Run it next to the API with ANALYSIS_WORKER_MODE=external so uploads are
+processed outside the web process:
+    python -m app.workers.analysis_worker [--concurrency 4]
+"""
+import argparse
+import asyncio
+import logging
+from app.services.analysis_jobs import JobWorker, ANALYSIS_WORKER_CONCURRENCY, requeue_stale_jobs
+from app.services.openai_client import init_openai_clients, close_openai_clients
+from app.services.extraction import shutdown_extraction_pool
+
+
+async def run_worker(concurrency: int) -> None:
+    init_openai_clients()
+    requeued = await asyncio.to_thread(requeue_stale_jobs)
+    if requeued:
+        logging.info("Requeued %s stale analysis job(s)", requeued)
+
+    worker = JobWorker(concurrency=concurrency)
+    worker.start()
+    try:
+        await worker.join()
+    finally:
+        await worker.stop()
+        await close_openai_clients()
+        shutdown_extraction_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued resume analysis jobs")
+    parser.add_argument("--concurrency", type=int, default=ANALYSIS_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
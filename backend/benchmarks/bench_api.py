@@ -0,0 +1,360 @@
+"""
+End-to-end API load benchmark.
+
+Runs the API and benchmarks.fake_openai_server in-process under uvicorn,
+against a throwaway SQLite database or --database-url (e.g. a local
+Postgres), seeds users, resumes and job applications, then drives scripted
+scenarios with concurrent clients over real HTTP:
+- login_storm: logins spread over the seeded users
+- upload_burst: every resume in a synthetic corpus uploaded at once, then
+  each analysis job waited on until it finishes
+- match_fan_out: batch job matching against many postings, plus the same
+  postings matched one request each
+- dashboard_reads: the listing, summary and analytics reads behind the dashboard
+
+Each endpoint of each scenario prints one JSON line with requests/sec,
+p50/p95/p99 latency and errors, tagged with the git commit. Save a run with
+--output and diff two runs with benchmarks.compare_results:
+    python -m benchmarks.bench_api [--scenarios login_storm dashboard_reads]
+        [--concurrency 16] [--duration 10] [--llm-latency-ms 300] [--output run.jsonl]
+"""
+import argparse
+import asyncio
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+import json
+import logging
+import os
+from pathlib import Path
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Optional
+from benchmarks.bench_llm_resilience import free_port, start_fake_server
+from benchmarks.bench_login import percentile
+from benchmarks.bench_match_scoring import make_postings
+from benchmarks.resume_corpus import build_corpus, make_resume_lines
+
+SCENARIOS = ["login_storm", "upload_burst", "match_fan_out", "dashboard_reads"]
+PASSWORD = "correct-horse-battery"
+APPLICATION_STATUSES = ["Applied", "Interview", "Offer", "Rejected"]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Recorder:
+    """
+    Latency and errors per endpoint label. A request is an error if it
+    raised, answered with a 4xx/5xx, or the scenario marked it failed.
+    """
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+
+    async def request(self, client, method: str, url: str, endpoint: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception as e:
+            self.record(endpoint, time.perf_counter() - start, type(e).__name__)
+            return None
+        self.record(endpoint, time.perf_counter() - start, str(response.status_code) if response.status_code >= 400 else None)
+        return response
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        self.latencies[endpoint].append(seconds * 1000)
+        if error:
+            self.errors[endpoint][error] += 1
+
+    def mark_error(self, endpoint: str, error: str) -> None:
+        self.errors[endpoint][error] += 1
+
+    def results(self, scenario: str, elapsed: float, concurrency: int, commit: Optional[str]) -> list[dict]:
+        results = []
+        for endpoint, latencies in self.latencies.items():
+            errors = self.errors[endpoint]
+            results.append({
+                "benchmark": "api",
+                "scenario": scenario,
+                "endpoint": endpoint,
+                "commit": commit,
+                "concurrency": concurrency,
+                "duration_s": round(elapsed, 2),
+                "requests": len(latencies),
+                "errors": sum(errors.values()),
+                "error_types": dict(errors),
+                "req_per_sec": round(len(latencies) / elapsed, 1) if elapsed else 0,
+                "p50_ms": round(percentile(latencies, 50), 1),
+                "p95_ms": round(percentile(latencies, 95), 1),
+                "p99_ms": round(percentile(latencies, 99), 1),
+            })
+        return results
+
+
+async def run_for(duration: float, concurrency: int, step) -> float:
+    """
+    Run ``step(worker_index, iteration)`` in ``concurrency`` closed loops
+    for ``duration`` seconds, returns the elapsed time
+    """
+    stop = time.perf_counter() + duration
+
+    async def worker(index: int):
+        iteration = 0
+        while time.perf_counter() < stop:
+            await step(index, iteration)
+            iteration += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def seed_fixtures(users: int, applications_per_user: int, resumes_per_user: int) -> list[dict]:
+    """
+    Insert users, job applications and analyzed resumes directly, all users
+    sharing one password hash so seeding doesn't pay for bcrypt per user
+    """
+    from app.core.security import create_access_token, pwd_context
+    from app.db.database import SessionLocal
+    from app.models.job_application import JobApplication
+    from app.models.resume_analysis import ResumeAnalysis
+    from app.models.user import User
+    from app.services.resume_sections import parse_resume_sections
+
+    rng = random.Random(11)
+    hashed_password = pwd_context.hash(PASSWORD)
+    run_id = int(time.time())
+    fixtures = []
+    db = SessionLocal()
+    try:
+        for index in range(users):
+            user = User(email=f"bench-{run_id}-{index}@example.com", full_name=f"Bench User {index}", hashed_password=hashed_password)
+            db.add(user)
+            db.flush()
+            for number in range(applications_per_user):
+                db.add(JobApplication(
+                    user_id=user.id,
+                    company_name=f"Company {number}",
+                    job_title=rng.choice(["Software Engineer", "Data Engineer", "Backend Developer"]),
+                    status=rng.choice(APPLICATION_STATUSES),
+                    application_date=date.today() - timedelta(days=rng.randint(0, 120)),
+                    notes="Referred by a former colleague" if number % 3 == 0 else None
+                ))
+            resume_ids = []
+            for number in range(resumes_per_user):
+                resume_text = "\n".join(make_resume_lines(rng, jobs=rng.choice([2, 3, 4])))
+                resume = ResumeAnalysis(
+                    user_id=user.id,
+                    filename=f"resume_{number}.pdf",
+                    file_path="/dev/null",
+                    overall_score=rng.randint(40, 95),
+                    analysis_text="Clear structure, achievements lack numbers.",
+                    suggestions=["Quantify impact in each role", "Trim the summary"],
+                    resume_text=resume_text,
+                    resume_sections=parse_resume_sections(resume_text)
+                )
+                db.add(resume)
+                db.flush()
+                resume_ids.append(resume.id)
+            fixtures.append({
+                "user_id": user.id,
+                "email": user.email,
+                "resume_ids": resume_ids,
+                "headers": {"Authorization": f"Bearer {create_access_token(data={'sub': str(user.id)})}"},
+            })
+        db.commit()
+    finally:
+        db.close()
+    return fixtures
+
+
+async def login_storm(client, fixtures: list[dict], concurrency: int, duration: float, recorder: Recorder, **_) -> float:
+    async def step(index: int, iteration: int):
+        fixture = fixtures[(index + iteration * concurrency) % len(fixtures)]
+        await recorder.request(client, "POST", "/api/auth/login", "POST /api/auth/login", json={"email": fixture["email"], "password": PASSWORD})
+
+    return await run_for(duration, concurrency, step)
+
+
+async def upload_burst(client, fixtures: list[dict], concurrency: int, recorder: Recorder, uploads: int, corpus_dir: Path, **_) -> float:
+    corpus = build_corpus(corpus_dir, count=uploads, seed=int(time.time()))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload_and_wait(index: int, document):
+        fixture = fixtures[index % len(fixtures)]
+        start = time.perf_counter()
+        async with semaphore:
+            response = await recorder.request(
+                client, "POST", "/api/resume/upload", "POST /api/resume/upload",
+                headers=fixture["headers"],
+                files={"file": (document.path.name, document.path.read_bytes(), "application/pdf")}
+            )
+        if response is None or response.status_code >= 400:
+            return
+        job = response.json()
+        while job["status"] not in ("completed", "failed"):
+            response = await recorder.request(client, "GET", f"/api/jobs/{job['id']}", "GET /api/jobs/{job_id}?wait", params={"wait": 30}, headers=fixture["headers"])
+            if response is None or response.status_code >= 400:
+                return
+            job = response.json()
+        # Upload to finished analysis, as the user experiences it
+        recorder.record("resume analysis end to end", time.perf_counter() - start, None if job["status"] == "completed" else "job_failed")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(upload_and_wait(index, document) for index, document in enumerate(corpus)))
+    return time.perf_counter() - start
+
+
+async def match_fan_out(client, fixtures: list[dict], concurrency: int, duration: float, recorder: Recorder, fan_out: int, **_) -> float:
+    postings = make_postings(fan_out, words_per_posting=120)
+
+    async def step(index: int, iteration: int):
+        fixture = fixtures[index % len(fixtures)]
+        resume_id = fixture["resume_ids"][iteration % len(fixture["resume_ids"])]
+        # A distinct suffix per call keeps the LLM cache and single-flight from answering
+        tag = f"Req {index}-{iteration}"
+        job_descriptions = [f"{posting} {tag}-{number}" for number, posting in enumerate(postings)]
+        response = await recorder.request(
+            client, "POST", "/api/job-match/analyze-batch", "POST /api/job-match/analyze-batch",
+            json={"resume_id": resume_id, "job_descriptions": job_descriptions}, headers=fixture["headers"]
+        )
+        if response is not None and "event: error" in response.text:
+            recorder.mark_error("POST /api/job-match/analyze-batch", "item_error")
+        await asyncio.gather(*(
+            recorder.request(
+                client, "POST", "/api/job-match/analyze", "POST /api/job-match/analyze",
+                json={"resume_id": resume_id, "job_description": f"{job_description} single"}, headers=fixture["headers"]
+            )
+            for job_description in job_descriptions
+        ))
+
+    return await run_for(duration, concurrency, step)
+
+
+async def dashboard_reads(client, fixtures: list[dict], concurrency: int, duration: float, recorder: Recorder, **_) -> float:
+    reads = [
+        ("/api/applications/user/{user_id}/summary", "GET /api/applications/user/{user_id}/summary"),
+        ("/api/resume/user/{user_id}/summary", "GET /api/resume/user/{user_id}/summary"),
+        ("/api/applications/analytics/{user_id}", "GET /api/applications/analytics/{user_id}"),
+        ("/api/auth/me", "GET /api/auth/me"),
+    ]
+
+    async def step(index: int, iteration: int):
+        fixture = fixtures[(index + iteration) % len(fixtures)]
+        url, endpoint = reads[iteration % len(reads)]
+        await recorder.request(client, "GET", url.format(user_id=fixture["user_id"]), endpoint, headers=fixture["headers"])
+
+    return await run_for(duration, concurrency, step)
+
+
+SCENARIO_RUNNERS = {
+    "login_storm": login_storm,
+    "upload_burst": upload_burst,
+    "match_fan_out": match_fan_out,
+    "dashboard_reads": dashboard_reads,
+}
+
+
+def start_api_server(port: int):
+    import uvicorn
+    from app.db.database import Base, engine
+    from app.main import app
+
+    # Startup already queries the job table
+    Base.metadata.create_all(engine)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("The API server failed to start")
+        time.sleep(0.05)
+    return server, thread
+
+
+async def run(api_port: int, fake_port: int, args, corpus_dir: Path) -> list[dict]:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{fake_port}") as fake:
+        await fake.post("/_config", json={"latency_ms": args.llm_latency_ms, "jitter_ms": args.llm_latency_ms / 3})
+
+    fixtures = await asyncio.to_thread(seed_fixtures, args.users, args.applications_per_user, args.resumes_per_user)
+    commit = git_commit()
+    limits = httpx.Limits(max_connections=args.concurrency * (args.fan_out + 1))
+    results = []
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{api_port}", timeout=120, limits=limits) as client:
+        for scenario in args.scenarios:
+            recorder = Recorder()
+            elapsed = await SCENARIO_RUNNERS[scenario](
+                client, fixtures, concurrency=args.concurrency, duration=args.duration, recorder=recorder,
+                uploads=args.uploads, fan_out=args.fan_out, corpus_dir=corpus_dir / scenario
+            )
+            for result in recorder.results(scenario, elapsed, args.concurrency, commit):
+                print(json.dumps(result), flush=True)
+                results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API end to end against a fake OpenAI provider")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per closed-loop scenario")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--applications-per-user", type=int, default=40)
+    parser.add_argument("--resumes-per-user", type=int, default=5)
+    parser.add_argument("--uploads", type=int, default=40, help="Resumes uploaded at once by upload_burst")
+    parser.add_argument("--fan-out", type=int, default=10, help="Postings per match_fan_out round")
+    parser.add_argument("--llm-latency-ms", type=float, default=300)
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite database")
+    parser.add_argument("--output", help="Also write the JSON lines to this file")
+    args = parser.parse_args()
+
+    # Every request would log otherwise
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        fake_port, api_port = free_port(), free_port()
+        # Set before the app is imported, its configuration is read at import time
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{directory}/bench_api.db"
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{fake_port}/v1"
+        os.environ["UPLOAD_DIR"] = str(directory / "uploads")
+        os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+        os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+        os.environ.setdefault("ANALYSIS_WORKER_MODE", "inprocess")
+        # Measure the request path, not cache hits or the per-user LLM quota
+        os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+        os.environ.setdefault("LLM_USER_REQUESTS_PER_MINUTE", "1000000")
+        os.environ.setdefault("LLM_USER_TOKENS_PER_MINUTE", "1000000000")
+        os.environ.setdefault("LLM_GLOBAL_REQUESTS_PER_MINUTE", "1000000")
+        os.environ.setdefault("LLM_GLOBAL_TOKENS_PER_MINUTE", "1000000000")
+
+        fake_server, fake_thread = start_fake_server(fake_port)
+        try:
+            api_server, api_thread = start_api_server(api_port)
+        except Exception:
+            fake_server.should_exit = True
+            raise
+        try:
+            results = asyncio.run(run(api_port, fake_port, args, directory / "corpus"))
+        finally:
+            api_server.should_exit = True
+            fake_server.should_exit = True
+            api_thread.join()
+            fake_thread.join()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.writelines(json.dumps(result) + "\n" for result in results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+LLM call resilience benchmark against the fake OpenAI server.
+
+Starts benchmarks.fake_openai_server in-process and runs job match calls
+through openai_service under several fault profiles, once per strategy:
+- baseline: a single attempt, no hedging
+- retries: jittered retries on transient and parse failures
+- retries_hedged: retries plus a hedged request past the p90 latency
+Each run prints one JSON line with success rate, latency percentiles,
+error types and how many upstream requests were made per call.
+    python -m benchmarks.bench_llm_resilience [--requests 200] [--concurrency 20]
+"""
+import argparse
+import asyncio
+from collections import Counter
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from benchmarks.bench_login import percentile
+
+SCENARIOS = {
+    "healthy": {},
+    "slow_tail": {"slow_rate": 0.05, "slow_ms": 2000},
+    "flaky": {"error_rate": 0.15, "rate_limit_rate": 0.05},
+    "malformed": {"malformed_rate": 0.2},
+    "outage": {"error_rate": 1.0},
+}
+STRATEGIES = {
+    "baseline": {"LLM_MAX_ATTEMPTS": 1, "LLM_HEDGE_PERCENTILE": 0},
+    "retries": {"LLM_MAX_ATTEMPTS": 3, "LLM_HEDGE_PERCENTILE": 0},
+    "retries_hedged": {"LLM_MAX_ATTEMPTS": 3, "LLM_HEDGE_PERCENTILE": 90},
+}
+JOB_DESCRIPTION = "Backend engineer: Python, SQL, AWS, Kubernetes and Go. 3+ years building APIs."
+RESUME_TEXT = "SUMMARY\nBackend developer\n\nEXPERIENCE\nEngineer, Acme\n- Built Python APIs on AWS\n\nSKILLS\nPython, SQL, AWS"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_server(port: int):
+    import uvicorn
+    from benchmarks.fake_openai_server import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def run_scenario(client, scenario: str, strategy: str, requests: int, concurrency: int, latency_ms: float) -> dict:
+    from app.services import llm_resilience
+    from app.services.openai_service import analyze_job_match_with_ai_async
+
+    for name, value in STRATEGIES[strategy].items():
+        setattr(llm_resilience, name, value)
+    llm_resilience.breaker.reset()
+    llm_resilience.latencies = llm_resilience.LatencyTracker()
+    await client.post("/_config", json={"latency_ms": latency_ms, "jitter_ms": latency_ms / 3, "slow_rate": 0, "error_rate": 0,
+                                         "rate_limit_rate": 0, "malformed_rate": 0, **SCENARIOS[scenario]})
+    upstream_before = (await client.get("/_stats")).json().get("requests", 0)
+    counters_before = llm_resilience.resilience_stats()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    durations = []
+    outcomes = Counter()
+
+    async def one_call(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # A distinct description per call, so identical prompts can't be served from any cache
+                await analyze_job_match_with_ai_async(RESUME_TEXT, f"{JOB_DESCRIPTION} Req {index}.")
+                outcomes["ok"] += 1
+            except Exception as e:
+                outcomes[type(e).__name__] += 1
+            durations.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_call(index) for index in range(requests)))
+    elapsed = time.perf_counter() - start
+    upstream = (await client.get("/_stats")).json().get("requests", 0) - upstream_before
+    counters = llm_resilience.resilience_stats()
+
+    return {
+        "benchmark": "llm_resilience",
+        "scenario": scenario,
+        "strategy": strategy,
+        "requests": requests,
+        "success_rate": round(outcomes["ok"] / requests, 4),
+        "errors": {name: count for name, count in outcomes.items() if name != "ok"},
+        "calls_per_sec": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(durations, 50), 1),
+        "p95_ms": round(percentile(durations, 95), 1),
+        "p99_ms": round(percentile(durations, 99), 1),
+        "upstream_requests_per_call": round(upstream / requests, 2),
+        "hedged_requests": counters.get("hedged_requests", 0) - counters_before.get("hedged_requests", 0),
+        "breaker_state": counters["breaker_state"],
+    }
+
+
+async def run(port: int, scenarios: list[str], strategies: list[str], requests: int, concurrency: int, latency_ms: float) -> None:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        for scenario in scenarios:
+            for strategy in strategies:
+                print(json.dumps(await run_scenario(client, scenario, strategy, requests, concurrency, latency_ms)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM retries, hedging and circuit breaking against a fake provider")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    args = parser.parse_args()
+
+    # Every injected fault would log a warning
+    logging.disable(logging.WARNING)
+    port = free_port()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("LLM_RETRY_BASE_DELAY", "0.1")
+    os.environ.setdefault("LLM_BREAKER_RESET_SECONDS", "5")
+    server, thread = start_fake_server(port)
+    try:
+        asyncio.run(run(port, args.scenarios, args.strategies, args.requests, args.concurrency, args.latency_ms))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Login storm benchmark.
+
+Runs the API in-process against a throwaway SQLite database and fires
+--concurrency concurrent logins for --duration seconds. Meanwhile one client
+keeps calling a cheap sync endpoint (GET /api/auth/me) to measure how the storm
+affects unrelated requests. Each scenario prints one JSON line:
+- idle: probe latency with no logins running
+- shared_threadpool: the storm verifies passwords with run_in_threadpool,
+  the way login used to, on the threadpool sync endpoints share
+- dedicated_executor: the storm goes through POST /api/auth/login, which
+  hashes on its own bounded executor
+    python -m benchmarks.bench_login [--concurrency 64] [--duration 5] [--rounds 12]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def probe(client, headers: dict, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/auth/me", headers=headers)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def run_scenario(name: str, client, headers: dict, storm, concurrency: int, duration: float) -> dict:
+    stop = asyncio.Event()
+    latencies: list[float] = []
+    counts = {"logins": 0, "errors": 0}
+
+    async def storm_worker():
+        while not stop.is_set():
+            try:
+                await storm()
+                counts["logins"] += 1
+            except Exception:
+                counts["errors"] += 1
+
+    workers = [asyncio.create_task(storm_worker()) for _ in range(concurrency if storm else 0)]
+    probe_task = asyncio.create_task(probe(client, headers, stop, latencies))
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(probe_task, *workers)
+
+    return {
+        "benchmark": "login_storm",
+        "scenario": name,
+        "concurrency": concurrency if storm else 0,
+        "duration_s": duration,
+        "logins_per_sec": round(counts["logins"] / duration, 1),
+        "login_errors": counts["errors"],
+        "probe_requests": len(latencies),
+        "probe_p50_ms": round(percentile(latencies, 50), 2),
+        "probe_p95_ms": round(percentile(latencies, 95), 2),
+        "probe_p99_ms": round(percentile(latencies, 99), 2),
+        "probe_mean_ms": round(statistics.mean(latencies), 2) if latencies else None,
+    }
+
+
+async def run(concurrency: int, duration: float) -> None:
+    # Imported here so the environment set up in main() is in place first
+    import httpx
+    from fastapi.concurrency import run_in_threadpool
+    from app.core.security import pwd_context
+    from app.db.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(engine)
+    credentials = {"email": "storm@example.com", "password": "correct-horse-battery"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/auth/register", json={**credentials, "full_name": "Storm"})
+        response.raise_for_status()
+        login = await client.post("/api/auth/login", json=credentials)
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        hashed_password = pwd_context.hash(credentials["password"])
+
+        async def shared_threadpool_login():
+            if not await run_in_threadpool(pwd_context.verify, credentials["password"], hashed_password):
+                raise ValueError("verify failed")
+
+        async def dedicated_executor_login():
+            response = await client.post("/api/auth/login", json=credentials)
+            response.raise_for_status()
+
+        scenarios = [
+            ("idle", None),
+            ("shared_threadpool", shared_threadpool_login),
+            ("dedicated_executor", dedicated_executor_login),
+        ]
+        for name, storm in scenarios:
+            print(json.dumps(await run_scenario(name, client, headers, storm, concurrency, duration)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logins/sec and their impact on other endpoints")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--rounds", type=int, help="BCRYPT_ROUNDS to benchmark with")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["DATABASE_URL"] = f"sqlite:///{directory}/bench_login.db"
+        os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+        os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+        # Let the storm queue instead of being shed, so the two paths are compared like for like
+        os.environ.setdefault("PASSWORD_HASH_MAX_PENDING", str(args.concurrency * 2))
+        if args.rounds:
+            os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+        asyncio.run(run(args.concurrency, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Throughput benchmark for the local job-match scorer.
+
+Scores one resume against synthetic postings of realistic length and prints
+one JSON line per corpus size:
+    python -m benchmarks.bench_match_scoring [--sizes 100 1000 5000] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from app.services.match_scoring import score_postings
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "react", "node.js", "django", "fastapi", "flask",
+    "postgresql", "mysql", "mongodb", "redis", "kafka", "docker", "kubernetes", "terraform", "aws",
+    "gcp", "azure", "graphql", "rest", "c++", "c#", ".net", "go", "rust", "spark", "airflow", "pandas",
+    "numpy", "pytorch", "tensorflow", "sql", "linux", "git", "ci/cd", "jenkins", "agile", "scrum",
+]
+FILLER = [
+    "build", "scalable", "services", "collaborate", "cross-functional", "stakeholders", "design",
+    "deliver", "features", "customers", "ownership", "mentor", "engineers", "production", "systems",
+    "reliability", "performance", "data", "pipelines", "platform", "product", "quality", "testing",
+    "communication", "analytical", "problem", "solving", "cloud", "infrastructure", "security",
+]
+
+RESUME_TEXT = """
+Software engineer with six years building Python and TypeScript services. Designed REST and GraphQL
+APIs with FastAPI and Django backed by PostgreSQL and Redis, deployed with Docker and Kubernetes on
+AWS. Built data pipelines with Airflow and pandas, set up CI/CD in Jenkins and mentored junior engineers.
+"""
+
+
+def make_postings(count: int, words_per_posting: int = 250, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    postings = []
+    for _ in range(count):
+        skills = rng.sample(SKILLS, 8)
+        words = [rng.choice(FILLER) if rng.random() < 0.85 else rng.choice(skills) for _ in range(words_per_posting)]
+        postings.append(" ".join(words))
+    return postings
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    for size in sizes:
+        postings = make_postings(size)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            score_postings(RESUME_TEXT, postings)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(json.dumps({
+            "benchmark": "match_scoring",
+            "postings": size,
+            "best_ms": round(best * 1000, 2),
+            "median_ms": round(statistics.median(timings) * 1000, 2),
+            "postings_per_sec": round(size / best),
+        }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local job-match scoring")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Speed, memory and fidelity benchmark for the PDF extraction backends.
+
+Every installed backend extracts the same corpus of resumes in its own fresh
+process, so peak memory isn't skewed by whichever backend ran first. Prints
+one JSON line per backend with pages/sec, peak RSS and a fidelity score: the
+word-sequence similarity (0-1) between extracted and expected text.
+
+By default a synthetic corpus with known text is generated. Real resumes can
+be used instead with --corpus DIR; a sibling .txt file holding the expected
+text enables fidelity scoring for a PDF:
+    python -m benchmarks.bench_pdf_backends [--count 24] [--repeat 3] [--corpus DIR]
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+import json
+import multiprocessing
+from pathlib import Path
+import re
+import resource
+import statistics
+import tempfile
+import time
+from typing import Optional
+from app.utils.pdf_backends import PDF_BACKENDS, available_pdf_backends, get_pdf_backend
+from benchmarks.resume_corpus import build_corpus
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def fidelity(expected: str, actual: str) -> float:
+    expected_words = WORD_PATTERN.findall(expected.lower())
+    actual_words = WORD_PATTERN.findall(actual.lower())
+    return SequenceMatcher(None, expected_words, actual_words, autojunk=False).ratio()
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(name: str, documents: list[tuple[str, Optional[str]]], repeat: int) -> dict:
+    """
+    Runs in a child process: extract every document ``repeat`` times
+    """
+    rss_before = _peak_rss_mb()
+    backend = get_pdf_backend(name)
+    pages = sum(backend.count_pages(path) for path, _ in documents)
+
+    best = float("inf")
+    texts = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        texts = [backend.extract_text(path) for path, _ in documents]
+        best = min(best, time.perf_counter() - start)
+
+    scores = [fidelity(expected, text) for (_, expected), text in zip(documents, texts) if expected is not None]
+    return {
+        "benchmark": "pdf_backends",
+        "backend": name,
+        "documents": len(documents),
+        "pages": pages,
+        "seconds": round(best, 4),
+        "pages_per_sec": round(pages / best, 1) if best else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "rss_growth_mb": round(_peak_rss_mb() - rss_before, 1),
+        "fidelity_mean": round(statistics.mean(scores), 4) if scores else None,
+        "fidelity_min": round(min(scores), 4) if scores else None,
+    }
+
+
+def load_corpus(directory: Path) -> list[tuple[str, Optional[str]]]:
+    documents = []
+    for path in sorted(directory.glob("*.pdf")):
+        expected_path = path.with_suffix(".txt")
+        documents.append((str(path), expected_path.read_text() if expected_path.exists() else None))
+    return documents
+
+
+def run(documents: list[tuple[str, Optional[str]]], backends: list[str], repeat: int) -> None:
+    context = multiprocessing.get_context("spawn")
+    for name in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            print(json.dumps(pool.submit(run_backend, name, documents, repeat).result()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction backends")
+    parser.add_argument("--count", type=int, default=24, help="synthetic resumes to generate")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--corpus", type=Path, help="directory of PDFs to use instead of the synthetic corpus")
+    parser.add_argument("--backends", nargs="+", choices=list(PDF_BACKENDS))
+    args = parser.parse_args()
+
+    backends = args.backends or available_pdf_backends()
+    if args.corpus:
+        run(load_corpus(args.corpus), backends, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = build_corpus(Path(directory), count=args.count)
+        run([(str(document.path), document.expected_text) for document in corpus], backends, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark for taxonomy skill extraction.
+
+Compares the Aho-Corasick matcher with a baseline that runs one regex per
+alias, over a synthetic corpus of job postings, and prints one JSON line per
+method and corpus size. The baseline is slow, so it only runs once over the
+first --baseline-sample postings of each corpus:
+    python -m benchmarks.bench_skill_extraction [--sizes 1000 5000] [--repeat 3]
+"""
+import argparse
+import json
+import re
+import time
+from app.services.skill_extractor import get_skill_matcher
+from app.services.skill_taxonomy import SKILL_TAXONOMY
+from benchmarks.bench_match_scoring import make_postings
+
+
+def build_regex_baseline():
+    patterns = [
+        (skill, re.compile(r"(?<![\w.+#])" + re.escape(alias) + r"(?![\w+#])"))
+        for skill, aliases in SKILL_TAXONOMY.items()
+        for alias in aliases
+    ]
+
+    def extract(text: str) -> list[str]:
+        lowered = text.lower()
+        return list(dict.fromkeys(skill for skill, pattern in patterns if pattern.search(lowered)))
+
+    return extract
+
+
+def time_method(extract, postings: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for posting in postings:
+            extract(posting)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: list[int], repeat: int, baseline_sample: int) -> None:
+    start = time.perf_counter()
+    matcher = get_skill_matcher()
+    compile_ms = (time.perf_counter() - start) * 1000
+    methods = {"aho_corasick": matcher.extract, "regex_per_alias": build_regex_baseline()}
+
+    for size in sizes:
+        corpus = make_postings(size)
+        for name, extract in methods.items():
+            postings = corpus if name == "aho_corasick" else corpus[:baseline_sample]
+            megabytes = sum(len(posting) for posting in postings) / 1_000_000
+            best = time_method(extract, postings, repeat if name == "aho_corasick" else 1)
+            print(json.dumps({
+                "benchmark": "skill_extraction",
+                "method": name,
+                "postings": len(postings),
+                "patterns": sum(len(aliases) for aliases in SKILL_TAXONOMY.values()),
+                "compile_ms": round(compile_ms, 2) if name == "aho_corasick" else None,
+                "best_ms": round(best * 1000, 2),
+                "postings_per_sec": round(len(postings) / best),
+                "mb_per_sec": round(megabytes / best, 2),
+            }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline-sample", type=int, default=100)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.baseline_sample)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Diff two benchmark runs saved as JSON lines (e.g. bench_api --output).
+
+Rows are matched on their identifying fields (benchmark, scenario, endpoint,
+...) and every numeric result is printed as old, new and percent change, one
+JSON line per row. A row regresses when throughput drops or p95 latency or
+the error count grows by more than --threshold percent; with --fail the
+exit status is 1 if any row regressed, for use in CI:
+    python -m benchmarks.compare_results baseline.jsonl candidate.jsonl [--threshold 10] [--fail]
+"""
+import argparse
+import json
+import sys
+from typing import Optional
+
+KEY_FIELDS = ("benchmark", "scenario", "strategy", "endpoint", "backend", "method", "size")
+HIGHER_IS_BETTER = ("req_per_sec", "calls_per_sec", "success_rate")
+LOWER_IS_BETTER = ("p95_ms", "errors")
+
+
+def load(path: str) -> dict[tuple, dict]:
+    rows = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                row = json.loads(line)
+                rows[tuple((field, row[field]) for field in KEY_FIELDS if field in row)] = row
+    return rows
+
+
+def change_pct(old: float, new: float) -> Optional[float]:
+    """
+    None when growing from zero, which has no percentage
+    """
+    if old == 0:
+        return 0.0 if new == 0 else None
+    return round((new - old) / abs(old) * 100, 1)
+
+
+def compare(old: dict, new: dict, threshold: float) -> dict:
+    changes = {}
+    regressed = []
+    for field, old_value in old.items():
+        new_value = new.get(field)
+        if isinstance(old_value, bool) or not isinstance(old_value, (int, float)) or not isinstance(new_value, (int, float)):
+            continue
+        change = change_pct(old_value, new_value)
+        changes[field] = {"old": old_value, "new": new_value, "change_pct": change}
+        if field in HIGHER_IS_BETTER and change is not None and change < -threshold:
+            regressed.append(field)
+        if field in LOWER_IS_BETTER and (change is None or change > threshold):
+            regressed.append(field)
+    return {"changes": changes, "regressed": regressed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change that counts as a regression")
+    parser.add_argument("--fail", action="store_true", help="Exit with status 1 if anything regressed")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    any_regressed = False
+    for key in list(baseline) + [key for key in candidate if key not in baseline]:
+        row = dict(key)
+        if key not in candidate or key not in baseline:
+            row["missing_from"] = "candidate" if key not in candidate else "baseline"
+        else:
+            row.update(compare(baseline[key], candidate[key], args.threshold))
+            any_regressed = any_regressed or bool(row["regressed"])
+        print(json.dumps(row))
+    if args.fail and any_regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Local OpenAI-compatible chat completions server with injectable faults.
+
+Answers POST /v1/chat/completions (streaming too) with canned responses
+shaped like each prompt expects: SCORE/FEEDBACK text for resume analysis,
+JSON for job match and ATS checks, prose for cover letters. Latency, slow
+outliers, 5xx and 429 errors and malformed output are injected at the
+configured rates. Point the backend at it with
+OPENAI_BASE_URL=http://127.0.0.1:8900/v1.
+
+    python -m benchmarks.fake_openai_server [--port 8900] [--latency-ms 300]
+        [--slow-rate 0.05 --slow-ms 3000] [--error-rate 0.1] [--malformed-rate 0.1]
+        [--responses payloads.json]
+
+The fault config can be changed while running with POST /_config (a JSON
+object of the same settings) and request counters read from GET /_stats.
+Canned payloads are replaced per task (ats_check, job_match,
+resume_analysis, cover_letter) with --responses or POST /_responses, a JSON
+object mapping the task to the content to return: a string, or any other
+JSON value which is returned serialized.
+"""
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import asdict, dataclass
+import json
+import random
+import time
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.requests import ClientDisconnect
+
+
+@dataclass
+class FaultConfig:
+    latency_ms: float = 300
+    jitter_ms: float = 100
+    slow_rate: float = 0.0
+    slow_ms: float = 3000
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    malformed_rate: float = 0.0
+    stream_chunk_ms: float = 5
+    seed: int = 0
+
+
+config = FaultConfig()
+responses: dict = {}
+stats = Counter()
+rng = random.Random(config.seed)
+app = FastAPI(title="Fake OpenAI")
+
+
+def _task_for(prompt: str) -> str:
+    if "ATS (Applicant Tracking System) compatibility" in prompt:
+        return "ats_check"
+    if "matches the job requirements" in prompt:
+        return "job_match"
+    if "SCORE:" in prompt:
+        return "resume_analysis"
+    return "cover_letter"
+
+
+def _content_for(prompt: str) -> str:
+    task = _task_for(prompt)
+    if task in responses:
+        content = responses[task]
+        return content if isinstance(content, str) else json.dumps(content)
+    if task == "ats_check":
+        return json.dumps({
+            "ats_score": 78,
+            "issues_found": ["Two-column layout", "Skills listed as an image"],
+            "recommendations": ["Use a single column", "List skills as text"],
+            "is_ats_friendly": True
+        })
+    if task == "job_match":
+        return json.dumps({
+            "match_percentage": 72,
+            "matching_skills": ["Python", "SQL", "AWS"],
+            "missing_skills": ["Kubernetes", "Go"],
+            "suggestions": ["Mention container orchestration work", "Quantify the data pipeline results"]
+        })
+    if task == "resume_analysis":
+        return ("SCORE: 74\n"
+                "FEEDBACK: Clear structure and relevant experience, but achievements lack numbers.\n"
+                "SUGGESTIONS:\n1. Quantify impact in each role\n2. Move skills above education\n3. Trim the summary")
+    return ("Dear Hiring Manager,\n\nI am excited to apply for this role. " * 3
+            + "\n\nThank you for your consideration.\n\nSincerely,")
+
+
+def _malformed(content: str) -> str:
+    if content.lstrip().startswith("{") and rng.random() < 0.5:
+        # Recoverable: prose and a code fence around otherwise valid JSON
+        return f"Sure! Here is the analysis:\n```json\n{content}\n```\nLet me know if you need more."
+    # Unrecoverable: cut off mid-way, like a truncated generation
+    return content[:len(content) // 2]
+
+
+def _usage(prompt: str, content: str) -> dict:
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = max(1, len(content) // 4)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+
+
+def _error(status_code: int, message: str, error_type: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"error": {"message": message, "type": error_type, "code": None}})
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    try:
+        body = await request.json()
+    except ClientDisconnect:
+        # A cancelled hedge or timed out attempt
+        return Response(status_code=499)
+    prompt = "\n".join(message.get("content") or "" for message in body.get("messages", []))
+    stats["requests"] += 1
+    stats[f"requests_{_task_for(prompt)}"] += 1
+
+    delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+    if rng.random() < config.slow_rate:
+        stats["slow"] += 1
+        delay = config.slow_ms
+    await asyncio.sleep(max(0.0, delay) / 1000)
+
+    roll = rng.random()
+    if roll < config.error_rate:
+        stats["errors"] += 1
+        return _error(500, "The server had an error while processing your request.", "server_error")
+    if roll < config.error_rate + config.rate_limit_rate:
+        stats["rate_limited"] += 1
+        return _error(429, "Rate limit reached.", "rate_limit_exceeded")
+
+    content = _content_for(prompt)
+    if rng.random() < config.malformed_rate:
+        stats["malformed"] += 1
+        content = _malformed(content)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    model = body.get("model", "fake-model")
+
+    if not body.get("stream"):
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": _usage(prompt, content),
+        }
+
+    include_usage = (body.get("stream_options") or {}).get("include_usage")
+
+    async def events():
+        base = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model}
+        words = content.split(" ")
+        for index, word in enumerate(words):
+            delta = word if index == len(words) - 1 else word + " "
+            yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': {'content': delta}, 'finish_reason': None}]})}\n\n"
+            await asyncio.sleep(config.stream_chunk_ms / 1000)
+        yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+        if include_usage:
+            yield f"data: {json.dumps({**base, 'choices': [], 'usage': _usage(prompt, content)})}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/_config")
+async def update_config(request: Request):
+    global rng
+    for key, value in (await request.json()).items():
+        if hasattr(config, key):
+            setattr(config, key, type(getattr(config, key))(value))
+    rng = random.Random(config.seed)
+    return asdict(config)
+
+
+@app.post("/_responses")
+async def update_responses(request: Request):
+    responses.clear()
+    responses.update(await request.json())
+    return responses
+
+
+@app.get("/_stats")
+async def get_stats():
+    return dict(stats)
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    for field, default in asdict(config).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(default), default=default)
+    parser.add_argument("--responses", help="JSON file mapping tasks to the content to return")
+    args = parser.parse_args()
+    if args.responses:
+        with open(args.responses) as f:
+            responses.update(json.load(f))
+    for field in asdict(config):
+        setattr(config, field, getattr(args, field))
+    global rng
+    rng = random.Random(config.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
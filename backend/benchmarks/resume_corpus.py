@@ -0,0 +1,165 @@
+"""
+Synthetic resume corpus with known ground-truth text.
+
+Resumes are generated from a fixed seed and written as PDFs (by a minimal
+PDF writer using the built-in Helvetica font, so no extra dependencies) and
+as DOCX files. Each document comes with the exact text that was laid out, so
+extraction output can be scored for fidelity. Some PDFs use a two-column
+layout where the expected reading order is the whole left column first.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import random
+from docx import Document
+from benchmarks.bench_match_scoring import SKILLS, FILLER
+
+FIRST_NAMES = ["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Drew"]
+LAST_NAMES = ["Nguyen", "Garcia", "Smith", "Okafor", "Kowalski", "Patel", "Silva", "Johansson", "Kim", "Haddad"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech", "Vandelay"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Engineer", "Backend Developer", "Platform Engineer"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "Polytechnic University"]
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 54
+FONT_SIZE = 10
+LINE_HEIGHT = 13
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+
+@dataclass
+class SampleDocument:
+    path: Path
+    expected_text: str
+    pages: int
+    layout: str
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    picked = [rng.choice(FILLER) if rng.random() < 0.75 else rng.choice(SKILLS) for _ in range(words)]
+    return " ".join(picked).capitalize()
+
+
+def make_resume_lines(rng: random.Random, jobs: int) -> list[str]:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.split()[0].lower()}@example.com | (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        _sentence(rng, 14),
+        _sentence(rng, 12),
+        "",
+        "Experience",
+    ]
+    year = 2024
+    for _ in range(jobs):
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({year - 2} - {year})")
+        lines.extend(f"- {_sentence(rng, rng.randint(8, 14))}" for _ in range(rng.randint(3, 5)))
+        lines.append("")
+        year -= 2
+    lines.extend([
+        "Skills",
+        ", ".join(rng.sample(SKILLS, 12)),
+        "",
+        "Education",
+        f"B.S. Computer Science, {rng.choice(SCHOOLS)} ({year})",
+    ])
+    return lines
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _content_stream(columns: list[list[str]]) -> bytes:
+    # Draw row by row across columns, like many layout tools do, so an engine
+    # that follows drawing order interleaves the columns
+    column_width = (PAGE_WIDTH - 2 * MARGIN) // len(columns)
+    commands = []
+    for row in range(max(len(lines) for lines in columns)):
+        for index, lines in enumerate(columns):
+            if row < len(lines) and lines[row]:
+                x = MARGIN + index * column_width
+                y = PAGE_HEIGHT - MARGIN - row * LINE_HEIGHT
+                commands.append(f"BT /F1 {FONT_SIZE} Tf {x} {y} Td ({_escape(lines[row])}) Tj ET")
+    return "\n".join(commands).encode("latin-1")
+
+
+def write_pdf(path: Path, pages: list[list[list[str]]]) -> None:
+    """
+    Write a PDF where each page is a list of columns and each column a list of lines
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for columns in pages:
+        stream = _content_stream(columns)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, len(objects))
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    path.write_bytes(bytes(output))
+
+
+def _paginate(lines: list[str], columns: int, width_chars: int) -> list[list[list[str]]]:
+    # Wrap long lines to the column width so nothing runs off the page
+    wrapped = []
+    for line in lines:
+        while len(line) > width_chars:
+            cut = line.rfind(" ", 0, width_chars)
+            cut = cut if cut > 0 else width_chars
+            wrapped.append(line[:cut])
+            line = line[cut:].lstrip()
+        wrapped.append(line)
+    per_page = LINES_PER_PAGE * columns
+    pages = []
+    for start in range(0, len(wrapped), per_page):
+        chunk = wrapped[start:start + per_page]
+        pages.append([chunk[i * LINES_PER_PAGE:(i + 1) * LINES_PER_PAGE] for i in range(columns)])
+    return pages
+
+
+def write_docx(path: Path, lines: list[str]) -> None:
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def build_corpus(directory: Path, count: int = 20, seed: int = 7, docx: bool = False) -> list[SampleDocument]:
+    """
+    Write ``count`` resumes to ``directory``, from one to several pages long,
+    every fourth one in two columns. With ``docx`` a DOCX copy of each is written too.
+    """
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    corpus = []
+    for index in range(count):
+        lines = make_resume_lines(rng, jobs=rng.choice([2, 3, 4, 8, 16, 30]))
+        layout = "two_column" if index % 4 == 3 else "single_column"
+        columns = 2 if layout == "two_column" else 1
+        pages = _paginate(lines, columns, width_chars=95 // columns)
+        expected_text = "\n".join(line for page in pages for column in page for line in column)
+
+        path = directory / f"resume_{index:03d}.pdf"
+        write_pdf(path, pages)
+        corpus.append(SampleDocument(path, expected_text, len(pages), layout))
+        if docx:
+            docx_path = directory / f"resume_{index:03d}.docx"
+            write_docx(docx_path, lines)
+            corpus.append(SampleDocument(docx_path, "\n".join(lines), 1, "docx"))
+    return corpus
@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+# The app reads its settings at import time
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("ANALYSIS_WORKER_MODE", "external")
+
+import itertools
+import pytest
+from fastapi.testclient import TestClient
+
+_user_numbers = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.db.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(engine)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def user(client) -> dict:
+    """
+    A freshly registered user: its ``id`` and the ``headers`` that authenticate as it
+    """
+    email = f"user{next(_user_numbers)}@example.com"
+    password = "correct horse battery"
+    client.post("/api/auth/register", json={"email": email, "full_name": "Test User", "password": password})
+    login = client.post("/api/auth/login", json={"email": email, "password": password}).json()
+    return {"id": login["user"]["id"], "headers": {"Authorization": f"Bearer {login['access_token']}"}}
+
+
+@pytest.fixture
+def resume(user) -> int:
+    """
+    Id of an uploaded and extracted resume belonging to ``user``
+    """
+    from app.db.database import SessionLocal
+    from app.models.resume_analysis import ResumeAnalysis
+
+    db = SessionLocal()
+    try:
+        resume = ResumeAnalysis(
+            user_id=user["id"],
+            filename="resume.pdf",
+            file_path="uploads/resume.pdf",
+            resume_text="Jane Doe\njane@example.com\n\nEXPERIENCE\nAcme\n- Built APIs in Python\n\nSKILLS\nPython, SQL\n",
+        )
+        db.add(resume)
+        db.commit()
+        return resume.id
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def resume_docx(tmp_path) -> str:
+    """
+    Path of a small .docx resume
+    """
+    import docx
+
+    document = docx.Document()
+    for line in ("Jane Doe", "EXPERIENCE", "Backend engineer at Acme", "SKILLS", "Python, SQL"):
+        document.add_paragraph(line)
+    path = tmp_path / "resume.docx"
+    document.save(path)
+    return str(path)
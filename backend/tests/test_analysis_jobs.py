@@ -0,0 +1,203 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app.db.database import SessionLocal
+from app.models.analysis_job import AnalysisJob
+from app.models.resume_analysis import ResumeAnalysis
+from app.services import analysis_jobs
+from app.services.analysis_jobs import (
+    ANALYSIS_JOB_MAX_ATTEMPTS, ANALYSIS_JOB_STALE_SECONDS, JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, JOB_RUNNING,
+    _fail_job, _load_resume_text, claim_next_job, enqueue_resume_analysis, requeue_stale_jobs, retry_delay,
+    run_resume_analysis_job
+)
+from app.services.extraction import ExtractionError
+from app.services.llm_scheduler import LLMRateLimited
+
+
+@pytest.fixture
+def job(user, resume) -> int:
+    """
+    Id of a queued analysis job for ``resume``, the only claimable job
+    """
+    db = SessionLocal()
+    try:
+        db.execute(update(AnalysisJob).where(AnalysisJob.status.in_((JOB_QUEUED, JOB_RUNNING))).values(status=JOB_FAILED))
+        db.commit()
+        return enqueue_resume_analysis(db, user["id"], resume).id
+    finally:
+        db.close()
+
+
+def load(job_id: int) -> AnalysisJob:
+    db = SessionLocal()
+    try:
+        job = db.get(AnalysisJob, job_id)
+        db.expunge(job)
+        return job
+    finally:
+        db.close()
+
+
+def make_due(job_id: int) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(update(AnalysisJob).where(AnalysisJob.id == job_id).values(run_after=None))
+        db.commit()
+    finally:
+        db.close()
+
+
+def seconds_until(moment: datetime) -> float:
+    # SQLite hands back the stored UTC time without its zone
+    return (moment.replace(tzinfo=None) - datetime.utcnow()).total_seconds()
+
+
+def test_claim_takes_the_oldest_job_once(job, user, resume):
+    db = SessionLocal()
+    try:
+        newer = enqueue_resume_analysis(db, user["id"], resume).id
+    finally:
+        db.close()
+
+    assert claim_next_job() == job
+    claimed = load(job)
+    assert claimed.status == JOB_RUNNING
+    assert claimed.attempts == 1
+    assert claimed.started_at is not None
+
+    assert claim_next_job() == newer
+    assert claim_next_job() is None
+
+
+def test_stale_running_jobs_are_requeued(job):
+    assert claim_next_job() == job
+    assert requeue_stale_jobs() == 0
+
+    db = SessionLocal()
+    try:
+        started_at = datetime.utcnow() - timedelta(seconds=ANALYSIS_JOB_STALE_SECONDS + 60)
+        db.execute(update(AnalysisJob).where(AnalysisJob.id == job).values(started_at=started_at))
+        db.commit()
+    finally:
+        db.close()
+
+    assert requeue_stale_jobs() == 1
+    assert load(job).status == JOB_QUEUED
+    assert claim_next_job() == job
+    assert load(job).attempts == 2
+
+
+def test_analysed_job_is_completed(job, monkeypatch):
+    async def analyze(resume_text, force_refresh=False):
+        return {"overall_score": 75, "analysis_text": "Solid", "suggestions": ["Add metrics"]}
+
+    monkeypatch.setattr(analysis_jobs, "analyze_resume_with_ai_async", analyze)
+    assert claim_next_job() == job
+    asyncio.run(run_resume_analysis_job(job))
+
+    completed = load(job)
+    assert completed.status == JOB_COMPLETED
+    assert completed.finished_at is not None
+    db = SessionLocal()
+    try:
+        assert db.get(ResumeAnalysis, completed.resume_id).overall_score == 75
+    finally:
+        db.close()
+
+
+def test_unreadable_resume_fails_without_retry(job, monkeypatch):
+    def unreadable(job_id):
+        raise ExtractionError("resume.pdf has 40 pages, the limit is 30")
+
+    monkeypatch.setattr(analysis_jobs, "_load_resume_text", unreadable)
+    assert claim_next_job() == job
+    asyncio.run(run_resume_analysis_job(job))
+
+    failed = load(job)
+    assert failed.status == JOB_FAILED
+    assert failed.attempts == 1
+    assert "40 pages" in failed.error
+
+
+def test_retry_delay_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(analysis_jobs, "ANALYSIS_JOB_RETRY_BASE_SECONDS", 10)
+    monkeypatch.setattr(analysis_jobs, "ANALYSIS_JOB_RETRY_MAX_SECONDS", 30)
+
+    assert [retry_delay(attempts) for attempts in (1, 2, 3, 4)] == [10, 20, 30, 30]
+    assert retry_delay(1, retry_after=45) == 45
+
+
+def test_failed_job_is_not_claimed_before_its_backoff(job):
+    assert claim_next_job() == job
+    _fail_job(job, "timed out")
+
+    failed = load(job)
+    assert failed.status == JOB_QUEUED
+    assert seconds_until(failed.run_after) > 0
+    assert claim_next_job() is None
+
+    make_due(job)
+    assert claim_next_job() == job
+
+
+def test_rate_limited_job_waits_at_least_retry_after(job, monkeypatch):
+    async def rate_limited(resume_text, force_refresh=False):
+        raise LLMRateLimited(300, "per-user limit")
+
+    monkeypatch.setattr(analysis_jobs, "analyze_resume_with_ai_async", rate_limited)
+    assert claim_next_job() == job
+    asyncio.run(run_resume_analysis_job(job))
+
+    postponed = load(job)
+    assert postponed.status == JOB_QUEUED
+    assert postponed.attempts == 1
+    assert seconds_until(postponed.run_after) > 290
+
+
+def test_job_fails_once_its_attempts_are_used(job):
+    for _ in range(ANALYSIS_JOB_MAX_ATTEMPTS):
+        assert claim_next_job() == job
+        _fail_job(job, "timed out")
+        make_due(job)
+
+    failed = load(job)
+    assert failed.status == JOB_FAILED
+    assert failed.attempts == ANALYSIS_JOB_MAX_ATTEMPTS
+    assert failed.finished_at is not None
+
+
+def test_extracted_text_is_saved_when_sections_exist(user, resume_docx):
+    db = SessionLocal()
+    try:
+        resume = ResumeAnalysis(user_id=user["id"], filename="resume.docx", file_path=resume_docx, resume_sections={"skills": "Python, SQL"})
+        db.add(resume)
+        db.commit()
+        job_id = enqueue_resume_analysis(db, user["id"], resume.id).id
+        resume_id = resume.id
+    finally:
+        db.close()
+
+    _load_resume_text(job_id)
+
+    db = SessionLocal()
+    try:
+        saved = db.get(ResumeAnalysis, resume_id)
+        assert "Python, SQL" in saved.resume_text
+        assert saved.document_structure is not None
+    finally:
+        db.close()
+
+
+def test_analysis_gets_the_raw_extraction(job):
+    db = SessionLocal()
+    try:
+        resume = db.get(ResumeAnalysis, load(job).resume_id)
+        raw_text = resume.resume_text
+    finally:
+        db.close()
+
+    resume_text, _, _ = _load_resume_text(job)
+
+    # The formatting being graded, not a rendering of the parsed sections
+    assert resume_text == raw_text
@@ -0,0 +1,28 @@
+def create_application(client, user, status_value, application_date="2026-01-15"):
+    response = client.post("/api/applications", headers=user["headers"], json={
+        "company_name": "Acme",
+        "job_title": "Engineer",
+        "status": status_value,
+        "application_date": application_date,
+    })
+    assert response.status_code == 201
+
+
+def test_free_form_statuses_do_not_overwrite_standard_keys(client, user):
+    for status_value in ("Applied", "applied", "total", "Interview", "Ghosted"):
+        create_application(client, user, status_value)
+
+    analytics = client.get(f"/api/applications/analytics/{user['id']}", headers=user["headers"]).json()
+
+    assert analytics["total"] == 5
+    assert analytics["applied"] == {"count": 1, "percentage": 20.0}
+    assert analytics["interview"]["count"] == 1
+    assert analytics["offer"]["count"] == 0
+    assert set(analytics["other_statuses"]) == {"applied", "total", "Ghosted"}
+    assert analytics["other_statuses"]["total"]["count"] == 1
+
+
+def test_analytics_for_another_user_is_forbidden(client, user):
+    response = client.get(f"/api/applications/analytics/{user['id'] + 1000}", headers=user["headers"])
+
+    assert response.status_code == 403
@@ -0,0 +1,13 @@
+def test_fast_check_is_saved(client, user, resume):
+    response = client.post("/api/ats-check/check", headers=user["headers"], json={"resume_id": resume})
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["resume_id"] == resume
+    assert 0 <= body["ats_score"] <= 100
+
+
+def test_another_users_resume_is_not_found(client, user, resume):
+    other = client.post("/api/ats-check/check", headers=user["headers"], json={"resume_id": resume + 1000})
+
+    assert other.status_code == 404
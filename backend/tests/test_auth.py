@@ -0,0 +1,12 @@
+def test_me_is_the_token_owner(client, user):
+    response = client.get("/api/auth/me", headers=user["headers"])
+
+    assert response.status_code == 200
+    assert response.json()["id"] == user["id"]
+
+
+def test_users_cannot_be_looked_up_by_email(client, user):
+    email = client.get("/api/auth/me", headers=user["headers"]).json()["email"]
+
+    assert client.get("/api/auth/user", params={"email": email}).status_code in (404, 405)
+    assert client.get("/api/auth/me").status_code == 401
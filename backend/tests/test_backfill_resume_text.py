@@ -0,0 +1,34 @@
+from sqlalchemy import JSON, update
+from app.db.database import SessionLocal
+from app.models.resume_analysis import ResumeAnalysis
+from app.scripts.backfill_resume_text import backfill_resume_text
+
+
+def test_rows_holding_json_null_are_backfilled(client, user, resume_docx):
+    db = SessionLocal()
+    try:
+        resume = ResumeAnalysis(
+            user_id=user["id"], filename="resume.docx", file_path=resume_docx,
+            resume_text="Jane Doe", content_hash="0" * 64
+        )
+        db.add(resume)
+        db.commit()
+        # How the columns stored None before none_as_null
+        db.execute(update(ResumeAnalysis.__table__).where(ResumeAnalysis.id == resume.id).values(
+            document_structure=JSON.NULL, resume_sections=JSON.NULL
+        ))
+        db.commit()
+        resume_id = resume.id
+    finally:
+        db.close()
+
+    result = backfill_resume_text()
+
+    assert resume_id not in [failure["id"] for failure in result["failed"]]
+    db = SessionLocal()
+    try:
+        resume = db.get(ResumeAnalysis, resume_id)
+        assert isinstance(resume.document_structure, dict)
+        assert "Jane Doe" in str(resume.resume_sections)
+    finally:
+        db.close()
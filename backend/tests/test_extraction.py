@@ -0,0 +1,138 @@
+import os
+import shutil
+import threading
+import time
+import pytest
+from app.services import extraction
+from app.services.extraction import ExtractionError, extract_document
+from app.utils.file_parser import extract_text
+
+
+def stalling_extract_text(file_path: str, filename: str) -> str:
+    """
+    Runs in an extraction worker: hung.docx never finishes, any other
+    document stalls the first time it is extracted only
+    """
+    marker = f"{file_path}.started"
+    if filename == "hung.docx" or not os.path.exists(marker):
+        open(marker, "w").close()
+        time.sleep(60)
+    return extract_text(file_path, filename)
+
+
+@pytest.fixture
+def extraction_pool(monkeypatch):
+    monkeypatch.setattr(extraction, "EXTRACTION_WORKERS", 2)
+    extraction.shutdown_extraction_pool()
+    yield
+    extraction.shutdown_extraction_pool()
+
+
+def copy_as(path: str, filename: str) -> str:
+    copy = os.path.join(os.path.dirname(path), filename)
+    shutil.copy(path, copy)
+    return copy
+
+
+def wait_for(path: str) -> None:
+    deadline = time.monotonic() + 30
+    while not os.path.exists(path):
+        assert time.monotonic() < deadline, f"{path} never appeared"
+        time.sleep(0.05)
+
+
+def test_timeout_retries_other_extractions_once(resume_docx, extraction_pool, monkeypatch):
+    monkeypatch.setattr(extraction, "extract_text", stalling_extract_text)
+    hung, innocent = copy_as(resume_docx, "hung.docx"), copy_as(resume_docx, "innocent.docx")
+    results = {}
+
+    def extract(path: str, filename: str):
+        try:
+            results[filename] = extract_document(path, filename)
+        except ExtractionError as e:
+            results[filename] = e
+
+    # Start the workers up front so the timeout only covers extraction
+    pool = extraction.get_extraction_pool()
+    for future in [pool.submit(os.getpid) for _ in range(2)]:
+        future.result()
+    monkeypatch.setattr(extraction, "EXTRACTION_TIMEOUT_SECONDS", 2)
+
+    threads = [threading.Thread(target=extract, args=(hung, "hung.docx"))]
+    threads[0].start()
+    wait_for(f"{hung}.started")
+    # Both workers busy: the hung one times out first and takes the other down with it
+    threads.append(threading.Thread(target=extract, args=(innocent, "innocent.docx")))
+    threads[1].start()
+    for thread in threads:
+        thread.join()
+
+    assert isinstance(results["hung.docx"], ExtractionError)
+    assert "took longer" in str(results["hung.docx"])
+    text, structure = results["innocent.docx"]
+    assert "Backend engineer at Acme" in text
+
+
+@pytest.fixture
+def ten_page_pdf(tmp_path) -> str:
+    import pymupdf
+    path = str(tmp_path / "long.pdf")
+    with pymupdf.open() as document:
+        for number in range(1, 11):
+            document.new_page().insert_text((72, 72), f"Page {number} of the resume")
+        document.save(path)
+    return path
+
+
+@pytest.mark.parametrize("backend, tasks", [("pypdf2", 1), ("pymupdf", 3)])
+def test_pdf_is_split_only_for_cheap_page_ranges(ten_page_pdf, extraction_pool, monkeypatch, backend, tasks):
+    # Workers read the backend from the environment when they start
+    monkeypatch.setenv("PDF_EXTRACTION_BACKEND", backend)
+    monkeypatch.setattr("app.utils.pdf_backends.PDF_EXTRACTION_BACKEND", backend)
+    submitted = []
+    submit = extraction._submit
+
+    def recording_submit(pool, filename, function, *args):
+        submitted.append(function)
+        return submit(pool, filename, function, *args)
+
+    monkeypatch.setattr(extraction, "_submit", recording_submit)
+
+    text, structure = extract_document(ten_page_pdf, "long.pdf")
+
+    assert structure["page_count"] == 10
+    assert submitted.count(extraction.extract_text_from_pdf) == tasks
+    positions = [text.index(f"Page {number} of") for number in range(1, 11)]
+    assert positions == sorted(positions)
+
+
+def test_timed_out_pool_is_replaced(resume_docx, extraction_pool, monkeypatch):
+    monkeypatch.setattr(extraction, "extract_text", stalling_extract_text)
+    monkeypatch.setattr(extraction, "EXTRACTION_TIMEOUT_SECONDS", 1)
+    hung = copy_as(resume_docx, "hung.docx")
+    pool = extraction.get_extraction_pool()
+    pool.submit(os.getpid).result()
+
+    with pytest.raises(ExtractionError, match="took longer than 1 seconds"):
+        extract_document(hung, "hung.docx")
+
+    assert extraction.get_extraction_pool() is not pool
+    monkeypatch.setattr(extraction, "extract_text", extract_text)
+    monkeypatch.setattr(extraction, "EXTRACTION_TIMEOUT_SECONDS", 30)
+    text, _ = extract_document(resume_docx, "resume.docx")
+    assert "Backend engineer at Acme" in text
+
+
+def test_oversized_file_is_refused_before_parsing(resume_docx, monkeypatch):
+    monkeypatch.setattr(extraction, "EXTRACTION_MAX_BYTES", 10)
+    monkeypatch.setattr(extraction, "get_extraction_pool", lambda: pytest.fail("the pool was used"))
+
+    with pytest.raises(ExtractionError, match="larger than"):
+        extract_document(resume_docx, "resume.docx")
+
+
+def test_pdf_over_the_page_limit_is_refused(ten_page_pdf, extraction_pool, monkeypatch):
+    monkeypatch.setattr(extraction, "EXTRACTION_MAX_PAGES", 5)
+
+    with pytest.raises(ExtractionError, match="has 10 pages, the limit is 5"):
+        extract_document(ten_page_pdf, "long.pdf")
@@ -0,0 +1,154 @@
+"""
+LLM resilience end to end: openai_service and the API against
+benchmarks.fake_openai_server with injected faults.
+"""
+import asyncio
+import itertools
+import time
+import httpx
+from openai import AsyncOpenAI
+import pytest
+from benchmarks import fake_openai_server
+from benchmarks.bench_llm_resilience import free_port, start_fake_server
+from app.services import llm_resilience, openai_service
+from app.services.llm_resilience import CircuitBreaker, LLMResponseError
+
+_job_numbers = itertools.count()
+
+
+@pytest.fixture(scope="module")
+def fake_server_url():
+    port = free_port()
+    server, thread = start_fake_server(port)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.fixture
+def fake_server(fake_server_url, monkeypatch):
+    """
+    Control client for the fake server, reset to fast healthy responses.
+    openai_service is pointed at the server with a breaker that won't open.
+    """
+    control = httpx.Client(base_url=fake_server_url)
+    control.post("/_config", json={
+        "latency_ms": 10, "jitter_ms": 0, "slow_rate": 0, "error_rate": 0,
+        "rate_limit_rate": 0, "malformed_rate": 0, "seed": 0
+    })
+    control.post("/_responses", json={})
+    fake_openai_server.stats.clear()
+
+    monkeypatch.setattr(openai_service, "get_async_openai_client", lambda: AsyncOpenAI(
+        base_url=f"{fake_server_url}/v1", api_key="test-key", max_retries=0
+    ))
+    monkeypatch.setattr(llm_resilience, "breaker", CircuitBreaker(failure_threshold=100, reset_seconds=30))
+    monkeypatch.setattr(llm_resilience, "LLM_RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(llm_resilience, "LLM_HEDGE_PERCENTILE", 0)
+    yield control
+    control.close()
+
+
+def job_description() -> str:
+    """
+    A job description no earlier call has cached
+    """
+    return f"Backend engineer #{next(_job_numbers)}: Python, SQL and AWS."
+
+
+def match(resume_text: str = "Python developer") -> dict:
+    return asyncio.run(openai_service.analyze_job_match_with_ai_async(resume_text, job_description()))
+
+
+@pytest.mark.parametrize("fault, counter", [("error_rate", "errors"), ("rate_limit_rate", "rate_limited")])
+def test_transient_errors_are_retried(fake_server, fault, counter):
+    fake_server.post("/_config", json={fault: 1})
+
+    with pytest.raises(LLMResponseError):
+        match()
+
+    stats = fake_server.get("/_stats").json()
+    assert stats["requests"] == llm_resilience.LLM_MAX_ATTEMPTS
+    assert stats[counter] == llm_resilience.LLM_MAX_ATTEMPTS
+
+
+def test_unparseable_output_is_retried_and_not_cached(fake_server):
+    fake_server.post("/_responses", json={"job_match": "Sorry, I can't help with that."})
+    description = job_description()
+
+    with pytest.raises(LLMResponseError):
+        asyncio.run(openai_service.analyze_job_match_with_ai_async("Python developer", description))
+    assert fake_server.get("/_stats").json()["requests_job_match"] == llm_resilience.LLM_MAX_ATTEMPTS
+
+    fake_server.post("/_responses", json={})
+    result = asyncio.run(openai_service.analyze_job_match_with_ai_async("Python developer", description))
+    assert result["match_percentage"] == 72
+
+
+def test_output_with_a_missing_field_is_retried(fake_server):
+    fake_server.post("/_responses", json={"job_match": {"match_percentage": 80}})
+
+    with pytest.raises(LLMResponseError):
+        match()
+    assert fake_server.get("/_stats").json()["requests_job_match"] == llm_resilience.LLM_MAX_ATTEMPTS
+
+
+def test_deadline_is_a_504(client, user, resume, fake_server, monkeypatch):
+    monkeypatch.setitem(llm_resilience.LLM_DEADLINES, "analyze_job_match", 0.3)
+    fake_server.post("/_config", json={"latency_ms": 1000})
+
+    start = time.monotonic()
+    response = client.post("/api/job-match/analyze", headers=user["headers"],
+                           json={"resume_id": resume, "job_description": job_description()})
+
+    assert response.status_code == 504
+    assert time.monotonic() - start < 1
+
+
+def test_breaker_opens_probes_and_closes(client, user, resume, fake_server, monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.2)
+    monkeypatch.setattr(llm_resilience, "breaker", breaker)
+    fake_server.post("/_config", json={"error_rate": 1})
+
+    def analyze():
+        return client.post("/api/job-match/analyze", headers=user["headers"],
+                           json={"resume_id": resume, "job_description": job_description()})
+
+    # The first failure opens the breaker, the retry fails fast without calling upstream
+    assert analyze().status_code == 503
+    assert breaker.state == "open"
+    assert fake_server.get("/_stats").json()["requests"] == 1
+    assert analyze().status_code == 503
+    assert fake_server.get("/_stats").json()["requests"] == 1
+
+    # A failed probe re-opens it
+    time.sleep(0.25)
+    assert breaker.state == "half_open"
+    assert analyze().status_code == 503
+    assert fake_server.get("/_stats").json()["requests"] == 2
+    assert breaker.state == "open"
+
+    # A successful probe closes it
+    fake_server.post("/_config", json={"error_rate": 0})
+    time.sleep(0.25)
+    assert analyze().status_code == 201
+    assert breaker.state == "closed"
+
+
+def test_cancelled_probe_does_not_wedge_the_breaker(fake_server, monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    monkeypatch.setattr(llm_resilience, "breaker", breaker)
+    breaker.record_failure()
+    fake_server.post("/_config", json={"latency_ms": 2000})
+
+    async def scenario():
+        probe = asyncio.ensure_future(openai_service.analyze_job_match_with_ai_async("Python developer", job_description()))
+        await asyncio.sleep(0.2)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        fake_server.post("/_config", json={"latency_ms": 10})
+        return await openai_service.analyze_job_match_with_ai_async("Python developer", job_description())
+
+    assert asyncio.run(scenario())["match_percentage"] == 72
+    assert breaker.state == "closed"
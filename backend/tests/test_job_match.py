@@ -0,0 +1,35 @@
+import asyncio
+from starlette.requests import Request
+from app.api import job_match
+from app.db.database import SessionLocal
+from app.models.job_match import JobMatch
+
+MATCH = {"match_percentage": 80, "matching_skills": ["Python"], "missing_skills": [], "suggestions": []}
+
+
+def saved_matches(resume_id: int) -> list[str]:
+    db = SessionLocal()
+    try:
+        return [match.job_description for match in db.query(JobMatch).filter(JobMatch.resume_id == resume_id)]
+    finally:
+        db.close()
+
+
+def test_batch_results_finished_before_a_disconnect_are_saved(client, user, resume, monkeypatch):
+    async def analyze(resume_text: str, job_description: str, force_refresh: bool = False) -> dict:
+        if job_description == "slow":
+            await asyncio.sleep(60)
+        return MATCH
+
+    async def disconnected(self) -> bool:
+        return True
+
+    monkeypatch.setattr(job_match, "analyze_job_match_with_ai_async", analyze)
+    monkeypatch.setattr(Request, "is_disconnected", disconnected)
+
+    response = client.post("/api/job-match/analyze-batch", headers=user["headers"],
+                           json={"resume_id": resume, "job_descriptions": ["fast", "slow"]})
+
+    assert response.status_code == 200
+    assert "event: done" not in response.text
+    assert saved_matches(resume) == ["fast"]
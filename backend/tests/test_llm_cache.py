@@ -0,0 +1,79 @@
+import asyncio
+import time
+import pytest
+from sqlalchemy import create_engine
+from app.models.llm_cache_entry import llm_cache_entries
+from app.services import llm_cache as llm_cache_module
+from app.services.llm_cache import LLMCache, cached_llm_call, make_cache_key
+
+
+@pytest.fixture
+def shared_url(tmp_path) -> str:
+    url = f"sqlite:///{tmp_path}/llm_cache.db"
+    # What the migration creates
+    llm_cache_entries.create(create_engine(url))
+    return url
+
+
+@pytest.fixture
+def cache(monkeypatch) -> LLMCache:
+    cache = LLMCache(max_entries=16, ttl_seconds=60)
+    monkeypatch.setattr(llm_cache_module, "llm_cache", cache)
+    return cache
+
+
+def test_key_ignores_whitespace_and_argument_order():
+    key = make_cache_key("analyze_job_match", "gpt-4o-mini", {"resume": "Python  developer\n", "job": "SQL"}, 1)
+
+    assert key == make_cache_key("analyze_job_match", "gpt-4o-mini", {"job": "SQL", "resume": "Python developer"}, 1)
+    assert key != make_cache_key("analyze_job_match", "gpt-4o-mini", {"resume": "Python developer", "job": "SQL"}, 2)
+    assert key != make_cache_key("analyze_job_match", "gpt-4o", {"resume": "Python developer", "job": "SQL"}, 1)
+    assert key != make_cache_key("analyze_resume", "gpt-4o-mini", {"resume": "Python developer", "job": "SQL"}, 1)
+
+
+def test_entries_expire_in_both_tiers(shared_url):
+    cache = LLMCache(max_entries=16, ttl_seconds=0.2, shared_url=shared_url)
+    cache.set("key", "analyze_resume", {"score": 80})
+
+    cache.memory.clear()
+    assert cache.get("key") == {"score": 80}
+    assert cache.stats()["shared_hits"] == 1
+
+    time.sleep(0.3)
+    assert cache.get("key") is None
+    cache.memory.clear()
+    assert cache.get("key") is None
+
+
+def test_force_refresh_skips_the_lookup_and_overwrites(cache):
+    calls = []
+
+    @cached_llm_call("analyze_resume", "gpt-4o-mini", prompt_version=1)
+    async def analyze(resume_text: str) -> dict:
+        calls.append(resume_text)
+        return {"call": len(calls)}
+
+    assert asyncio.run(analyze("resume")) == {"call": 1}
+    assert asyncio.run(analyze("resume")) == {"call": 1}
+    assert asyncio.run(analyze("resume", force_refresh=True)) == {"call": 2}
+    assert asyncio.run(analyze("resume")) == {"call": 2}
+    assert cache.stats()["bypassed"] == 1
+
+
+def test_invalid_output_is_never_cached(cache):
+    outputs = [ValueError("missing field"), {"score": 80}]
+
+    @cached_llm_call("analyze_resume", "gpt-4o-mini", prompt_version=1)
+    async def analyze(resume_text: str) -> dict:
+        output = outputs.pop(0)
+        if isinstance(output, Exception):
+            raise output
+        return output
+
+    with pytest.raises(ValueError):
+        asyncio.run(analyze("resume"))
+    assert cache.stats()["stores"] == 0
+
+    assert asyncio.run(analyze("resume")) == {"score": 80}
+    assert asyncio.run(analyze("resume")) == {"score": 80}
+    assert cache.stats()["stores"] == 1
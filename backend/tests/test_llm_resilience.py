@@ -0,0 +1,82 @@
+import asyncio
+import httpx
+import openai
+import pytest
+from app.services import llm_resilience
+from app.services.llm_resilience import CircuitBreaker, LLMResponseError, LLMUnavailableError, resilient_call_async
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    monkeypatch.setattr(llm_resilience, "breaker", breaker)
+    return breaker
+
+
+def test_cancelled_probe_lets_the_next_call_probe(breaker):
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+
+    async def hang(timeout):
+        await asyncio.sleep(timeout)
+
+    async def ok(timeout):
+        return "ok"
+
+    async def scenario():
+        probe = asyncio.ensure_future(resilient_call_async("analyze_job_match", hang))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return await resilient_call_async("analyze_job_match", ok)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_only_one_probe_while_half_open(breaker):
+    breaker.record_failure()
+
+    assert breaker.before_call() is True
+    with pytest.raises(LLMUnavailableError):
+        breaker.before_call()
+    breaker.release_probe()
+    assert breaker.before_call() is True
+
+
+def test_cancelled_caller_cancels_the_hedged_request(breaker, monkeypatch):
+    monkeypatch.setattr(llm_resilience, "LLM_HEDGE_PERCENTILE", 90)
+    monkeypatch.setattr(llm_resilience.latencies, "percentile", lambda *args: 5.0)
+    cancelled = []
+
+    async def hang(timeout):
+        try:
+            await asyncio.sleep(timeout)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def scenario():
+        # Cancelled while waiting to decide whether to hedge
+        caller = asyncio.ensure_future(resilient_call_async("analyze_job_match", hang))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0.05)
+        # Checked before asyncio.run cancels whatever is left over
+        return list(cancelled)
+
+    assert asyncio.run(scenario()) == [True]
+
+
+def test_rejected_request_is_an_llm_error(breaker):
+    async def unauthorized(timeout):
+        response = httpx.Response(401, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+        raise openai.AuthenticationError("Incorrect API key provided", response=response, body=None)
+
+    with pytest.raises(LLMResponseError):
+        asyncio.run(resilient_call_async("analyze_job_match", unauthorized))
+    # The provider answered, it isn't counted as an outage
+    assert breaker.state == "closed"
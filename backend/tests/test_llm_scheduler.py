@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from app.services import llm_scheduler as scheduler_module
+from app.services.llm_scheduler import (
+    PRIORITY_BACKGROUND, PRIORITY_BATCH, PRIORITY_INTERACTIVE, LLMRateLimited, LLMScheduler, set_llm_caller
+)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    """
+    A scheduler with 10 requests/s globally and 1 request/min per user
+    """
+    monkeypatch.setattr(scheduler_module, "LLM_GLOBAL_REQUESTS_PER_MINUTE", 600)
+    monkeypatch.setattr(scheduler_module, "LLM_USER_REQUESTS_PER_MINUTE", 1)
+    return LLMScheduler()
+
+
+async def acquire(scheduler: LLMScheduler, user_id, priority: int = PRIORITY_INTERACTIVE):
+    set_llm_caller(user_id, priority)
+    return await scheduler.acquire("analyze_job_match", 100)
+
+
+def test_queued_calls_are_admitted_by_priority(scheduler):
+    admitted = []
+
+    async def call(priority: int):
+        await acquire(scheduler, None, priority)
+        admitted.append(priority)
+
+    async def scenario():
+        scheduler.requests.level = 0
+        tasks = []
+        for priority in (PRIORITY_BACKGROUND, PRIORITY_BATCH, PRIORITY_INTERACTIVE):
+            tasks.append(asyncio.ensure_future(call(priority)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert admitted == [PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_BACKGROUND]
+
+
+def test_interactive_call_over_user_quota_is_rejected(scheduler):
+    async def scenario():
+        await acquire(scheduler, 1)
+        with pytest.raises(LLMRateLimited):
+            await acquire(scheduler, 1)
+        # Other users are unaffected
+        await acquire(scheduler, 2)
+
+    asyncio.run(scenario())
+    assert scheduler.stats()["rejected_user"] == 1
+
+
+def test_batch_call_over_user_quota_waits(scheduler, monkeypatch):
+    # Far less than the minute until the user's next request
+    monkeypatch.setitem(scheduler_module.LLM_MAX_WAIT_SECONDS, PRIORITY_BATCH, 1)
+
+    async def scenario():
+        await acquire(scheduler, 1, PRIORITY_BATCH)
+        waiting = asyncio.ensure_future(acquire(scheduler, 1, PRIORITY_BATCH))
+        await asyncio.sleep(0.1)
+        assert not waiting.done()
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    asyncio.run(scenario())
+    assert scheduler.stats()["rejected_user"] == 0
+    # The cancelled call's quota was handed back
+    assert scheduler._user(1)[0].level == pytest.approx(0, abs=0.1)
+
+
+def test_admitted_then_cancelled_call_refunds_global_capacity(scheduler, monkeypatch):
+    async def cancelled_after_admission(future, timeout):
+        # What wait_for does when the cancellation arrives just after _pump admitted the call
+        await future
+        raise asyncio.CancelledError
+
+    async def scenario():
+        scheduler.requests.level = 0
+        monkeypatch.setattr(asyncio, "wait_for", cancelled_after_admission)
+        with pytest.raises(asyncio.CancelledError):
+            await acquire(scheduler, None)
+
+    asyncio.run(scenario())
+    # One request refilled while queued, then taken by _pump and given back
+    assert scheduler.requests.level == pytest.approx(1, abs=0.2)
+
+
+def test_settle_charges_actual_usage(scheduler):
+    async def scenario():
+        return await acquire(scheduler, 1)
+
+    reservation = asyncio.run(scenario())
+    user_tokens = scheduler._user(1)[1]
+    reserved_level = user_tokens.level
+
+    scheduler.settle(reservation, [reservation.tokens - 300])
+    assert user_tokens.level == pytest.approx(reserved_level + 300, abs=50)
+
+    # A call that never got a response is refunded completely
+    scheduler.settle(reservation, [])
+    assert user_tokens.level == pytest.approx(user_tokens.capacity)
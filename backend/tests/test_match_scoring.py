@@ -0,0 +1,54 @@
+import pytest
+from app.services.match_scoring import score_postings, tokenize
+
+RESUME = "Python developer: Django, PostgreSQL, Docker"
+
+
+def test_tokens_keep_technical_names_and_drop_filler():
+    tokens = tokenize("We are seeking a Django developer with 5 years of experience in C++, C# and node.js")
+
+    assert tokens == ["django", "developer", "c++", "c#", "node.js"]
+
+
+def test_scores_are_in_input_order():
+    covered, unrelated, half = score_postings(RESUME, [
+        "Python Django PostgreSQL", "Java Spring Kubernetes", "Python Java"
+    ])
+
+    assert covered["match_percentage"] == 100
+    assert covered["similarity"] == pytest.approx(1.0)
+    assert sorted(covered["matching_terms"]) == ["django", "postgresql", "python"]
+    assert covered["missing_terms"] == []
+
+    assert unrelated["match_percentage"] == 0
+    assert unrelated["similarity"] == 0
+    assert sorted(unrelated["missing_terms"]) == ["java", "kubernetes", "spring"]
+
+    assert half["match_percentage"] == 50
+    assert half["matching_terms"] == ["python"]
+    assert half["missing_terms"] == ["java"]
+
+
+def test_repeated_terms_weigh_more():
+    once, repeated = score_postings(RESUME, ["Python Java", "Python Python Python Java"])
+
+    assert repeated["match_percentage"] > once["match_percentage"]
+
+
+def test_postings_without_terms_score_zero():
+    assert score_postings(RESUME, []) == []
+    assert score_postings(RESUME, ["the and of", ""]) == [
+        {"match_percentage": 0, "similarity": 0.0, "matching_terms": [], "missing_terms": []}
+    ] * 2
+
+
+def test_fast_batch_is_sent_best_match_first(client, user, resume):
+    response = client.post("/api/job-match/analyze-batch?mode=fast", headers=user["headers"], json={
+        "resume_id": resume, "job_descriptions": ["Java and Kubernetes", "Python and SQL APIs"]
+    })
+
+    assert response.status_code == 200
+    events = [line for line in response.text.splitlines() if line.startswith("data:")]
+    assert '"index": 1' in events[0]
+    assert '"index": 0' in events[1]
+    assert '"succeeded": 2' in events[2]
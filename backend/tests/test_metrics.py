@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from app.db.instrumentation import instrument_pool
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_requests_are_counted_by_route_template(client, user, resume):
+    labels = {"method": "GET", "route": "/api/resume/{analysis_id}", "status": "200"}
+    before = REGISTRY.get_sample_value("http_requests_total", labels) or 0
+
+    assert client.get(f"/api/resume/{resume}", headers=user["headers"]).status_code == 200
+
+    assert REGISTRY.get_sample_value("http_requests_total", labels) == before + 1
+
+
+def test_scrape_reports_cache_and_pool_usage(client):
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'cache_hit_ratio{cache="auth_user"}' in response.text
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+
+def test_workers_are_aggregated_in_multiprocess_mode(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    record = "from app.core.metrics import llm_tokens; llm_tokens.labels('analyze_resume', 'prompt').inc(5)"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=env, cwd=BACKEND_DIR, check=True)
+
+    scrape = "from app.core.metrics import render_metrics; print(render_metrics().decode())"
+    output = subprocess.run([sys.executable, "-c", scrape], env=env, cwd=BACKEND_DIR, check=True, capture_output=True, text=True).stdout
+
+    assert 'llm_tokens_total{function="analyze_resume",type="prompt"} 10.0' in output
+
+
+def test_pool_instrumentation_survives_dispose(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db")
+    instrument_pool(engine)
+
+    def checkouts() -> float:
+        return REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") or 0
+
+    def checked_out() -> float:
+        return REGISTRY.get_sample_value("db_pool_connections", {"state": "checked_out"}) or 0
+
+    baseline = checkouts(), checked_out()
+    for _ in range(2):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            assert checked_out() == baseline[1] + 1
+        engine.dispose()
+
+    assert checkouts() == baseline[0] + 2
+    assert checked_out() == baseline[1]
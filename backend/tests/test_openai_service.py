@@ -0,0 +1,74 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from app.services import llm_resilience, openai_service
+from app.services.llm_resilience import LLMResponseError
+from app.services.prompt_budget import TokenUsage
+
+VALID_MATCH = {"match_percentage": 80, "matching_skills": ["Python"], "missing_skills": [], "suggestions": ["Add metrics"]}
+
+
+class FakeCompletions:
+    def __init__(self, contents):
+        self.contents = list(contents)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        content = self.contents[min(self.calls, len(self.contents) - 1)]
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=None
+        )
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    completions = FakeCompletions([])
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(openai_service, "get_async_openai_client", lambda: client)
+    monkeypatch.setattr(llm_resilience, "LLM_RETRY_BASE_DELAY", 0)
+    return completions
+
+
+def test_job_match_missing_a_field_is_retried(completions):
+    incomplete = {key: value for key, value in VALID_MATCH.items() if key != "suggestions"}
+    completions.contents = [json.dumps(incomplete), json.dumps(VALID_MATCH)]
+
+    result = asyncio.run(openai_service.analyze_job_match_with_ai_async("retried resume", "retried job"))
+
+    assert result == VALID_MATCH
+    assert completions.calls == 2
+
+
+def test_invalid_job_match_is_not_cached(completions):
+    completions.contents = [json.dumps({"match_percentage": 80})]
+    with pytest.raises(LLMResponseError):
+        asyncio.run(openai_service.analyze_job_match_with_ai_async("uncached resume", "uncached job"))
+    assert completions.calls == llm_resilience.LLM_MAX_ATTEMPTS
+
+    completions.contents = [json.dumps(VALID_MATCH)]
+    result = asyncio.run(openai_service.analyze_job_match_with_ai_async("uncached resume", "uncached job"))
+    assert result == VALID_MATCH
+
+
+def test_ats_check_is_validated():
+    with pytest.raises(Exception):
+        openai_service.parse_ats_check(json.dumps({"ats_score": 70}))
+    assert openai_service.parse_ats_check(json.dumps({
+        "ats_score": "70", "issues_found": [], "recommendations": [], "is_ats_friendly": True
+    }))["ats_score"] == 70
+
+
+def test_calls_without_usage_are_not_counted_as_actual_tokens(completions, monkeypatch):
+    usage = TokenUsage()
+    monkeypatch.setattr(openai_service, "token_usage", usage)
+    completions.contents = [json.dumps(VALID_MATCH)]
+
+    asyncio.run(openai_service.analyze_job_match_with_ai_async("usage resume", "usage job"))
+
+    counters = usage.stats()["analyze_job_match"]
+    assert counters["calls_without_usage"] == 1
+    assert counters.get("input_tokens", 0) == 0
+    assert counters.get("estimated_prompt_tokens", 0) == 0
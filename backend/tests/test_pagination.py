@@ -0,0 +1,32 @@
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+def test_cursor_walks_rows_sharing_a_timestamp(client, user):
+    # Inserted within the same second, so the cursor falls between equal timestamps
+    for number in range(5):
+        response = client.post("/api/applications", headers=user["headers"], json={
+            "company_name": f"Company {number}",
+            "job_title": "Engineer",
+            "status": "Applied",
+            "application_date": "2026-01-15",
+        })
+        assert response.status_code == 201
+
+    seen = []
+    params = {"limit": 2}
+    for _ in range(10):
+        response = client.get(f"/api/applications/user/{user['id']}", headers=user["headers"], params=params)
+        seen.extend(application["id"] for application in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        params["cursor"] = cursor
+
+    assert len(seen) == 5
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_invalid_cursor_is_rejected(client, user):
+    response = client.get(f"/api/applications/user/{user['id']}", headers=user["headers"], params={"cursor": "nope"})
+
+    assert response.status_code == 400
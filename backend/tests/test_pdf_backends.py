@@ -0,0 +1,18 @@
+import pytest
+from app.utils.pdf_backends import PDF_BACKENDS, PdfBackend, register_pdf_backend
+
+
+def test_incomplete_backend_is_refused_at_registration():
+    class PageCountOnly(PdfBackend):
+        name = "page-count-only"
+
+        def count_pages(self, file_path: str) -> int:
+            return 1
+
+    with pytest.raises(TypeError, match="extract_text"):
+        register_pdf_backend(PageCountOnly)
+    assert "page-count-only" not in PDF_BACKENDS
+
+
+def test_builtin_backends_are_registered():
+    assert {"pypdf2", "pymupdf"} <= set(PDF_BACKENDS)
@@ -0,0 +1,103 @@
+import pytest
+from app.api import report
+from app.db.database import SessionLocal, engine
+from app.models.ats_check import ATSCheck
+from app.models.job_match import JobMatch
+from app.models.resume_analysis import ResumeAnalysis
+from app.services.llm_resilience import LLMResponseError
+
+ANALYSIS = {"overall_score": 77, "analysis_text": "Clear and focused", "suggestions": ["Quantify impact"]}
+ATS = {"ats_score": 88, "issues_found": [], "recommendations": ["Keep one column"], "is_ats_friendly": True}
+MATCH = {"match_percentage": 64, "matching_skills": ["Python"], "missing_skills": ["Go"], "suggestions": []}
+
+
+@pytest.fixture
+def unextracted_resume(user, resume_docx) -> int:
+    db = SessionLocal()
+    try:
+        resume = ResumeAnalysis(user_id=user["id"], filename="resume.docx", file_path=resume_docx)
+        db.add(resume)
+        db.commit()
+        return resume.id
+    finally:
+        db.close()
+
+
+def fake_step(calls: list, step: str, result):
+    """
+    A fake LLM step recording (step, resume text, connections checked out of the pool)
+    """
+    async def call(resume_text: str, job_description: str = None, force_refresh: bool = False):
+        calls.append((step, resume_text, engine.pool.checkedout()))
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return call
+
+
+@pytest.fixture
+def llm_calls(monkeypatch) -> list:
+    calls = []
+    monkeypatch.setattr(report, "analyze_resume_with_ai_async", fake_step(calls, "resume_analysis", ANALYSIS))
+    monkeypatch.setattr(report, "check_ats_compatibility_with_ai_async", fake_step(calls, "ats_check", ATS))
+    monkeypatch.setattr(report, "analyze_job_match_with_ai_async", fake_step(calls, "job_match", MATCH))
+    return calls
+
+
+def saved(resume_id: int) -> tuple[ResumeAnalysis, int, int]:
+    db = SessionLocal()
+    try:
+        return (
+            db.get(ResumeAnalysis, resume_id),
+            db.query(ATSCheck).filter(ATSCheck.resume_id == resume_id).count(),
+            db.query(JobMatch).filter(JobMatch.resume_id == resume_id).count(),
+        )
+    finally:
+        db.close()
+
+
+def test_report_extracts_once_and_saves_every_step(client, user, unextracted_resume, llm_calls):
+    response = client.post("/api/report", headers=user["headers"],
+                           json={"resume_id": unextracted_resume, "job_description": "Python and Go"})
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["resume_analysis"]["overall_score"] == 77
+    assert body["ats_check"]["ats_score"] == 88
+    assert body["job_match"]["match_percentage"] == 64
+
+    assert sorted(step for step, _, _ in llm_calls) == ["ats_check", "job_match", "resume_analysis"]
+    # The graded steps get the raw extraction, and no connection is held while they run
+    assert all("Backend engineer at Acme" in text for _, text, _ in llm_calls)
+    assert [checked_out for _, _, checked_out in llm_calls] == [0, 0, 0]
+
+    resume, ats_checks, job_matches = saved(unextracted_resume)
+    assert "Backend engineer at Acme" in resume.resume_text
+    assert resume.overall_score == 77
+    assert (ats_checks, job_matches) == (1, 1)
+
+
+def test_failed_step_saves_nothing(client, user, unextracted_resume, llm_calls, monkeypatch):
+    monkeypatch.setattr(report, "check_ats_compatibility_with_ai_async",
+                        fake_step(llm_calls, "ats_check", LLMResponseError("missing ats_score")))
+
+    response = client.post("/api/report", headers=user["headers"],
+                           json={"resume_id": unextracted_resume, "job_description": "Python and Go"})
+
+    assert response.status_code == 502
+    assert "ats check" in response.json()["detail"]
+    resume, ats_checks, job_matches = saved(unextracted_resume)
+    assert resume.overall_score is None
+    assert (ats_checks, job_matches) == (0, 0)
+
+
+def test_unreadable_resume_is_a_422(client, user, unextracted_resume, llm_calls, monkeypatch):
+    def unreadable(file_path, filename):
+        raise report.ExtractionError(f"{filename} has 40 pages, the limit is 30")
+
+    monkeypatch.setattr(report, "extract_document", unreadable)
+
+    response = client.post("/api/report", headers=user["headers"], json={"resume_id": unextracted_resume})
+
+    assert response.status_code == 422
+    assert llm_calls == []
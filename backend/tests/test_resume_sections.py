@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+from app.services.resume_sections import parse_resume_sections, resume_text_for
+
+RESUME = """Jane Doe
+jane@example.com
+
+EXPERIENCE
+IBM
+Software Engineer, 2019-2021
+- Built billing services
+NASA
+Intern
+- Wrote telemetry tooling
+
+SKILLS
+Python, SQL
+"""
+
+
+def test_all_caps_employers_stay_in_experience():
+    sections = parse_resume_sections(RESUME)
+
+    assert [entry["heading"] for entry in sections["experience"]] == [
+        "IBM | Software Engineer, 2019-2021",
+        "NASA | Intern",
+    ]
+    assert sections["other"] == []
+    assert sections["skills"] == ["Python", "SQL"]
+
+
+def test_all_caps_employers_reach_job_match_prompt():
+    resume = SimpleNamespace(resume_text=RESUME, resume_sections=None)
+
+    text = resume_text_for(resume, "analyze_job_match")
+
+    assert "IBM" in text
+    assert "NASA" in text
+    assert "Built billing services" in text
+
+
+def test_unknown_heading_before_known_sections_is_other():
+    sections = parse_resume_sections("Jane Doe\n\nVOLUNTEERING\nFood bank\n\nEXPERIENCE\nAcme\n- Shipped things\n")
+
+    assert sections["other"] == [{"title": "VOLUNTEERING", "lines": ["Food bank"]}]
+    assert sections["experience"][0]["heading"] == "Acme"
+
+
+def test_section_titles_inside_a_known_section_start_a_new_one():
+    sections = parse_resume_sections(
+        "Jane Doe\n\nEXPERIENCE\nAcme\n- Shipped things\n\nAWARDS\nEmployee of the year\n\n"
+        "Volunteer Work:\nFood bank\nPUBLICATIONS\nA paper\n"
+    )
+
+    assert sections["experience"] == [{"heading": "Acme", "bullets": ["Shipped things"]}]
+    assert sections["other"] == [
+        {"title": "AWARDS", "lines": ["Employee of the year"]},
+        {"title": "Volunteer Work", "lines": ["Food bank"]},
+        {"title": "PUBLICATIONS", "lines": ["A paper"]},
+    ]
+
+
+def test_labels_inside_skills_stay_content():
+    sections = parse_resume_sections("SKILLS\nLanguages:\nPython, Go\nTOOLS\nDocker\n")
+
+    assert {"Python", "Go", "Docker"} <= set(sections["skills"])
+    assert sections["other"] == []
+
@@ -0,0 +1,111 @@
+import hashlib
+import io
+import uuid
+import pytest
+from sqlalchemy import update
+from app.db.database import SessionLocal
+from app.models.resume_analysis import ResumeAnalysis
+from app.services import resume_storage
+from app.services.resume_storage import UploadTooLargeError, store_upload
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_storage, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(resume_storage, "BLOB_DIR", tmp_path / "blobs")
+    return tmp_path
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, content: bytes):
+        super().__init__(content)
+        self.reads = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return super().read(size)
+
+
+def test_upload_is_hashed_while_streamed_to_its_content_address(upload_dir, monkeypatch):
+    monkeypatch.setattr(resume_storage, "CHUNK_SIZE", 4)
+    content = b"resume bytes, more than a few chunks"
+    source = CountingReader(content)
+
+    content_hash, path = store_upload(source, ".pdf")
+
+    assert content_hash == hashlib.sha256(content).hexdigest()
+    assert path == upload_dir / "blobs" / content_hash[:2] / f"{content_hash}.pdf"
+    assert path.read_bytes() == content
+    # Read in bounded chunks, never the whole upload at once
+    assert set(source.reads) == {4}
+    assert list((upload_dir / "tmp").iterdir()) == []
+
+
+def test_identical_uploads_share_one_blob(upload_dir):
+    first = store_upload(io.BytesIO(b"same resume"), ".docx")
+    second = store_upload(io.BytesIO(b"same resume"), ".docx")
+
+    assert first == second
+    assert len(list((upload_dir / "blobs").rglob("*.docx"))) == 1
+
+
+def test_oversized_upload_is_rejected_without_leftovers(upload_dir, monkeypatch):
+    monkeypatch.setattr(resume_storage, "CHUNK_SIZE", 4)
+
+    with pytest.raises(UploadTooLargeError):
+        store_upload(io.BytesIO(b"x" * 20), ".pdf", max_bytes=8)
+
+    assert list((upload_dir / "tmp").iterdir()) == []
+    assert not (upload_dir / "blobs").exists()
+
+
+def upload(client, user, content: bytes, **params):
+    return client.post("/api/resume/upload", headers=user["headers"], params=params,
+                       files={"file": ("resume.docx", content)})
+
+
+def set_analysis(resume_id: int, **values) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(update(ResumeAnalysis).where(ResumeAnalysis.id == resume_id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_analyzed_content_is_reused(client, user):
+    content = uuid.uuid4().bytes
+    first = upload(client, user, content)
+    assert first.status_code == 202
+    resume_id = first.json()["resume_id"]
+    set_analysis(resume_id, resume_text="Jane Doe", overall_score=81, analysis_text="Good", suggestions=[])
+
+    # The user's own analysis is returned as is
+    again = upload(client, user, content)
+    assert again.status_code == 200
+    assert again.json()["status"] == "completed"
+    assert again.json()["resume_id"] == resume_id
+
+    # create_new_record copies the results instead
+    copied = upload(client, user, content, create_new_record="true")
+    assert copied.status_code == 200
+    assert copied.json()["resume_id"] != resume_id
+    assert client.get(f"/api/resume/{copied.json()['resume_id']}", headers=user["headers"]).json()["overall_score"] == 81
+
+    # force_refresh queues a new analysis
+    assert upload(client, user, content, force_refresh="true").status_code == 202
+
+
+def test_extracted_text_is_carried_over_without_an_analysis(client, user):
+    content = uuid.uuid4().bytes
+    first = upload(client, user, content).json()["resume_id"]
+    set_analysis(first, resume_text="Jane Doe\nPython")
+
+    second = upload(client, user, content)
+
+    assert second.status_code == 202
+    db = SessionLocal()
+    try:
+        assert db.get(ResumeAnalysis, second.json()["resume_id"]).resume_text == "Jane Doe\nPython"
+    finally:
+        db.close()
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from app.services.single_flight import SingleFlight
+
+
+def test_flight_keeps_running_while_another_caller_waits():
+    flights = SingleFlight()
+    calls = 0
+
+    async def slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(flights.do("f", "key", slow))
+        second = asyncio.ensure_future(flights.do("f", "key", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == ("done", True)
+    assert calls == 1
+
+
+def test_flight_is_cancelled_when_its_last_caller_goes():
+    flights = SingleFlight()
+
+    async def scenario():
+        upstream_cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                # Cleanup that itself takes a moment, like closing a connection
+                await asyncio.sleep(0.01)
+                upstream_cancelled.set()
+                raise
+
+        caller = asyncio.ensure_future(flights.do("f", "key", slow))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        # Unwound before the caller's cancellation completes
+        assert upstream_cancelled.is_set()
+
+        # A later identical call starts a new flight instead of joining the cancelled one
+        async def fast():
+            return "fresh"
+        return await flights.do("f", "key", fast)
+
+    assert asyncio.run(scenario()) == ("fresh", False)
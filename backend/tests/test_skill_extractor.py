@@ -0,0 +1,27 @@
+from app.services.skill_extractor import SkillMatcher, compare_skills, extract_skills
+
+
+def test_aliases_map_to_canonical_skills_in_order():
+    skills = extract_skills("Built services in golang and C# on .NET, deployed with CI/CD to Google Cloud; Postgres, ML")
+
+    assert skills == ["Go", "C#", ".NET", "CI/CD", "Google Cloud", "PostgreSQL", "Machine Learning"]
+
+
+def test_aliases_match_whole_words_only():
+    assert extract_skills("Google ads, going forward, javascripting") == []
+    assert extract_skills("JavaScript, not Java") == ["JavaScript", "Java"]
+    assert extract_skills("C++ developer") == ["C++"]
+
+
+def test_overlapping_aliases_are_all_found():
+    matcher = SkillMatcher({"Long": ["a b c"], "Short": ["b"], "Shifted": ["b c d"]})
+
+    assert sorted(matcher.find("a b c d")) == [("Long", 0), ("Shifted", 1), ("Short", 1)]
+    assert matcher.count("b x b") == {"Short": 2}
+
+
+def test_compare_splits_job_skills_by_resume():
+    assert compare_skills("Python, Django, AWS", "Python and Kubernetes on AWS, React") == {
+        "matching_skills": ["Python", "AWS"],
+        "missing_skills": ["Kubernetes", "React"],
+    }
@@ -4,6 +4,7 @@ import { useState, useEffect } from 'react'
 import { useRouter } from 'next/navigation'
 import { useSession } from 'next-auth/react'
 import axios from 'axios'
+import { apiUrl, authHeaders, fetchAllPages } from '@/lib/api'
 import {
   BriefcaseIcon,
   PlusIcon,
@@ -63,14 +64,10 @@ export default function Applications() {
 
   const fetchApplications = async () => {
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const userResponse = await axios.get(`${apiUrl}/api/auth/user`, {
-        params: { email: session?.user?.email }
-      })
-      const userId = userResponse.data.id
+      const userId = session?.user?.id
 
-      const response = await axios.get(`${apiUrl}/api/applications/user/${userId}`)
-      setApplications(response.data)
+      // The board shows every application, not just the first page
+      setApplications(await fetchAllPages<Application>(`${apiUrl}/api/applications/user/${userId}`, session))
     } catch (error) {
       console.error('Error fetching applications:', error)
     } finally {
@@ -82,22 +79,14 @@ export default function Applications() {
     e.preventDefault()
     
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const userResponse = await axios.get(`${apiUrl}/api/auth/user`, {
-        params: { email: session?.user?.email }
-      })
-      const userId = userResponse.data.id
-
       if (editingApp) {
         await axios.put(`${apiUrl}/api/applications/${editingApp.id}`, {
-          ...formData,
-          user_id: userId
-        })
+          ...formData
+        }, { headers: authHeaders(session) })
       } else {
         await axios.post(`${apiUrl}/api/applications`, {
-          ...formData,
-          user_id: userId
-        })
+          ...formData
+        }, { headers: authHeaders(session) })
       }
 
       fetchApplications()
@@ -120,8 +109,7 @@ export default function Applications() {
     if (!confirm('Are you sure you want to delete this application?')) return
 
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      await axios.delete(`${apiUrl}/api/applications/${id}`)
+      await axios.delete(`${apiUrl}/api/applications/${id}`, { headers: authHeaders(session) })
       fetchApplications()
     } catch (error) {
       console.error('Error deleting application:', error)
@@ -140,11 +128,10 @@ export default function Applications() {
     if (!draggedApp) return
 
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
       await axios.put(`${apiUrl}/api/applications/${draggedApp.id}`, {
         ...draggedApp,
         status: newStatus
-      })
+      }, { headers: authHeaders(session) })
       fetchApplications()
       setDraggedApp(null)
     } catch (error) {
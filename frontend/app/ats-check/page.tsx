@@ -4,6 +4,7 @@ import { useState, useEffect } from 'react'
 import { useRouter } from 'next/navigation'
 import { useSession } from 'next-auth/react'
 import axios from 'axios'
+import { apiUrl, authHeaders, fetchAllPages } from '@/lib/api'
 import {
   CheckCircleIcon,
   SparklesIcon,
@@ -48,17 +49,13 @@ export default function ATSCheck() {
 
   const fetchResumes = async () => {
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const userResponse = await axios.get(`${apiUrl}/api/auth/user`, {
-        params: { email: session?.user?.email }
-      })
-      const userId = userResponse.data.id
+      const userId = session?.user?.id
 
-      const response = await axios.get(`${apiUrl}/api/resume/user/${userId}`)
-      setResumes(response.data)
+      const userResumes = await fetchAllPages<Resume>(`${apiUrl}/api/resume/user/${userId}/summary`, session)
+      setResumes(userResumes)
       
-      if (response.data.length > 0) {
-        setSelectedResumeId(response.data[0].id)
+      if (userResumes.length > 0) {
+        setSelectedResumeId(userResumes[0].id)
       }
     } catch (error) {
       console.error('Error fetching resumes:', error)
@@ -75,16 +72,9 @@ export default function ATSCheck() {
     setError('')
 
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const userResponse = await axios.get(`${apiUrl}/api/auth/user`, {
-        params: { email: session?.user?.email }
-      })
-      const userId = userResponse.data.id
-
       const response = await axios.post(`${apiUrl}/api/ats/check`, {
-        user_id: userId,
         resume_id: selectedResumeId
-      })
+      }, { headers: authHeaders(session) })
 
       setAtsResult(response.data)
     } catch (err) {
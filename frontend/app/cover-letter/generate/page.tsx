@@ -4,6 +4,7 @@ import { useState, useEffect } from 'react'
 import { useRouter } from 'next/navigation'
 import { useSession } from 'next-auth/react'
 import axios from 'axios'
+import { apiUrl, authHeaders, fetchAllPages } from '@/lib/api'
 import {
   DocumentDuplicateIcon,
   SparklesIcon,
@@ -42,17 +43,13 @@ export default function GenerateCoverLetter() {
 
   const fetchResumes = async () => {
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const userResponse = await axios.get(`${apiUrl}/api/auth/user`, {
-        params: { email: session?.user?.email }
-      })
-      const userId = userResponse.data.id
+      const userId = session?.user?.id
 
-      const response = await axios.get(`${apiUrl}/api/resume/user/${userId}`)
-      setResumes(response.data)
+      const userResumes = await fetchAllPages<Resume>(`${apiUrl}/api/resume/user/${userId}/summary`, session)
+      setResumes(userResumes)
       
-      if (response.data.length > 0) {
-        setSelectedResumeId(response.data[0].id)
+      if (userResumes.length > 0) {
+        setSelectedResumeId(userResumes[0].id)
       }
     } catch (error) {
       console.error('Error fetching resumes:', error)
@@ -69,17 +66,10 @@ export default function GenerateCoverLetter() {
     setError('')
 
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const userResponse = await axios.get(`${apiUrl}/api/auth/user`, {
-        params: { email: session?.user?.email }
-      })
-      const userId = userResponse.data.id
-
       const response = await axios.post(`${apiUrl}/api/cover-letter/generate`, {
-        user_id: userId,
         resume_id: selectedResumeId,
         job_description: jobDescription
-      })
+      }, { headers: authHeaders(session) })
 
       setCoverLetter(response.data.cover_letter_text)
     } catch (err) {
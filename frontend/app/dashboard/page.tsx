@@ -4,6 +4,7 @@ import { useSession } from 'next-auth/react'
 import { useRouter } from 'next/navigation'
 import { useEffect, useState } from 'react'
 import axios from 'axios'
+import { apiUrl, authHeaders, fetchAllPages } from '@/lib/api'
 import Link from 'next/link'
 import {
   DocumentTextIcon,
@@ -39,52 +40,40 @@ export default function Dashboard() {
   useEffect(() => {
     if (status === 'unauthenticated') {
       router.push('/login')
-    } else if (status === 'authenticated' && session?.user?.email) {
+    } else if (status === 'authenticated' && session?.user?.id) {
       fetchDashboardData()
     }
   }, [status, session, router])
 
   const fetchDashboardData = async () => {
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
+      // User ID from the session, set at login
+      const userId = session?.user?.id
       
-      // Get user email from session
-      const userEmail = session?.user?.email
-      
-      if (!userEmail) {
-        console.error('No user email found')
+      if (!userId) {
+        console.error('No user ID found')
         setLoading(false)
         return
       }
 
-      console.log('🔍 Fetching data for user:', userEmail)
+      console.log('🔍 Fetching data for user:', userId)
       console.log('🌐 API URL:', apiUrl)
 
-      // Try to fetch user ID from backend
       try {
-        console.log('📡 Attempting to fetch user ID...')
-        const userResponse = await axios.get(
-          `${apiUrl}/api/auth/user`,
-          {
-            params: { email: userEmail }
-          }
-        )
-        
-        console.log('✅ User response:', userResponse.data)
-        const userId = userResponse.data.id
-
         // Fetch recent resume analyses - USE CORRECT ENDPOINT
         console.log('📡 Fetching resumes for user ID:', userId)
         const resumesResponse = await axios.get(
-          `${apiUrl}/api/resume/user/${userId}`
+          `${apiUrl}/api/resume/user/${userId}`,
+          { params: { limit: 3 }, headers: authHeaders(session) }
         )
         
         console.log('✅ Resumes fetched:', resumesResponse.data)
-        setRecentAnalyses(resumesResponse.data.slice(0, 3))
+        setRecentAnalyses(resumesResponse.data)
 
-        // Fetch stats
+        // Fetch stats: the list is paginated, count every page of the light summaries
+        const resumeSummaries = await fetchAllPages(`${apiUrl}/api/resume/user/${userId}/summary`, session)
         setStats({
-          totalResumes: resumesResponse.data.length,
+          totalResumes: resumeSummaries.length,
           totalCoverLetters: 0,
           totalMatches: 0,
           totalApplications: 0
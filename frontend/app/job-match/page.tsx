@@ -4,6 +4,7 @@ import { useState, useEffect } from 'react'
 import { useRouter } from 'next/navigation'
 import { useSession } from 'next-auth/react'
 import axios from 'axios'
+import { apiUrl, authHeaders, fetchAllPages } from '@/lib/api'
 import {
   ChartBarIcon,
   SparklesIcon,
@@ -51,17 +52,13 @@ export default function JobMatch() {
 
   const fetchResumes = async () => {
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const userResponse = await axios.get(`${apiUrl}/api/auth/user`, {
-        params: { email: session?.user?.email }
-      })
-      const userId = userResponse.data.id
+      const userId = session?.user?.id
 
-      const response = await axios.get(`${apiUrl}/api/resume/user/${userId}`)
-      setResumes(response.data)
+      const userResumes = await fetchAllPages<Resume>(`${apiUrl}/api/resume/user/${userId}/summary`, session)
+      setResumes(userResumes)
       
-      if (response.data.length > 0) {
-        setSelectedResumeId(response.data[0].id)
+      if (userResumes.length > 0) {
+        setSelectedResumeId(userResumes[0].id)
       }
     } catch (error) {
       console.error('Error fetching resumes:', error)
@@ -78,18 +75,11 @@ export default function JobMatch() {
     setError('')
 
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      const userResponse = await axios.get(`${apiUrl}/api/auth/user`, {
-        params: { email: session?.user?.email }
-      })
-      const userId = userResponse.data.id
-
       const response = await axios.post(`${apiUrl}/api/job-match/analyze`, {
-        user_id: userId,
         resume_id: selectedResumeId,
         job_description: jobDescription,
         job_title: jobTitle
-      })
+      }, { headers: authHeaders(session) })
 
       setMatchResult(response.data)
     } catch (err) {
@@ -2,7 +2,9 @@
 
 import { useState, useEffect } from "react";
 import { useParams, useRouter } from "next/navigation";
+import { useSession } from "next-auth/react";
 import axios from "axios";
+import { apiUrl, authHeaders } from "@/lib/api";
 
 interface Analysis {
   id: number
@@ -20,11 +22,19 @@ export default function ResumeResultPage(){
     const params = useParams();
     const id = params.id;
     const router = useRouter();
+    const { data: session, status } = useSession();
 
     useEffect(() => {
+        if (status === "unauthenticated") {
+            router.push("/login");
+            return;
+        }
+        if (status !== "authenticated") {
+            return;
+        }
         const fetchAnalysis = async() => {
             try {
-                const response = await axios(`${process.env.NEXT_PUBLIC_API_URL}/api/resume/${id}`);
+                const response = await axios(`${apiUrl}/api/resume/${id}`, { headers: authHeaders(session) });
                 setAnalysis(response.data)
             } catch {
                 setError("Failed to load analysis. Please try again.")
@@ -33,7 +43,7 @@ export default function ResumeResultPage(){
             }
         }
         fetchAnalysis();
-    }, [id])
+    }, [id, status, session, router])
 
     return(
         <div className="min-h-screen bg-gray-50 p-4">
@@ -4,6 +4,7 @@ import { useState } from 'react'
 import { useRouter } from 'next/navigation'
 import { useSession } from 'next-auth/react'
 import axios from 'axios'
+import { apiUrl, authHeaders, waitForAnalysisJob } from '@/lib/api'
 import {
   CloudArrowUpIcon,
   DocumentTextIcon,
@@ -81,30 +82,31 @@ export default function ResumeAnalyzer() {
     setError('')
 
     try {
-      const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
-      
-      // Get user ID
-      const userResponse = await axios.get(
-        `${apiUrl}/api/auth/user`,
-        { params: { email: session?.user?.email } }
-      )
-      const userId = userResponse.data.id
-
       // Upload resume
       const formData = new FormData()
       formData.append('file', file)
 
       const response = await axios.post(
-        `${apiUrl}/api/resume/upload?user_id=${userId}`,
+        `${apiUrl}/api/resume/upload`,
         formData,
         {
           headers: {
+            ...authHeaders(session),
             'Content-Type': 'multipart/form-data',
           },
         }
       )
 
-      setAnalysis(response.data)
+      // The upload returns the analysis job, fetch the analysis once it's done
+      const job = await waitForAnalysisJob(response.data, session)
+      if (job.status === 'failed') {
+        setError(job.error || 'Failed to analyze resume')
+        return
+      }
+      const analysisResponse = await axios.get(`${apiUrl}/api/resume/${job.resume_id}`, {
+        headers: authHeaders(session)
+      })
+      setAnalysis(analysisResponse.data)
     } catch (err) {
       if (axios.isAxiosError(err)) {
         setError(err.response?.data?.detail || 'Failed to analyze resume')
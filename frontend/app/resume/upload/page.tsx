@@ -4,6 +4,7 @@ import { useState } from "react";
 import { useSession } from "next-auth/react";
 import { useRouter } from "next/navigation";
 import axios from "axios";
+import { apiUrl, authHeaders, waitForAnalysisJob } from "@/lib/api";
 
 export default function ResumeUploadPage(){
     const [selectedFile, setSelectedFile] = useState<File|null>(null);
@@ -36,8 +37,14 @@ export default function ResumeUploadPage(){
         const formData = new FormData();
         formData.append('file', selectedFile);
         try {
-            const response = await axios.post(`${process.env.NEXT_PUBLIC_API_URL}/api/resume/upload?user_id=${session.user.id}`, formData);
-            router.push(`/resume/${response.data.id}`);
+            const response = await axios.post(`${apiUrl}/api/resume/upload`, formData, { headers: authHeaders(session) });
+            // The upload returns the analysis job, the page to show is its resume's
+            const job = await waitForAnalysisJob(response.data, session);
+            if (job.status === "failed") {
+                setError(job.error || "Failed to analyze resume. Please try again.");
+                return null;
+            }
+            router.push(`/resume/${job.resume_id}`);
         } catch {
             setError("Failed to upload resume. Please try again.");
         } finally {
@@ -1,7 +1,18 @@
 import type { NextAuthConfig } from "next-auth";
 
+// The session can't outlive the backend access token: there is no refresh,
+// so match ACCESS_TOKEN_EXPIRE_MINUTES on the backend
+const ACCESS_TOKEN_MAX_AGE = Number(process.env.ACCESS_TOKEN_EXPIRE_MINUTES || 30) * 60
+
 export const authConfig: NextAuthConfig = {
     providers: [],
+    session: {
+        strategy: "jwt",
+        maxAge: ACCESS_TOKEN_MAX_AGE
+    },
+    jwt: {
+        maxAge: ACCESS_TOKEN_MAX_AGE
+    },
     pages: {
         signIn: "/login"
     },
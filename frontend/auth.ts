@@ -8,6 +8,12 @@ type Credentials = {
   password: string
 }
 
+// Expiry of the backend token in ms, read from its own `exp` claim
+function accessTokenExpiry(accessToken: string): number {
+    const payload = JSON.parse(Buffer.from(accessToken.split(".")[1], "base64url").toString())
+    return payload.exp * 1000
+}
+
 export const { auth, signIn, signOut, handlers } = NextAuth({
     ...authConfig,
     providers: [
@@ -29,7 +35,8 @@ export const { auth, signIn, signOut, handlers } = NextAuth({
                             id: response.data.user.id.toString(),
                             email: response.data.user.email,
                             name: response.data.user.full_name,
-                            accessToken: response.data.access_token
+                            accessToken: response.data.access_token,
+                            accessTokenExpires: accessTokenExpiry(response.data.access_token)
                         }
                     }
                     return null;
@@ -44,6 +51,11 @@ export const { auth, signIn, signOut, handlers } = NextAuth({
             if (user) {
                 token.id = user.id
                 token.accessToken = user.accessToken
+                token.accessTokenExpires = user.accessTokenExpires
+            }
+            // The backend would answer 401 from here on, end the session instead
+            if (token.accessTokenExpires && Date.now() >= token.accessTokenExpires) {
+                return null
             }
             return token
         },
@@ -0,0 +1,56 @@
+import axios from 'axios'
+import type { Session } from 'next-auth'
+import { signOut } from 'next-auth/react'
+
+export const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
+
+// An authenticated call got 401: the access token expired or its user is gone,
+// and there is no refresh, so sign in again
+if (typeof window !== 'undefined') {
+  axios.interceptors.response.use(undefined, (error) => {
+    if (axios.isAxiosError(error) && error.response?.status === 401 && error.config?.headers?.Authorization) {
+      signOut({ callbackUrl: '/login' })
+    }
+    return Promise.reject(error)
+  })
+}
+
+// Every backend route except register and login reads the user from the access token
+export function authHeaders(session: Session | null) {
+  const token = session?.user?.accessToken
+  return token ? { Authorization: `Bearer ${token}` } : {}
+}
+
+export interface AnalysisJob {
+  id: number
+  resume_id: number
+  status: 'queued' | 'running' | 'completed' | 'failed'
+  error: string | null
+}
+
+// Uploads are analyzed on a job queue: long-poll the job until it finishes
+export async function waitForAnalysisJob(job: AnalysisJob, session: Session | null): Promise<AnalysisJob> {
+  while (job.status !== 'completed' && job.status !== 'failed') {
+    const response = await axios.get<AnalysisJob>(`${apiUrl}/api/jobs/${job.id}`, {
+      params: { wait: 25 },
+      headers: authHeaders(session)
+    })
+    job = response.data
+  }
+  return job
+}
+
+// List endpoints return one page at a time, with the next page's cursor in X-Next-Cursor
+export async function fetchAllPages<T>(url: string, session: Session | null): Promise<T[]> {
+  const items: T[] = []
+  let cursor: string | undefined
+  do {
+    const response = await axios.get<T[]>(url, {
+      params: { limit: 100, cursor },
+      headers: authHeaders(session)
+    })
+    items.push(...response.data)
+    cursor = response.headers['x-next-cursor']
+  } while (cursor)
+  return items
+}
@@ -4,6 +4,7 @@ declare module "next-auth" {
   interface User {
     id: string
     accessToken?: string
+    accessTokenExpires?: number
   }
   
   interface Session {
@@ -18,6 +19,7 @@ declare module "next-auth/jwt" {
   interface JWT {
     id: string
     accessToken?: string
+    accessTokenExpires?: number
   }
 }
 